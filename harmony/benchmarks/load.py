@@ -0,0 +1,96 @@
+"""
+Throughput and tail latency of the read endpoints, WSGI against ASGI
+
+Keeps `--concurrency` requests in flight for `--duration` seconds, each client
+requesting the given paths in turn, and prints the requests per second and the
+latency percentiles of every path. Run it against both modes of
+config/gunicorn.py with the same number of cores, e.g.:
+
+    gunicorn -c config/gunicorn.py
+    python benchmarks/load.py /api/events/ /api/users/
+
+    GUNICORN_MODE=asgi gunicorn -c config/gunicorn.py
+    python benchmarks/load.py /api/events/async/ /api/users/async/
+
+Pass --token (an access token, e.g. from /api/auth/login/) for the paths that
+require authentication, such as the event details.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from http import HTTPStatus
+
+import httpx
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+
+async def client(http, paths, deadline, latencies, errors):
+    while time.monotonic() < deadline:
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                response = await http.get(path)
+            except httpx.HTTPError:
+                errors[path] += 1
+                continue
+            if response.status_code >= HTTPStatus.BAD_REQUEST:
+                errors[path] += 1
+            else:
+                latencies[path].append(time.perf_counter() - started)
+
+
+async def main(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers=headers,
+        limits=limits,
+        timeout=args.timeout,
+    ) as http:
+        for path in args.paths:
+            # warm up connections and caches
+            await http.get(path)
+
+        latencies, errors = defaultdict(list), defaultdict(int)
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                client(http, args.paths, deadline, latencies, errors)
+                for _ in range(args.concurrency)
+            ),
+        )
+        elapsed = time.monotonic() - started
+
+    print(f"{args.concurrency} clients for {elapsed:.1f}s against {args.base_url}")
+    for path in args.paths:
+        samples = sorted(latencies[path])
+        if not samples:
+            print(f"{path:<30} no successful requests, {errors[path]} errors")
+            continue
+        p50, p95, p99 = (percentile(samples, q) for q in (0.50, 0.95, 0.99))
+        print(
+            f"{path:<30} {len(samples) / elapsed:8.1f} req/s  "
+            f"p50={p50:7.1f}ms  p95={p95:7.1f}ms  p99={p99:7.1f}ms  "
+            f"max={samples[-1] * 1000:7.1f}ms  errors={errors[path]}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--token")
+    parser.add_argument("--timeout", type=float, default=60)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""
+Latency of the event list while a burst of logins is in flight
+
+Starts a probe that requests GET /api/events/ back to back, first alone and then
+while `--logins` concurrent logins hit `--login-path`, and prints the latency
+percentiles of the probe for both phases, along with the logins' own.
+
+Compare the sync login under WSGI with the async one under ASGI, e.g.:
+
+    gunicorn config.wsgi --workers 4
+    python benchmarks/login_burst.py --login-path /api/auth/login/
+
+    uvicorn config.asgi:application --workers 4
+    python benchmarks/login_burst.py --login-path /api/auth/async/login/
+
+The user given by --username / --password must exist. Under ASGI every request
+in flight holds its own database connection, PostgreSQL's max_connections (or
+the pooler in front of it) has to cover --logins plus the probe.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentiles(samples):
+    if not samples:
+        return "no samples"
+    samples = sorted(samples)
+
+    def at(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+    return (
+        f"n={len(samples):<5} p50={at(0.50):8.1f}ms  p95={at(0.95):8.1f}ms  "
+        f"p99={at(0.99):8.1f}ms  max={samples[-1] * 1000:8.1f}ms  "
+        f"mean={statistics.mean(samples) * 1000:8.1f}ms"
+    )
+
+
+async def probe(client, path, stop):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def login(client, path, username, password):
+    started = time.perf_counter()
+    response = await client.post(
+        path,
+        json={"username": username, "password": password},
+    )
+    return response.status_code, time.perf_counter() - started
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.logins + 10)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        limits=limits,
+        timeout=timeout,
+    ) as client:
+        # warm up connections and caches
+        await login(client, args.login_path, args.username, args.password)
+        await client.get(args.probe_path)
+
+        stop = asyncio.Event()
+        baseline = asyncio.create_task(probe(client, args.probe_path, stop))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        idle = await baseline
+
+        stop = asyncio.Event()
+        probing = asyncio.create_task(probe(client, args.probe_path, stop))
+        started = time.perf_counter()
+        logins = await asyncio.gather(
+            *(
+                login(client, args.login_path, args.username, args.password)
+                for _ in range(args.logins)
+            ),
+        )
+        burst_seconds = time.perf_counter() - started
+        stop.set()
+        busy = await probing
+
+    statuses = {}
+    for status, _ in logins:
+        statuses[status] = statuses.get(status, 0) + 1
+    print(f"{args.probe_path} idle         {percentiles(idle)}")
+    print(f"{args.probe_path} during burst {percentiles(busy)}")
+    print(
+        f"{args.login_path} x{args.logins} in {burst_seconds:.2f}s, "
+        f"statuses {statuses}",
+    )
+    login_latencies = [elapsed for _, elapsed in logins]
+    print(f"{args.login_path} latency      {percentiles(login_latencies)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--login-path", default="/api/auth/async/login/")
+    parser.add_argument("--probe-path", default="/api/events/")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--baseline-seconds", type=float, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,111 @@
+"""
+Render time and allocations of event pages, DRF's JSONRenderer against ORJSONRenderer
+
+Builds the envelopes of two pages of `--page-size` events from the database:
+the event list as EventListSerializer renders it (strings, ints and nested
+dicts) and the raw rows of Event.objects.values() (datetimes, timedeltas), then
+renders each with both renderers and prints the best time per render over
+`--repeat` rounds, and the peak memory allocated by one render.
+
+    python benchmarks/render.py --page-size 100
+
+The database needs at least `--page-size` events, e.g. from the dev fixtures.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+from functools import partial
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from harmony.events.api.serializers import EventListSerializer  # noqa: E402
+from harmony.events.models import Event  # noqa: E402
+from harmony.utils.renderers import ORJSONRenderer  # noqa: E402
+from harmony.utils.response import response_payload  # noqa: E402
+
+
+def event_list_page(page_size):
+    events = Event.objects.for_listing().order_by("-date", "id")[:page_size]
+    return response_payload(
+        success=True,
+        message="Events list fetched",
+        data={
+            "next": None,
+            "previous": None,
+            "results": EventListSerializer(events, many=True).data,
+        },
+    )
+
+
+def event_rows_page(page_size):
+    rows = Event.objects.order_by("-date", "id").values()[:page_size]
+    return response_payload(
+        success=True,
+        message="Events list fetched",
+        data=list(rows),
+    )
+
+
+def peak_allocated(render, data):
+    """
+    Peak of the memory allocated while rendering, output included
+    """
+    tracemalloc.start()
+    try:
+        render(data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(args):
+    pages = {
+        "event list": event_list_page(args.page_size),
+        "event rows": event_rows_page(args.page_size),
+    }
+    renderers = {
+        "JSONRenderer": JSONRenderer(),
+        "ORJSONRenderer": ORJSONRenderer(),
+    }
+    print(
+        f"{args.page_size} events per page, "
+        f"best of {args.repeat} x {args.number} renders",
+    )
+    for page, data in pages.items():
+        baseline = None
+        for name, renderer in renderers.items():
+            render = renderer.render
+            size = len(render(data))
+            timings = timeit.repeat(
+                partial(render, data),
+                number=args.number,
+                repeat=args.repeat,
+            )
+            best = min(timings) / args.number
+            allocated = peak_allocated(render, data)
+            baseline = baseline or best
+            print(
+                f"{page:<12} {name:<16} {best * 1e6:9.1f}us  x{baseline / best:5.1f}  "
+                f"{size:8} bytes out  {allocated:9} bytes peak allocated",
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--number", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
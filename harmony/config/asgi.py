@@ -0,0 +1,27 @@
+# ruff: noqa
+"""
+ASGI config for Harmony project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Served by uvicorn, the async views (e.g. the login and registration under
+/api/auth/async/) wait on the database and the password hashing pool without
+holding a worker, sync views run in Django's thread pool.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# harmony directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "harmony"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+application = get_asgi_application()
@@ -0,0 +1,43 @@
+# ruff: noqa
+"""
+Gunicorn configuration for Harmony, for the WSGI and the ASGI application.
+
+    gunicorn -c config/gunicorn.py                      # WSGI, sync workers
+    GUNICORN_MODE=asgi gunicorn -c config/gunicorn.py   # ASGI, uvicorn workers
+
+A sync worker serves one request at a time, so there are several per core to
+overlap database waits. A uvicorn worker runs an event loop that keeps serving
+while async views (the /async/ endpoints) wait on the database, one per core
+is enough; sync views still run in its thread pool. WEB_CONCURRENCY overrides
+the number of workers.
+
+See https://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import multiprocessing
+import os
+
+mode = os.environ.get("GUNICORN_MODE", "wsgi")
+cores = multiprocessing.cpu_count()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+if mode == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    workers = int(os.environ.get("WEB_CONCURRENCY", cores))
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "sync"
+    workers = int(os.environ.get("WEB_CONCURRENCY", cores * 2 + 1))
+
+# recycle workers now and then, jittered so that they do not restart together
+max_requests = 10000
+max_requests_jitter = 1000
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# heartbeat files on tmpfs, a slow disk would get healthy workers killed
+worker_tmp_dir = "/dev/shm"
+
+accesslog = "-"
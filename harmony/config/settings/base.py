@@ -53,6 +53,12 @@ DATABASES = {
     ),
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Minimum pg_trgm word similarity for the fuzzy ?search= mode (harmony.utils.filters),
+# set as pg_trgm.word_similarity_threshold on every new database connection
+TRIGRAM_WORD_SIMILARITY_THRESHOLD = env.float(
+    "DJANGO_TRIGRAM_WORD_SIMILARITY_THRESHOLD",
+    default=0.5,
+)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -62,6 +68,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ROOT_URLCONF = "config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "config.wsgi.application"
+# https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+ASGI_APPLICATION = "config.asgi.application"
 
 # APPS
 # ------------------------------------------------------------------------------
@@ -74,6 +82,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -299,6 +308,17 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html#beat-entries
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-attendees-counts": {
+        "task": "harmony.events.tasks.reconcile_attendees_counts",
+        "schedule": timedelta(hours=1),
+    },
+    "refresh-recommendations": {
+        "task": "harmony.events.tasks.refresh_recommendations",
+        "schedule": timedelta(minutes=30),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -329,9 +349,20 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         # "rest_framework.authentication.SessionAuthentication",
         # "rest_framework.authentication.TokenAuthentication",
-        "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
+        # dj_rest_auth.jwt_auth.JWTCookieAuthentication with the users cached, see harmony.users.authentication
+        "harmony.users.authentication.CachedJWTCookieAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # JSONRenderer and JSONParser on orjson, see benchmarks/render.py
+    "DEFAULT_RENDERER_CLASSES": (
+        "harmony.utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "harmony.utils.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -373,3 +404,46 @@ SIMPLE_JWT = {
 }
 
 REST_USE_JWT = True
+
+# Seconds a page of the public event list stays cached, see harmony.events.cache
+EVENT_LIST_CACHE_TIMEOUT = env.int("DJANGO_EVENT_LIST_CACHE_TIMEOUT", default=300)
+# Seconds for which pages filtered relative to now (?upcoming=, ?past=, ?week=) are reused
+EVENT_LIST_TIME_BUCKET = env.int("DJANGO_EVENT_LIST_TIME_BUCKET", default=60)
+# Rows validated and inserted per transaction by harmony.events.tasks.import_events
+EVENT_IMPORT_CHUNK_SIZE = env.int("DJANGO_EVENT_IMPORT_CHUNK_SIZE", default=500)
+# Tags above which autocomplete queries the database instead of an in-process index
+TAG_AUTOCOMPLETE_INDEX_LIMIT = env.int("DJANGO_TAG_AUTOCOMPLETE_INDEX_LIMIT", default=100000)
+# Upcoming events recommended to each user, see harmony.events.tasks.refresh_recommendations
+EVENT_RECOMMENDATIONS_SIZE = env.int("DJANGO_EVENT_RECOMMENDATIONS_SIZE", default=20)
+# Seconds a pre-rendered .ics feed stays cached, see harmony.events.feeds
+EVENT_FEED_CACHE_TIMEOUT = env.int("DJANGO_EVENT_FEED_CACHE_TIMEOUT", default=86400)
+# Seconds for which a feed, whose window moves with the current time, is reused
+EVENT_FEED_TIME_BUCKET = env.int("DJANGO_EVENT_FEED_TIME_BUCKET", default=3600)
+# Redis holding the members' "events from my communities" timelines, see harmony.events.timelines
+TIMELINE_REDIS_URL = env("DJANGO_TIMELINE_REDIS_URL", default=CELERY_BROKER_URL)
+# Events kept in every timeline
+TIMELINE_MAX_LENGTH = env.int("DJANGO_TIMELINE_MAX_LENGTH", default=1000)
+# Members whose timelines are written by one task when a community publishes events
+TIMELINE_FANOUT_BATCH_SIZE = env.int("DJANGO_TIMELINE_FANOUT_BATCH_SIZE", default=1000)
+# Seconds a community list or detail page stays cached, see harmony.users.cache
+COMMUNITY_CACHE_TIMEOUT = env.int("DJANGO_COMMUNITY_CACHE_TIMEOUT", default=300)
+# Square avatar thumbnails rendered after every upload, in pixels, see harmony.users.avatars
+AVATAR_THUMBNAIL_SIZES = env.list("DJANGO_AVATAR_THUMBNAIL_SIZES", cast=int, default=[64, 128, 256])
+# Roster rows validated and inserted per transaction by harmony.users.tasks.import_members
+MEMBER_IMPORT_CHUNK_SIZE = env.int("DJANGO_MEMBER_IMPORT_CHUNK_SIZE", default=1000)
+# Processes hashing the passwords of an imported roster, 0 for one per core
+PASSWORD_HASHING_WORKERS = env.int("DJANGO_PASSWORD_HASHING_WORKERS", default=0)
+# Threads verifying and hashing passwords for the async login and registration, see harmony.users.hashing
+PASSWORD_HASHING_THREADS = env.int("DJANGO_PASSWORD_HASHING_THREADS", default=4)
+# Logins and registrations waiting for a hashing thread before new ones get 503
+PASSWORD_HASHING_MAX_PENDING = env.int("DJANGO_PASSWORD_HASHING_MAX_PENDING", default=256)
+# Nice value of the hashing threads, so that logins yield the CPU to other requests
+PASSWORD_HASHING_NICENESS = env.int("DJANGO_PASSWORD_HASHING_NICENESS", default=19)
+# Users kept by each process for the token authentication, see harmony.users.authentication
+AUTH_USER_CACHE_SIZE = env.int("DJANGO_AUTH_USER_CACHE_SIZE", default=10000)
+# Seconds the users stay in the shared cache, a save bumps their version before that
+AUTH_USER_CACHE_TIMEOUT = env.int("DJANGO_AUTH_USER_CACHE_TIMEOUT", default=3600)
+# Redis holding the jtis of the tokens revoked at logout, see harmony.users.revocation
+TOKEN_REVOCATION_REDIS_URL = env("DJANGO_TOKEN_REVOCATION_REDIS_URL", default=CELERY_BROKER_URL)
+# Seconds a process keeps its Bloom filter of the revoked tokens before rebuilding it
+TOKEN_REVOCATION_REFRESH_INTERVAL = env.int("DJANGO_TOKEN_REVOCATION_REFRESH_INTERVAL", default=10)
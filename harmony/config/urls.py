@@ -12,6 +12,9 @@ from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularSwaggerView
 
+from harmony.users.api.async_views import LoginAPIView, RegisterAPIView
+from harmony.users.api.views import LogoutAPIView, TokenRefreshAPIView
+
 urlpatterns = [
     # path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
     # path(
@@ -53,6 +56,12 @@ urlpatterns += [
         name="resend_email_verification",
     ),
 
+    # async login and registration, hashing off the event loop when served by config.asgi
+    path("api/auth/async/login/", LoginAPIView.as_view(), name="async_login"),
+    path("api/auth/async/registration/", RegisterAPIView.as_view(), name="async_register"),
+    # dj_rest_auth's logout and refresh, with the tokens revoked at logout
+    path("api/auth/logout/", LogoutAPIView.as_view(), name="rest_logout"),
+    path("api/auth/token/refresh/", TokenRefreshAPIView.as_view(), name="token_refresh"),
     path('api/auth/', include('dj_rest_auth.urls')),
     path('api/auth/registration/', include('dj_rest_auth.registration.urls')),
     path('api/auth/account-confirm-email/', VerifyEmailView.as_view(), name='account_email_verification_sent'),
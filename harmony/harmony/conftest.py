@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 
 from harmony.users.models import User
 from harmony.users.tests.factories import UserFactory
@@ -9,6 +10,12 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    yield
+    cache.clear()
+
+
 @pytest.fixture()
 def user(db) -> User:
     return UserFactory()
@@ -1,7 +1,8 @@
 from datetime import timedelta
+from typing import cast
 
 from django.contrib import admin
-from harmony.events.models import Event, Tags
+from harmony.events.models import Event, EventImport, EventQuerySet, Tags
 
 
 @admin.register(Event)
@@ -9,6 +10,9 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ("title", "get_date", "get_time", "location", "type", "organizer")
     search_fields = ("title", "get_date", "get_time", "location", "type", "organizer")
 
+    def get_queryset(self, request):
+        return cast(EventQuerySet, super().get_queryset(request)).for_listing()
+
     # date and time fields do not exist, so we need to add them using methods
     def get_date(self, obj):
         date_time = obj.date
@@ -31,3 +35,25 @@ class EventAdmin(admin.ModelAdmin):
 class TagsAdmin(admin.ModelAdmin):
     list_display = ("name", "id")
     search_fields = ("name",)
+
+
+@admin.register(EventImport)
+class EventImportAdmin(admin.ModelAdmin):
+    list_display = (
+        "file",
+        "organizer",
+        "status",
+        "processed_rows",
+        "total_rows",
+        "created_count",
+        "failed_count",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "total_rows",
+        "processed_rows",
+        "created_count",
+        "failed_count",
+        "errors",
+        "finished_at",
+    )
@@ -0,0 +1,128 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from harmony.events.api.serializers import EventDetailSerializer
+from harmony.events.api.serializers import EventListSerializer
+from harmony.events.api.serializers import attendees_preview
+from harmony.events.api.views import EventDetailAPIView
+from harmony.events.api.views import EventListAPIView
+from harmony.events.cache import aevent_etag
+from harmony.events.cache import aevent_last_modified
+from harmony.events.cache import aevent_list_etag
+from harmony.events.cache import event_list_cache
+from harmony.events.models import Event
+from harmony.utils.response import response_payload
+from harmony.utils.views import AsyncGenericAPIView
+from harmony.utils.views import acondition
+
+# Async counterparts of EventListAPIView and EventDetailAPIView, with the same
+# query parameters, caching and responses. Served by the ASGI application
+# (config.asgi), they wait on the database without holding a worker.
+
+
+class AsyncEventListAPIView(AsyncGenericAPIView):
+    """
+    This class represents the async list view for events.
+    Authentication is not required for this view.
+    """
+
+    view_class = EventListAPIView
+
+    @acondition(etag_func=aevent_list_etag)
+    async def get(self, request, *args, **kwargs):
+        """
+        This function returns a list of events, like EventListAPIView.get.
+        """
+        cache_key = await event_list_cache.aget_key(request)
+        cached = await event_list_cache.aget(cache_key)
+        if cached is not None:
+            return Response(
+                cached,
+                status=status.HTTP_200_OK,
+                headers={"X-Cache": "HIT"},
+            )
+        view = self.view
+        try:
+            queryset = view.filter_queryset(view.get_queryset())
+            page = await self.apaginate_queryset(queryset)
+            if page is not None:
+                serializer = EventListSerializer(
+                    page,
+                    many=True,
+                    context={"request": request},
+                )
+                response = view.get_paginated_response(serializer.data)
+                response.data = response_payload(
+                    success=True,
+                    message="Events list fetched",
+                    data=response.data,
+                )
+                response.status_code = status.HTTP_200_OK
+                return await self.cache_response(cache_key, response)
+            events = [event async for event in queryset.aiterator()]
+            serializer = EventListSerializer(
+                events,
+                many=True,
+                context={"request": request},
+            )
+            response = response_payload(
+                success=True,
+                message="Events list fetched",
+                data=serializer.data,
+            )
+            return await self.cache_response(
+                cache_key,
+                Response(response, status=status.HTTP_200_OK),
+            )
+        except Exception as e:  # noqa: BLE001, like EventListAPIView
+            response = response_payload(
+                success=False,
+                message="Failed to fetch events list",
+                data=str(e),
+            )
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+    async def cache_response(self, cache_key, response):
+        """
+        EventListAPIView.cache_response for async views
+        """
+        await event_list_cache.aset(cache_key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class AsyncEventDetailAPIView(AsyncGenericAPIView):
+    """
+    This class represents the async detail view for events.
+    Authentication is required for this view.
+    """
+
+    view_class = EventDetailAPIView
+
+    @acondition(etag_func=aevent_etag, last_modified_func=aevent_last_modified)
+    async def get(self, request, id, *args, **kwargs):  # noqa: A002
+        """
+        This function returns a single event, like EventDetailAPIView.get.
+        """
+        view = self.view
+        try:
+            event = await view.get_queryset().aget(id=id)
+        except Event.DoesNotExist:
+            response = response_payload(
+                success=False,
+                message="Event not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        view.check_object_permissions(request, event)
+        preview = [user_id async for user_id in attendees_preview(event.id).aiterator()]
+        serializer = EventDetailSerializer(
+            event,
+            context={"request": request, "attendees_preview": preview},
+        )
+        response = response_payload(
+            success=True,
+            message="Event fetched",
+            data=serializer.data,
+        )
+        return Response(response, status=status.HTTP_200_OK)
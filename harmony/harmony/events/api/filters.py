@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import django_filters
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.filters import OrderingFilter
+
+from harmony.events.models import SEARCH_CONFIG
+from harmony.events.models import Event
+from harmony.utils.filters import TrigramSearchFilter
+
+
+class EventSearchFilter(TrigramSearchFilter):
+    """
+    ?search= backed by the Event.search_vector GIN index
+    Matches are annotated with `search_rank` so that they can be ordered by relevance
+    ?fuzzy=true switches to trigram matching of the view's `trigram_search_fields`
+    """
+
+    search_description = "Full text search over title, tags, location and description."
+
+    def filter_queryset(self, request, queryset, view):
+        if self.is_fuzzy(request):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = SearchQuery(
+            " ".join(terms),
+            config=SEARCH_CONFIG,
+            search_type="websearch",
+        )
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query),
+        )
+
+
+class EventOrderingFilter(OrderingFilter):
+    """
+    Orders search results by relevance unless ?ordering= asks otherwise
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        explicit = request.query_params.get(self.ordering_param)
+        if "search_rank" in queryset.query.annotations and not explicit:
+            return ["-search_rank", *(ordering or [])]
+        return ordering
+
+
+class EventFilter(django_filters.FilterSet):
+    """
+    Exact matches plus date ranges and windows relative to now
+    ?date__gte= / ?date__lt= take ISO 8601 datetimes, ?upcoming=true, ?past=true
+    and ?week=true (the next 7 days) are computed per request, their cached
+    pages are kept for one time window (harmony.events.cache).
+    All of them are range scans of event_date_id_idx.
+    """
+
+    date__gte = django_filters.IsoDateTimeFilter(field_name="date", lookup_expr="gte")
+    date__lt = django_filters.IsoDateTimeFilter(field_name="date", lookup_expr="lt")
+    upcoming = django_filters.BooleanFilter(method="filter_upcoming")
+    past = django_filters.BooleanFilter(method="filter_past")
+    week = django_filters.BooleanFilter(method="filter_week")
+
+    class Meta:
+        model = Event
+        fields = [
+            "title",
+            "date",
+            "location",
+            "tags__name",
+        ]
+
+    def filter_upcoming(self, queryset, name, value):
+        return queryset.filter(date__gte=timezone.now()) if value else queryset
+
+    def filter_past(self, queryset, name, value):
+        return queryset.filter(date__lt=timezone.now()) if value else queryset
+
+    def filter_week(self, queryset, name, value):
+        if not value:
+            return queryset
+        now = timezone.now()
+        return queryset.filter(date__gte=now, date__lt=now + timedelta(days=7))
@@ -1,7 +1,25 @@
+from datetime import datetime
+from pathlib import Path
+
+from django.db import IntegrityError, transaction
+from django.db.models import Model
+from django.utils import timezone
 from rest_framework import serializers
-from harmony.events.models import Event, Tags
+from harmony.events.models import DOUBLE_BOOKING_MESSAGE, Event, EventImport, Tags
 from harmony.users.models import User
 
+# attendee ids inlined in the event detail payload
+ATTENDEES_PREVIEW_SIZE = 5
+
+
+def attendees_preview(event_id):
+    """
+    Ids of the first ATTENDEES_PREVIEW_SIZE attendees of an event
+    """
+    attendees = Event.attendees.through.objects.filter(event_id=event_id)
+    user_ids = attendees.order_by("user_id").values_list("user_id", flat=True)
+    return user_ids[:ATTENDEES_PREVIEW_SIZE]
+
 
 class TagsSerializer(serializers.ModelSerializer):
     """
@@ -25,8 +43,8 @@ class EventListSerializer(serializers.ModelSerializer):
     # name of organizer if community or first_name and last_name if member
     organizer = serializers.SerializerMethodField()
 
-    # count of users applied for the event
-    attendees_count = serializers.SerializerMethodField()
+    # count of users applied for the event, kept up to date on Event itself
+    attendees_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Event
@@ -43,17 +61,15 @@ class EventListSerializer(serializers.ModelSerializer):
         else:
             return f"{obj.organizer.member.first_name} {obj.organizer.member.last_name}"
 
-    def get_attendees_count(self, obj):
-        return obj.attendees.count()
-
 
 class EventDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for the Event model.
     """
     organizer = serializers.SerializerMethodField()
-    attendees_count = serializers.SerializerMethodField()
-    attendees = serializers.SerializerMethodField()
+    attendees_count = serializers.IntegerField(read_only=True)
+    # the full list is paginated at /api/events/<id>/attendees/
+    attendees_preview = serializers.SerializerMethodField()
     # tags = serializers.SerializerMethodField()
     date = serializers.SerializerMethodField()
     time = serializers.SerializerMethodField()
@@ -70,7 +86,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
             "type",
             "organizer",
             "attendees_count",
-            "attendees",
+            "attendees_preview",
             # "tags",
             "duration"
         ]
@@ -81,14 +97,14 @@ class EventDetailSerializer(serializers.ModelSerializer):
         else:
             return f"{obj.organizer.member.first_name} {obj.organizer.member.last_name}"
 
-    def get_attendees_count(self, obj):
-        return obj.attendees.count()
-
-    def get_attendees(self, obj):
+    def get_attendees_preview(self, obj):
         """
-        return user ids of attendees
+        return the first few user ids of attendees
+        Async views fetch them beforehand and pass them as context["attendees_preview"]
         """
-        return [attendee.id for attendee in obj.attendees.all()]
+        if "attendees_preview" in self.context:
+            return self.context["attendees_preview"]
+        return list(attendees_preview(obj.pk))
 
     # def get_tags(self, obj):
     #     """
@@ -103,6 +119,17 @@ class EventDetailSerializer(serializers.ModelSerializer):
         return obj.date.strftime("%H:%M")
 
 
+class AttendeeSerializer(serializers.Serializer):
+    """
+    Serializer for the attendee rows of an event, read with values().
+    """
+    id = serializers.IntegerField(source="user_id")
+    username = serializers.CharField()
+    type = serializers.CharField()
+    # community name or member full name
+    name = serializers.CharField()
+
+
 class EventCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for the Event model.
@@ -153,10 +180,204 @@ class EventCreateSerializer(serializers.ModelSerializer):
     #
     #     return event
 
+    # reject events that overlap another one at the same location,
+    # the event_no_double_booking constraint catches concurrent requests
+    check_double_booking = True
+
+    def validate(self, attrs):
+        duration = attrs.get("duration")
+        if self.check_double_booking and duration:
+            start = self.get_start(attrs["date"], attrs["time"])
+            if Event.objects.booked(
+                attrs["location"],
+                start,
+                start + duration,
+            ).exists():
+                raise serializers.ValidationError({"location": DOUBLE_BOOKING_MESSAGE})
+        return attrs
+
     #skipping tags for now
     def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                event = Event.objects.create(**self.combine_date_time(validated_data))
+        except IntegrityError as e:
+            # psycopg's diagnostics name the violated constraint
+            diag = getattr(e.__cause__, "diag", None)
+            if getattr(diag, "constraint_name", None) != "event_no_double_booking":
+                raise
+            raise serializers.ValidationError(
+                {"location": DOUBLE_BOOKING_MESSAGE},
+            ) from e
+        return event
+
+    @staticmethod
+    def get_start(date, time):
+        return timezone.make_aware(datetime.combine(date, time))
+
+    @classmethod
+    def combine_date_time(cls, validated_data):
+        """
+        Replace the separate date and time with the event's datetime
+        """
         time = validated_data.pop("time")
         date = validated_data.pop("date")
-        validated_data["date"] = f"{date} {time}"
-        event = Event.objects.create(**validated_data)
-        return event
+        validated_data["date"] = cls.get_start(date, time)
+        return validated_data
+
+
+class EventImportRowSerializer(EventCreateSerializer):
+    """
+    Serializer for one row of an event import file.
+    Same rules as EventCreateSerializer, the organizer is the one who uploaded
+    the file and is left out of Meta.fields.
+    """
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        required=False,
+        default=list,
+    )
+    # checked for the whole chunk at once, see harmony.events.imports
+    check_double_booking = False
+
+    class Meta(EventCreateSerializer.Meta):
+        fields = [
+            "title",
+            "description",
+            "date",
+            "time",
+            "location",
+            "type",
+            "tags",
+            "duration",
+        ]
+
+
+class EventImportSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the EventImport model.
+    The format is taken from the file extension when it is not given.
+    """
+    format = serializers.ChoiceField(choices=EventImport.Format.choices, required=False)
+
+    formats = {
+        ".csv": EventImport.Format.CSV,
+        ".ndjson": EventImport.Format.NDJSON,
+        ".jsonl": EventImport.Format.NDJSON,
+    }
+
+    class Meta:
+        model = EventImport
+        fields = [
+            "id",
+            "file",
+            "format",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "failed_count",
+            "errors",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            "status",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "failed_count",
+            "errors",
+            "created_at",
+            "finished_at",
+        ]
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            extension = Path(attrs["file"].name).suffix.lower()
+            if extension not in self.formats:
+                raise serializers.ValidationError(
+                    {"format": "Could not tell the format from the file name."},
+                )
+            attrs["format"] = self.formats[extension]
+        return attrs
+
+
+class BulkRSVPSerializer(serializers.Serializer):
+    """
+    Base serializer for adding and removing many RSVPs in one request.
+    Subclasses set `model` to the model the ids refer to.
+    """
+
+    max_ids = 5000
+    model: type[Model]
+
+    add = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+    )
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+    )
+
+    def validate(self, attrs):
+        add = list(dict.fromkeys(attrs["add"]))
+        remove = list(dict.fromkeys(attrs["remove"]))
+        if not add and not remove:
+            msg = "Nothing to add or remove."
+            raise serializers.ValidationError(msg)
+        if len(add) + len(remove) > self.max_ids:
+            msg = f"At most {self.max_ids} ids can be sent at once."
+            raise serializers.ValidationError(msg)
+        if set(add) & set(remove):
+            msg = "The same id cannot be added and removed."
+            raise serializers.ValidationError(msg)
+        # one query for all the ids instead of one per id
+        manager = self.model._default_manager  # noqa: SLF001, documented API
+        found = set(manager.filter(pk__in=add + remove).values_list("pk", flat=True))
+        missing = sorted(set(add + remove) - found)
+        if missing:
+            raise serializers.ValidationError({"missing": missing})
+        return {"add": add, "remove": remove}
+
+
+class EventAttendeesBulkSerializer(BulkRSVPSerializer):
+    """
+    Serializer for adding and removing many attendees of an event.
+    """
+
+    model = User
+
+    def save(self, event):
+        return {
+            "added": sorted(event.add_attendees(self.validated_data["add"])),
+            "removed": sorted(event.remove_attendees(self.validated_data["remove"])),
+        }
+
+
+class UserEventsBulkSerializer(BulkRSVPSerializer):
+    """
+    Serializer for joining and leaving many events as the logged in user.
+    """
+
+    model = Event
+
+    def save(self, user):
+        add = Event.objects.filter(pk__in=self.validated_data["add"])
+        remove = Event.objects.filter(pk__in=self.validated_data["remove"])
+        return {
+            "added": sorted(add.add_attendee(user)),
+            "removed": sorted(remove.remove_attendee(user)),
+        }
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query of the free slots view.
+    """
+
+    location = serializers.CharField(max_length=100)
+    date = serializers.DateField()
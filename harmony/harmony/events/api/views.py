@@ -1,55 +1,119 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import Http404
-from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.views import APIView
+from rest_framework.generics import GenericAPIView
 from rest_framework.generics import ListAPIView, CreateAPIView, UpdateAPIView, RetrieveAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
 
+from harmony.events.api.filters import EventFilter
+from harmony.events.api.filters import EventOrderingFilter
+from harmony.events.api.filters import EventSearchFilter
 from harmony.events.api.serializers import EventListSerializer, EventCreateSerializer, EventDetailSerializer
+from harmony.events.api.serializers import EventAttendeesBulkSerializer
+from harmony.events.api.serializers import UserEventsBulkSerializer
+from harmony.events.api.serializers import EventImportSerializer, AttendeeSerializer
+from harmony.events.api.serializers import FreeSlotsQuerySerializer
+from harmony.events.autocomplete import tag_index
+from harmony.events.feeds import user_feed_token
+from harmony.events.exports import EVENT_EXPORT_FIELDS
+from harmony.events.exports import ROSTER_EXPORT_FIELDS
+from harmony.events.exports import events_for_export
+from harmony.events.exports import roster_for_export
+from harmony.events.cache import event_list_cache
+from harmony.events.cache import event_list_etag
+from harmony.events.cache import event_etag
+from harmony.events.cache import event_last_modified
 from harmony.users.models import Member, Community
-from harmony.events.models import Event
+from harmony.events.models import Event, EventImport, EventRecommendation
+from harmony.events.tasks import import_events
+from harmony.events.timelines import read_timeline
+from harmony.utils.export import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    export_response,
+    stream_lines,
+)
+from harmony.utils.pagination import KeysetPagination
 from harmony.utils.response import response_payload
 
 User = get_user_model()
 
 
+class EventPagination(KeysetPagination):
+    """
+    Page numbers by default, ?pagination=cursor for keyset pages on (-date, id)
+    """
+
+    ordering = ("-date", "id")
+
+
+class AttendeePagination(KeysetPagination):
+    """
+    Keyset pages of attendees on user id, no page numbers
+    """
+
+    ordering = ("user_id",)
+    page_size = 100
+    fallback_class = None
+
+
 class EventListAPIView(ListAPIView):
     """
     This class represents the list view for events.
     Authentication is required for this view.
     """
 
-    queryset = Event.objects.all()
+    queryset = Event.objects.for_listing()
     serializer_class = EventListSerializer
+    pagination_class = EventPagination
     permission_classes = [
         AllowAny,
     ]
-    filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
-    search_fields = [
-        "title",
-        "description",
+    # ?search= matches title, tags, location and description through Event.search_vector
+    # ?search=...&fuzzy=true tolerates misspelled locations
+    filter_backends = [EventSearchFilter, EventOrderingFilter, DjangoFilterBackend]
+    trigram_search_fields = [
         "location",
-        "tags__name"
     ]
     ordering_fields = [
-        "title",
-        "date"
-    ]
-    filterset_fields = [
         "title",
         "date",
-        "location",
-        "tags__name"
-
+        "attendees_count",
     ]
-    ordering = ["-date"]
+    # ?date__gte=, ?date__lt=, ?upcoming=true, ?past=true, ?week=true
+    filterset_class = EventFilter
+    ordering = ["-date", "id"]
 
+    @method_decorator(condition(etag_func=event_list_etag))
     def get(self, request, *args, **kwargs):
         """
         This function returns a list of events.
+        Pages are served from event_list_cache until an event changes.
+        Clients sending the page's ETag in If-None-Match get 304 Not Modified.
         """
+        cache_key = event_list_cache.get_key(request)
+        cached = event_list_cache.get(cache_key)
+        if cached is not None:
+            return Response(
+                cached,
+                status=status.HTTP_200_OK,
+                headers={"X-Cache": "HIT"},
+            )
         try:
             request = self.request
             queryset = self.filter_queryset(self.get_queryset())
@@ -64,14 +128,17 @@ class EventListAPIView(ListAPIView):
                 )
                 response.status_code = status.HTTP_200_OK
 
-                return response
+                return self.cache_response(cache_key, response)
             serializer = EventListSerializer(queryset, many=True, context={"request": request})
             response = response_payload(
                 success=True,
                 message="Events list fetched",
                 data=serializer.data
             )
-            return Response(response, status=status.HTTP_200_OK)
+            return self.cache_response(
+                cache_key,
+                Response(response, status=status.HTTP_200_OK),
+            )
         except Exception as e:
             response = response_payload(
                 success=False,
@@ -80,6 +147,13 @@ class EventListAPIView(ListAPIView):
             )
             return Response(response, status=status.HTTP_400_BAD_REQUEST)
 
+    def cache_response(self, cache_key, response):
+        """
+        Store a successful page in event_list_cache
+        """
+        event_list_cache.set(cache_key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
 
 
 class EventDetailAPIView(RetrieveAPIView):
@@ -88,16 +162,20 @@ class EventDetailAPIView(RetrieveAPIView):
     Authentication is required for this view.
     """
 
-    queryset = Event.objects.all()
+    queryset = Event.objects.for_listing()
     serializer_class = EventDetailSerializer
     lookup_field = "id"
     permission_classes = [
         IsAuthenticated,
     ]
 
+    @method_decorator(
+        condition(etag_func=event_etag, last_modified_func=event_last_modified),
+    )
     def get(self, request, *args, **kwargs):
         """
         This function returns a single event.
+        Conditional requests for an unchanged event get 304 Not Modified.
         """
         try:
             event = self.get_object()
@@ -134,9 +212,21 @@ class EventCreateAPIView(CreateAPIView):
         """
         This function creates an event.
         """
-        serializer = EventCreateSerializer(data=request.data, context={"request": request})
+        serializer = EventCreateSerializer(
+            data=request.data,
+            context={"request": request},
+        )
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except ValidationError as e:
+                # a concurrent booking of the same location, see create()
+                response = response_payload(
+                    success=False,
+                    message="Failed to create event",
+                    data=e.detail,
+                )
+                return Response(response, status=status.HTTP_400_BAD_REQUEST)
             response = response_payload(
                 success=True,
                 message="Event created",
@@ -149,3 +239,525 @@ class EventCreateAPIView(CreateAPIView):
             data=serializer.errors
         )
         return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EventAttendeesBulkAPIView(GenericAPIView):
+    """
+    This class represents the bulk attendee management view for an event.
+    Only the organizer of the event (or staff) can use this view.
+    POST {"add": [user ids], "remove": [user ids]}
+    """
+
+    queryset = Event.objects.all()
+    serializer_class = EventAttendeesBulkSerializer
+    lookup_field = "id"
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def post(self, request, *args, **kwargs):
+        """
+        This function adds and removes many attendees of an event at once.
+        """
+        try:
+            event = self.get_object()
+        except Http404:
+            response = response_payload(
+                success=False,
+                message="Event not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        if not event.can_manage(request.user):
+            response = response_payload(
+                success=False,
+                message="Only the organizer can manage attendees",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_403_FORBIDDEN)
+        serializer = EventAttendeesBulkSerializer(data=request.data)
+        if serializer.is_valid():
+            response = response_payload(
+                success=True,
+                message="Attendees updated",
+                data=serializer.save(event),
+            )
+            return Response(response, status=status.HTTP_200_OK)
+        response = response_payload(
+            success=False,
+            message="Failed to update attendees",
+            data=serializer.errors,
+        )
+        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+
+class UserEventsBulkAPIView(GenericAPIView):
+    """
+    This class represents the RSVP view for the logged in user.
+    Authentication is required for this view.
+    POST {"add": [event ids], "remove": [event ids]}
+    """
+
+    serializer_class = UserEventsBulkSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def post(self, request, *args, **kwargs):
+        """
+        This function joins and leaves many events at once.
+        """
+        serializer = UserEventsBulkSerializer(data=request.data)
+        if serializer.is_valid():
+            response = response_payload(
+                success=True,
+                message="RSVPs updated",
+                data=serializer.save(request.user),
+            )
+            return Response(response, status=status.HTTP_200_OK)
+        response = response_payload(
+            success=False,
+            message="Failed to update RSVPs",
+            data=serializer.errors,
+        )
+        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EventImportCreateAPIView(CreateAPIView):
+    """
+    This class represents the bulk import view for events.
+    Authentication is required for this view.
+    Takes a multipart CSV or NDJSON `file`, large uploads are streamed to a
+    temporary file by Django's upload handlers and then copied to storage.
+    The events are created by the import_events Celery task.
+    """
+
+    queryset = EventImport.objects.all()
+    serializer_class = EventImportSerializer
+    parser_classes = [
+        MultiPartParser,
+        FormParser,
+    ]
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def create(self, request, *args, **kwargs):
+        """
+        This function stores the file and queues its import.
+        """
+        serializer = EventImportSerializer(
+            data=request.data,
+            context={"request": request},
+        )
+        if serializer.is_valid():
+            event_import = serializer.save(organizer=request.user)
+            transaction.on_commit(lambda: import_events.delay(event_import.id))
+            response = response_payload(
+                success=True,
+                message="Event import queued",
+                data=serializer.data,
+            )
+            return Response(response, status=status.HTTP_202_ACCEPTED)
+        response = response_payload(
+            success=False,
+            message="Failed to queue event import",
+            data=serializer.errors,
+        )
+        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EventImportDetailAPIView(RetrieveAPIView):
+    """
+    This class represents the progress view of an event import.
+    Only the user who uploaded the file can see it.
+    """
+
+    serializer_class = EventImportSerializer
+    lookup_field = "id"
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get_queryset(self):
+        user = self.request.user
+        if not user.is_authenticated:
+            return EventImport.objects.none()
+        return EventImport.objects.filter(organizer=user)
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the progress and row errors of an import.
+        """
+        try:
+            event_import = self.get_object()
+            serializer = EventImportSerializer(
+                event_import,
+                context={"request": request},
+            )
+            response = response_payload(
+                success=True,
+                message="Event import fetched",
+                data=serializer.data,
+            )
+            return Response(response, status=status.HTTP_200_OK)
+        except Http404:
+            response = response_payload(
+                success=False,
+                message="Event import not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class EventExportAPIView(APIView):
+    """
+    This class represents the export view for all events, as CSV or NDJSON.
+    Only staff can use this view.
+    The rows are streamed, see harmony.utils.export.
+    """
+
+    permission_classes = [
+        IsAdminUser,
+    ]
+
+    def get(self, request, export_format, *args, **kwargs):
+        """
+        This function streams every event with its organizer and tags.
+        """
+        if export_format not in EXPORT_FORMATS:
+            response = response_payload(
+                success=False,
+                message="Unknown export format",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        return export_response(
+            events_for_export(),
+            EVENT_EXPORT_FIELDS,
+            export_format,
+            "events",
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class EventAttendeesExportAPIView(GenericAPIView):
+    """
+    This class represents the attendee roster export of an event, as CSV or NDJSON.
+    Only the organizer of the event (or staff) can use this view.
+    The rows are streamed, see harmony.utils.export.
+    """
+
+    queryset = Event.objects.all()
+    lookup_field = "id"
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, export_format, *args, **kwargs):
+        """
+        This function streams the attendees of an event with their names and
+        communities.
+        """
+        try:
+            event = self.get_object()
+        except Http404:
+            response = response_payload(
+                success=False,
+                message="Event not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        if not event.can_manage(request.user):
+            response = response_payload(
+                success=False,
+                message="Only the organizer can export attendees",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_403_FORBIDDEN)
+        if export_format not in EXPORT_FORMATS:
+            response = response_payload(
+                success=False,
+                message="Unknown export format",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        return export_response(
+            roster_for_export(event),
+            ROSTER_EXPORT_FIELDS,
+            export_format,
+            f"event-{event.id}-attendees",
+        )
+
+
+class EventAttendeesAPIView(ListAPIView):
+    """
+    This class represents the attendee list of an event.
+    Authentication is required for this view.
+    Pages are keyset paginated on user id, follow `next` for the next one.
+    """
+
+    serializer_class = AttendeeSerializer
+    pagination_class = AttendeePagination
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, id, *args, **kwargs):  # noqa: A002, the URL kwarg
+        """
+        This function returns a page of attendees of an event.
+        """
+        event = Event.objects.filter(id=id).first()
+        if event is None:
+            response = response_payload(
+                success=False,
+                message="Event not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        page = self.paginate_queryset(event.attendee_rows())
+        serializer = AttendeeSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data = response_payload(
+            success=True,
+            message="Attendees fetched",
+            data=response.data,
+        )
+        return response
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class EventAttendeeIdsAPIView(APIView):
+    """
+    This class represents the full list of attendee ids of an event.
+    Authentication is required for this view.
+    The ids are streamed as text, one per line in ascending order.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, id, *args, **kwargs):  # noqa: A002
+        """
+        This function streams the user ids of all attendees of an event.
+        """
+        if not Event.objects.filter(id=id).exists():
+            response = response_payload(
+                success=False,
+                message="Event not found",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        ids = (
+            Event.attendees.through.objects.filter(event_id=id)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return StreamingHttpResponse(stream_lines(ids), content_type="text/plain")
+
+
+class TagAutocompleteAPIView(APIView):
+    """
+    This class represents the tag autocomplete view.
+    Authentication is not required for this view.
+    ?q= is the prefix typed so far, ?limit= the number of suggestions (at most 20).
+    Served from the per-process tag index, see harmony.events.autocomplete.
+    """
+
+    permission_classes = [
+        AllowAny,
+    ]
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the most used tags starting with the prefix.
+        """
+        prefix = request.query_params.get("q", "").strip()
+        try:
+            limit = min(
+                int(request.query_params.get("limit", self.default_limit)),
+                self.max_limit,
+            )
+        except ValueError:
+            limit = self.default_limit
+        tags = tag_index.search(prefix, max(limit, 1))
+        response = response_payload(
+            success=True,
+            message="Tags fetched",
+            data=[{"name": name, "usage": usage} for name, usage in tags],
+        )
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class EventRecommendedAPIView(APIView):
+    """
+    This class represents the recommended events of the logged in user.
+    Authentication is required for this view.
+    Recommendations are precomputed by the refresh_recommendations Celery task,
+    users without any get the most attended upcoming events.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the recommended upcoming events, best first.
+        """
+        upcoming = Event.objects.for_listing().filter(date__gte=timezone.now())
+        event_ids = (
+            EventRecommendation.objects.filter(user_id=request.user.id)
+            .values_list("event_ids", flat=True)
+            .first()
+        )
+        if event_ids:
+            # events that started since the last refresh are left out
+            events = upcoming.in_bulk(event_ids)
+            events = [events[pk] for pk in event_ids if pk in events]
+        else:
+            events = upcoming.order_by("-attendees_count", "id")[
+                : settings.EVENT_RECOMMENDATIONS_SIZE
+            ]
+        serializer = EventListSerializer(
+            events,
+            many=True,
+            context={"request": request},
+        )
+        response = response_payload(
+            success=True,
+            message="Recommended events fetched",
+            data=serializer.data,
+        )
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class EventFreeSlotsAPIView(APIView):
+    """
+    This class represents the free slots of a location on a day.
+    Authentication is required for this view.
+    ?location= is matched exactly, ?date= is a day (YYYY-MM-DD) in the site's time zone.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the intervals of the day in which the location is
+        not booked.
+        """
+        serializer = FreeSlotsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            response = response_payload(
+                success=False,
+                message="Failed to fetch free slots",
+                data=serializer.errors,
+            )
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        start = timezone.make_aware(
+            datetime.combine(serializer.validated_data["date"], time.min),
+        )
+        slots = Event.objects.free_slots(
+            serializer.validated_data["location"],
+            start,
+            start + timedelta(days=1),
+        )
+        response = response_payload(
+            success=True,
+            message="Free slots fetched",
+            data=[
+                {"start": slot_start, "end": slot_end} for slot_start, slot_end in slots
+            ],
+        )
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class EventTimelineAPIView(APIView):
+    """
+    This class represents the timeline of the logged in user: the events
+    published by their communities, newest first.
+    Authentication is required for this view.
+    The event ids are read from the user's Redis sorted set, filled by the
+    fan_out_events Celery task, and only the events of the page are fetched.
+    Follow `next` for the next page.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    page_size: int = api_settings.PAGE_SIZE or 10
+    cursor_query_param = "cursor"
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns a page of the timeline.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is not None and not cursor.isdigit():
+            response = response_payload(
+                success=False,
+                message="Invalid cursor",
+                data=None,
+            )
+            return Response(response, status=status.HTTP_404_NOT_FOUND)
+        # one extra id to know whether there is a next page
+        ids = read_timeline(
+            request.user.id,
+            int(cursor) if cursor else None,
+            self.page_size + 1,
+        )
+        next_link = None
+        if len(ids) > self.page_size:
+            ids = ids[: self.page_size]
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                ids[-1],
+            )
+        # deleted events are left in the timelines and skipped here
+        events = Event.objects.for_listing().in_bulk(ids)
+        serializer = EventListSerializer(
+            [events[pk] for pk in ids if pk in events],
+            many=True,
+            context={"request": request},
+        )
+        response = response_payload(
+            success=True,
+            message="Timeline fetched",
+            data={"next": next_link, "results": serializer.data},
+        )
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class EventFeedURLAPIView(APIView):
+    """
+    This class represents the calendar feed URL of the logged in user.
+    Authentication is required for this view.
+    The URL is signed, so calendar apps can subscribe to it without logging in.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the .ics feed URL of the events the user RSVPed to.
+        """
+        path = reverse(
+            "events:user-feed",
+            kwargs={"token": user_feed_token(request.user)},
+        )
+        response = response_payload(
+            success=True,
+            message="Feed URL fetched",
+            data={"url": request.build_absolute_uri(path)},
+        )
+        return Response(response, status=status.HTTP_200_OK)
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'harmony.events'
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import harmony.events.signals  # noqa: F401
@@ -0,0 +1,83 @@
+import heapq
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+from harmony.events.cache import TAGS_NAMESPACE
+from harmony.events.models import Tags
+from harmony.utils.cache import get_generation
+
+
+def search_tags(prefix, limit):
+    """
+    Tags whose name starts with `prefix` (case insensitive), most used first,
+    as (name, usage) pairs, with LOWER(name) LIKE 'prefix%' on tag_name_lower_prefix_idx
+    """
+    return list(
+        Tags.objects.annotate(lower_name=Lower("name"))
+        .filter(lower_name__startswith=prefix.lower())
+        .annotate(usage=Count("events"))
+        .order_by("-usage", "lower_name")
+        .values_list("name", "usage")[:limit],
+    )
+
+
+class TagIndex:
+    """
+    Per-process index of tag names for autocomplete, ranked by usage (number of events)
+    Names are kept lowercased in a sorted list, the tags matching a prefix are
+    the slice between two bisections. The index is rebuilt with one query the
+    first time it is used after the tags generation changed
+    (harmony.events.signals). Above settings.TAG_AUTOCOMPLETE_INDEX_LIMIT tags,
+    lookups go to the database instead.
+    """
+
+    def __init__(self):
+        self.generation = None
+        # (sorted lowercased names, (name, usage) at the same positions),
+        # None when there are too many tags, swapped in one assignment
+        self.index = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        generation = get_generation(TAGS_NAMESPACE)
+        if generation == self.generation:
+            return
+        with self.lock:
+            if generation == self.generation:
+                return
+            limit = settings.TAG_AUTOCOMPLETE_INDEX_LIMIT
+            # the generation is read first,
+            # a change during the query triggers another rebuild
+            tags = Tags.objects.annotate(usage=Count("events"))
+            rows = list(tags.values_list("name", "usage")[: limit + 1])
+            if len(rows) <= limit:
+                rows.sort(key=lambda row: row[0].lower())
+                self.index = ([name.lower() for name, _ in rows], rows)
+            else:
+                self.index = None
+            self.generation = generation
+
+    def search(self, prefix, limit):
+        """
+        Tags whose name starts with `prefix` (case insensitive), most used first
+        """
+        self.refresh()
+        index = self.index
+        if index is None:
+            return search_tags(prefix, limit)
+        keys, entries = index
+        prefix = prefix.lower()
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + "\U0010ffff", lo=start)
+        return heapq.nsmallest(
+            limit,
+            entries[start:end],
+            key=lambda entry: (-entry[1], entry[0].lower()),
+        )
+
+
+tag_index = TagIndex()
@@ -0,0 +1,105 @@
+import hashlib
+
+from django.conf import settings
+
+from harmony.events.models import Event
+from harmony.utils.cache import ResponseCache
+from harmony.utils.cache import bump_generation
+
+# generation shared by everything cached from event data,
+# bumped by harmony.events.signals whenever an event, its tags or attendees change
+EVENTS_NAMESPACE = "events"
+
+# generation of the tag names and usage counts, see harmony.events.autocomplete
+TAGS_NAMESPACE = "tags"
+
+event_list_cache = ResponseCache(
+    namespace=EVENTS_NAMESPACE,
+    prefix="events:list",
+    timeout=settings.EVENT_LIST_CACHE_TIMEOUT,
+    # the filters of harmony.events.api.filters.EventFilter relative to now
+    time_bucket=settings.EVENT_LIST_TIME_BUCKET,
+    time_params=("upcoming", "past", "week"),
+)
+
+# pre-rendered .ics feeds, see harmony.events.feeds
+event_feed_cache = ResponseCache(
+    namespace=EVENTS_NAMESPACE,
+    prefix="events:feed",
+    timeout=settings.EVENT_FEED_CACHE_TIMEOUT,
+    # every feed starts FEED_HISTORY before now
+    time_bucket=settings.EVENT_FEED_TIME_BUCKET,
+)
+
+
+def invalidate_events():
+    bump_generation(EVENTS_NAMESPACE)
+
+
+def invalidate_tags():
+    bump_generation(TAGS_NAMESPACE)
+
+
+def get_event_validators(request, id):  # noqa: A002, the URL kwarg
+    """
+    updated_at and attendees_version of an event, fetched once per request
+    """
+    if not hasattr(request, "event_validators"):
+        request.event_validators = (
+            Event.objects.filter(id=id)
+            .values("updated_at", "attendees_version")
+            .first()
+        )
+    return request.event_validators
+
+
+async def aget_event_validators(request, id):  # noqa: A002
+    """
+    get_event_validators for async views
+    """
+    if not hasattr(request, "event_validators"):
+        request.event_validators = (
+            await Event.objects.filter(id=id)
+            .values("updated_at", "attendees_version")
+            .afirst()
+        )
+    return request.event_validators
+
+
+def event_etag(request, id, **kwargs):  # noqa: A002
+    validators = get_event_validators(request, id)
+    if validators is None:
+        return None
+    version = validators["attendees_version"]
+    return f'"{id}-{version}-{validators["updated_at"].timestamp()}"'
+
+
+def event_last_modified(request, id, **kwargs):  # noqa: A002
+    validators = get_event_validators(request, id)
+    return validators["updated_at"] if validators else None
+
+
+async def aevent_etag(request, id, **kwargs):  # noqa: A002
+    await aget_event_validators(request, id)
+    return event_etag(request, id)
+
+
+async def aevent_last_modified(request, id, **kwargs):  # noqa: A002
+    await aget_event_validators(request, id)
+    return event_last_modified(request, id)
+
+
+def event_list_etag(request, *args, **kwargs):
+    """
+    A list page only changes with the events generation, which is part of its cache key
+    """
+    key = event_list_cache.get_key(request)
+    return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+async def aevent_list_etag(request, *args, **kwargs):
+    """
+    event_list_etag for async views
+    """
+    key = await event_list_cache.aget_key(request)
+    return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
@@ -0,0 +1,81 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+from harmony.events.models import Event
+from harmony.events.models import Tags
+from harmony.users.models import Community
+from harmony.users.models import display_name
+
+EVENT_EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "date",
+    "duration",
+    "location",
+    "type",
+    "organizer_id",
+    "organizer_name",
+    "tag_names",
+    "attendees_count",
+]
+
+ROSTER_EXPORT_FIELDS = [
+    "user_id",
+    "username",
+    "email",
+    "type",
+    "name",
+    "communities",
+]
+
+
+def events_for_export():
+    """
+    Every event with its organizer name and tags, in a single statement
+    """
+    tags = (
+        Tags.objects.filter(events=OuterRef("pk"))
+        .order_by()
+        .values("events")
+        .annotate(names=StringAgg("name", ", ", ordering="name"))
+        .values("names")
+    )
+    return Event.objects.order_by("id").annotate(
+        organizer_name=display_name("organizer"),
+        tag_names=Coalesce(Subquery(tags), Value(""), output_field=TextField()),
+    )
+
+
+def roster_for_export(event):
+    """
+    The attendees of an event with their names and the communities
+    they are a member of, in a single statement
+    """
+    communities = (
+        Community.objects.filter(members=OuterRef("user_id"))
+        .order_by()
+        .values("members")
+        .annotate(names=StringAgg("name", ", ", ordering="name"))
+        .values("names")
+    )
+    return (
+        Event.attendees.through.objects.filter(event_id=event.pk)
+        .order_by("user_id")
+        .annotate(
+            username=F("user__username"),
+            email=F("user__email"),
+            type=F("user__type"),
+            name=display_name("user"),
+            communities=Coalesce(
+                Subquery(communities),
+                Value(""),
+                output_field=TextField(),
+            ),
+        )
+    )
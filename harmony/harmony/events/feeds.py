@@ -0,0 +1,138 @@
+import hashlib
+from datetime import timedelta
+
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.crypto import salted_hmac
+
+from harmony.events.cache import event_feed_cache
+from harmony.events.models import Event
+from harmony.users.models import User
+from harmony.utils.ical import escape_text
+from harmony.utils.ical import format_datetime
+from harmony.utils.ical import render_component
+
+# past events kept in the feeds
+FEED_HISTORY = timedelta(days=90)
+
+# calendar apps cannot send the JWT cookie, so user feeds are addressed by a
+# signed token, which a password change revokes
+USER_FEED_SALT = "harmony.events.feeds.user"
+
+VEVENT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "date",
+    "ends_at",
+    "location",
+    "type",
+    "updated_at",
+]
+
+
+def user_feed_secret(password):
+    """
+    Part of the feed tokens of a user, derived from their password hash
+    """
+    return salted_hmac(USER_FEED_SALT, password).hexdigest()
+
+
+def user_feed_token(user):
+    return signing.dumps(
+        [user.pk, user_feed_secret(user.password)],
+        salt=USER_FEED_SALT,
+    )
+
+
+def user_id_from_feed_token(token):
+    """
+    The user id signed into a feed token, None if it was tampered with or the
+    user has changed their password since
+    """
+    try:
+        user_id, secret = signing.loads(token, salt=USER_FEED_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    password = (
+        User.objects.filter(pk=user_id, is_active=True)
+        .values_list("password", flat=True)
+        .first()
+    )
+    if password is None:
+        return None
+    if not constant_time_compare(secret, user_feed_secret(password)):
+        return None
+    return user_id
+
+
+def vevent_key(event_id, updated_at):
+    return f"events:vevent:{event_id}:{updated_at.timestamp()}"
+
+
+def render_vevent(event):
+    """
+    VEVENT of an event, from a values() row
+    """
+    return render_component(
+        "VEVENT",
+        [
+            ("UID", f"event-{event['id']}@harmony"),
+            ("DTSTAMP", format_datetime(event["updated_at"])),
+            ("DTSTART", format_datetime(event["date"])),
+            ("DTEND", format_datetime(event["ends_at"]) if event["ends_at"] else None),
+            ("SUMMARY", escape_text(event["title"])),
+            ("DESCRIPTION", escape_text(event["description"])),
+            ("LOCATION", escape_text(event["location"])),
+            ("CATEGORIES", event["type"]),
+        ],
+    )
+
+
+def render_feed(name, events):
+    """
+    The iCalendar feed of the events of a queryset, as bytes
+    Every VEVENT is cached on its own under the event's updated_at, so a feed
+    rebuilt after a change only renders (and fetches) the events that changed.
+    """
+    rows = (
+        events.filter(date__gte=timezone.now() - FEED_HISTORY)
+        .order_by("date", "id")
+        .values_list("id", "updated_at")
+    )
+    keys = {vevent_key(event_id, updated_at): event_id for event_id, updated_at in rows}
+    vevents = cache.get_many(keys)
+
+    missing = [event_id for key, event_id in keys.items() if key not in vevents]
+    if missing:
+        rendered = {
+            vevent_key(event["id"], event["updated_at"]): render_vevent(event)
+            for event in Event.objects.filter(id__in=missing).values(*VEVENT_FIELDS)
+        }
+        cache.set_many(rendered, timeout=event_feed_cache.timeout)
+        vevents.update(rendered)
+
+    calendar = render_component(
+        "VCALENDAR",
+        [
+            ("VERSION", "2.0"),
+            ("PRODID", "-//Harmony//Events//EN"),
+            ("CALSCALE", "GREGORIAN"),
+            ("X-WR-CALNAME", escape_text(name)),
+        ],
+    )
+    # the events go in before END:VCALENDAR
+    header, footer = calendar[: -len("END:VCALENDAR\r\n")], "END:VCALENDAR\r\n"
+    return (
+        header + "".join(vevents[key] for key in keys if key in vevents) + footer
+    ).encode()
+
+
+def feed_etag(request, *args, **kwargs):
+    """
+    A feed only changes with the events generation, which is part of its cache key
+    """
+    key = event_feed_cache.get_key(request)
+    return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
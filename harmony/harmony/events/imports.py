@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from rest_framework.exceptions import ValidationError
+
+from harmony.events.api.serializers import EventImportRowSerializer
+from harmony.events.cache import invalidate_tags
+from harmony.events.models import DOUBLE_BOOKING_MESSAGE
+from harmony.events.models import Event
+from harmony.events.models import EventImport
+from harmony.events.models import Tags
+from harmony.events.models import booked_span
+
+# per-row errors kept on an EventImport, failed_count keeps counting past it
+MAX_IMPORT_ERRORS = 1000
+
+
+def read_csv(stream):
+    """
+    Rows of a CSV file with a header line
+    Empty cells are left out so that optional fields get their default,
+    tags are a comma separated list in a single cell
+    """
+    for record in csv.DictReader(stream):
+        row = {name: value for name, value in record.items() if name and value}
+        if "tags" in row:
+            row["tags"] = [tag.strip() for tag in row["tags"].split(",") if tag.strip()]
+        yield row
+
+
+def read_ndjson(stream):
+    """
+    Rows of a file with one JSON object per line, blank lines are skipped
+    A line that is not valid JSON is passed on as is and fails validation
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+READERS = {
+    EventImport.Format.CSV: read_csv,
+    EventImport.Format.NDJSON: read_ndjson,
+}
+
+
+def read_rows(event_import):
+    """
+    Stream the rows of an import file from storage, without loading it in memory
+    """
+    with event_import.file.open("rb") as file:
+        stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        yield from READERS[event_import.format](stream)
+
+
+def find_double_bookings(events):
+    """
+    Positions of the events that overlap an existing event, or an earlier one
+    of the list, at the same location, with a single query for the whole list
+    """
+    booked = [(i, event) for i, event in enumerate(events) if event.ends_at]
+    if not booked:
+        return set()
+    start = min(event.date for _, event in booked)
+    end = max(event.ends_at for _, event in booked)
+    existing = (
+        Event.objects.annotate(span=booked_span())
+        .filter(
+            location__in={event.location for _, event in booked},
+            ends_at__isnull=False,
+            span__overlap=DateTimeTZRange(start, end),
+        )
+        .values_list("location", "date", "ends_at")
+    )
+    spans = defaultdict(list)
+    for location, date, ends_at in existing:
+        spans[location].append((date, ends_at))
+
+    clashes = set()
+    for i, event in booked:
+        start, end = event.date, event.ends_at
+        if any(
+            start < booked_end and booked_start < end
+            for booked_start, booked_end in spans[event.location]
+        ):
+            clashes.add(i)
+        else:
+            spans[event.location].append((start, end))
+    return clashes
+
+
+def import_chunk(event_import, chunk):
+    """
+    Validate a chunk of rows with the EventCreateSerializer rules and insert
+    the valid ones with a handful of queries, whatever the size of the chunk
+    Returns the ids of the events created and the errors of the invalid rows.
+    """
+    serializer = EventImportRowSerializer()
+    rows, errors = [], []
+    for number, data in chunk:
+        try:
+            rows.append((number, serializer.run_validation(data)))
+        except ValidationError as e:
+            errors.append({"row": number, "errors": e.detail})
+
+    numbers = []
+    events = []
+    event_tags = []
+    for number, data in rows:
+        numbers.append(number)
+        event_tags.append(list(dict.fromkeys(data.pop("tags"))))
+        event = Event(
+            organizer_id=event_import.organizer_id,
+            **EventImportRowSerializer.combine_date_time(data),
+        )
+        event.set_ends_at()
+        events.append(event)
+
+    clashes = find_double_bookings(events)
+    if clashes:
+        errors += [
+            {"row": numbers[i], "errors": {"location": [DOUBLE_BOOKING_MESSAGE]}}
+            for i in clashes
+        ]
+        errors.sort(key=lambda error: error["row"])
+        events = [event for i, event in enumerate(events) if i not in clashes]
+        event_tags = [tags for i, tags in enumerate(event_tags) if i not in clashes]
+
+    with transaction.atomic():
+        Event.objects.bulk_create(events)
+        names = {name for tags in event_tags for name in tags}
+        if names:
+            Tags.objects.bulk_create(
+                [Tags(name=name) for name in names],
+                ignore_conflicts=True,
+            )
+            tag_ids = dict(
+                Tags.objects.filter(name__in=names).values_list("name", "id"),
+            )
+            Event.tags.through.objects.bulk_create(
+                [
+                    Event.tags.through(event_id=event.pk, tags_id=tag_ids[name])
+                    for event, tags in zip(events, event_tags, strict=False)
+                    for name in tags
+                ],
+            )
+            invalidate_tags()
+        # bulk_create sends no post_save, see harmony.events.signals
+        Event.objects.filter(
+            pk__in=[event.pk for event in events],
+        ).update_search_vector()
+    return [event.pk for event in events], errors
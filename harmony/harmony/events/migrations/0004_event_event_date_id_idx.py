@@ -0,0 +1,17 @@
+# Generated by Django 4.2.10 on 2026-10-18 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_alter_event_organizer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', 'id'], name='event_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.10 on 2026-10-18 00:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def populate_search_vector(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    Tags = apps.get_model("events", "Tags")
+    tags = (
+        Tags.objects.filter(events=OuterRef("pk"))
+        .order_by()
+        .values("events")
+        .annotate(names=StringAgg("name", " "))
+        .values("names")
+    )
+    Event.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector(Coalesce(Subquery(tags), Value(""), output_field=TextField()), weight="B", config="english")
+            + SearchVector("location", weight="C", config="english")
+            + SearchVector("description", weight="D", config="english")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_event_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
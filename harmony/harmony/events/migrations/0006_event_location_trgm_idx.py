@@ -0,0 +1,20 @@
+# Generated by Django 4.2.10 on 2026-10-18 00:50
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_search_vector_event_event_search_vector_idx'),
+        # creates the pg_trgm extension
+        ('users', '0005_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='event_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.10 on 2026-10-18 00:54
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_attendees_count(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    attendees = (
+        Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+        .order_by()
+        .values("event_id")
+        .annotate(total=Count("user_id"))
+        .values("total")
+    )
+    Event.objects.update(attendees_count=Coalesce(Subquery(attendees), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_attendees_version_event_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendees_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-attendees_count', 'id'], name='event_attendees_count_idx'),
+        ),
+        migrations.RunPython(populate_attendees_count, migrations.RunPython.noop),
+    ]
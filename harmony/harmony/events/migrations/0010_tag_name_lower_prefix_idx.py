@@ -0,0 +1,19 @@
+# Generated by Django 4.2.10 on 2026-10-18 01:08
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_import'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tags',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('name'), name='text_pattern_ops'), name='tag_name_lower_prefix_idx'),
+        ),
+    ]
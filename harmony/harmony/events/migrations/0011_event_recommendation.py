@@ -0,0 +1,30 @@
+# Generated by Django 4.2.10 on 2026-10-18 01:09
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_trigram_indexes'),
+        ('events', '0010_tag_name_lower_prefix_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRecommendation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='event_recommendation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('event_ids', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), default=list, size=None)),
+                ('scores', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), default=list, size=None)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'event recommendation',
+                'verbose_name_plural': 'event recommendations',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.10 on 2026-10-18 01:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_recommendation'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['-date', 'id'], 'verbose_name': 'event', 'verbose_name_plural': 'events'},
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.10 on 2026-10-18 01:16
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.expressions
+import harmony.events.models
+
+
+def populate_ends_at(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    Event.objects.filter(duration__isnull=False).update(ends_at=F("date") + F("duration"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_ends_at, migrations.RunPython.noop),
+        # GiST support for the equality on location
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('duration__isnull', True), ('ends_at__isnull', True)), ('ends_at', django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.F('duration'))), _connector='OR'), name='event_ends_at_matches_duration'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('ends_at__isnull', False)), expressions=[('location', '='), (harmony.events.models.TsTzRange('date', 'ends_at'), '&&')], name='event_no_double_booking', violation_error_message='This location is already booked at that time.'),
+        ),
+    ]
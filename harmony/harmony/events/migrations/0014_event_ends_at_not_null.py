@@ -0,0 +1,22 @@
+# Generated by Django 4.2.10 on 2026-10-18 03:38
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_event_no_double_booking'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='event',
+            name='event_ends_at_matches_duration',
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('duration__isnull', True), ('ends_at__isnull', True)), models.Q(('duration__isnull', False), ('ends_at', django.db.models.expressions.CombinedExpression(models.F('date'), '+', models.F('duration'))), ('ends_at__isnull', False)), _connector='OR'), name='event_ends_at_matches_duration'),
+        ),
+    ]
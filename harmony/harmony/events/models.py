@@ -1,5 +1,239 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.fields import RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection
 from django.db import models
+from django.db import transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import TextField
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Lower
+from django.db.models.signals import m2m_changed
+
 from harmony.users.models import User
+from harmony.users.models import display_name
+
+# text search configuration used for Event.search_vector and search queries
+SEARCH_CONFIG = "english"
+
+DOUBLE_BOOKING_MESSAGE = "This location is already booked at that time."
+
+
+def count_attendees():
+    """
+    Correlated subquery counting the attendees of the outer event
+    """
+    attendees = (
+        Event.attendees.through.objects.filter(event_id=OuterRef("pk"))
+        .order_by()
+        .values("event_id")
+        .annotate(total=Count("user_id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(attendees), 0)
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+def booked_span():
+    """
+    [date, ends_at) of the outer event, as indexed by event_no_double_booking
+    """
+    return TsTzRange("date", "ends_at")
+
+
+def insert_attendees(event_ids, user_ids):
+    """
+    RSVP every user to every event with one INSERT ... ON CONFLICT DO NOTHING
+    Returns the (event_id, user_id) pairs that were added, RETURNING leaves out
+    the existing RSVPs as well as those a concurrent request inserted first
+    """
+    through = Event.attendees.through
+    table = connection.ops.quote_name(through._meta.db_table)  # noqa: SLF001
+    sql = (
+        f"INSERT INTO {table} (event_id, user_id) "  # noqa: S608, quoted table name
+        "SELECT event_id, user_id "
+        "FROM unnest(%s::bigint[]) AS events (event_id) "
+        "CROSS JOIN unnest(%s::bigint[]) AS users (user_id) "
+        "ON CONFLICT DO NOTHING RETURNING event_id, user_id"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [list(event_ids), list(user_ids)])
+        return set(cursor.fetchall())
+
+
+def delete_attendees(event_ids, user_ids):
+    """
+    Cancel the RSVPs of every user to every event with one DELETE
+    Returns the (event_id, user_id) pairs that were removed
+    """
+    through = Event.attendees.through
+    rows = list(
+        through.objects.filter(
+            event_id__in=event_ids,
+            user_id__in=user_ids,
+        ).values_list("pk", "event_id", "user_id"),
+    )
+    through.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+    return {(event_id, user_id) for _, event_id, user_id in rows}
+
+
+def send_attendees_changed(instance, action, reverse, pk_set, using):
+    """
+    bulk_create and queryset deletes bypass the related managers, so the
+    m2m_changed signals that keep attendees_count, attendees_version and the
+    event caches current are sent here the way RelatedManager.add() would
+    """
+    m2m_changed.send(
+        sender=Event.attendees.through,
+        instance=instance,
+        action=action,
+        reverse=reverse,
+        model=Event if reverse else User,
+        pk_set=pk_set,
+        using=using,
+    )
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    QuerySet for the Event model
+    """
+
+    def for_listing(self):
+        """
+        Events with everything the list, detail and admin views render
+        Organizer and its member / community profile are fetched in the
+        same statement instead of once per row
+        """
+        return self.select_related(
+            "organizer",
+            "organizer__member",
+            "organizer__community",
+        )
+
+    def update_attendees_count(self, **fields):
+        """
+        Recompute the denormalized attendees_count from the attendees table,
+        along with the other `fields` to update
+        The events are locked first, in pk order. Under READ COMMITTED an
+        UPDATE that waits on a concurrent RSVP still counts from the snapshot
+        taken before it, a statement started after the lock sees that RSVP.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            locked = self.select_for_update(no_key=True).order_by("pk")
+            list(locked.values_list("pk", flat=True))
+            return self.update(attendees_count=count_attendees(), **fields)
+
+    def reconcile_attendees_count(self):
+        """
+        Repair only the events whose attendees_count drifted
+        """
+        return self.exclude(attendees_count=count_attendees()).update_attendees_count()
+
+    def add_attendee(self, user):
+        """
+        RSVP one user to every event of the queryset
+        Returns the ids of the events the user was not attending yet
+        """
+        event_ids = list(self.values_list("pk", flat=True))
+        added = {event_id for event_id, _ in insert_attendees(event_ids, [user.pk])}
+        if added:
+            send_attendees_changed(
+                user,
+                "post_add",
+                reverse=True,
+                pk_set=added,
+                using=self.db,
+            )
+        return added
+
+    def remove_attendee(self, user):
+        """
+        Cancel the RSVPs of one user to every event of the queryset
+        Returns the ids of the events the user was attending
+        """
+        event_ids = list(self.values_list("pk", flat=True))
+        removed = {event_id for event_id, _ in delete_attendees(event_ids, [user.pk])}
+        if removed:
+            send_attendees_changed(
+                user,
+                "post_remove",
+                reverse=True,
+                pk_set=removed,
+                using=self.db,
+            )
+        return removed
+
+    def booked(self, location, start, end):
+        """
+        Events holding `location` at some point of [start, end)
+        Events without a duration do not book their location.
+        """
+        return self.annotate(span=booked_span()).filter(
+            location=location,
+            ends_at__isnull=False,
+            span__overlap=DateTimeTZRange(start, end),
+        )
+
+    def free_slots(self, location, start, end):
+        """
+        The [start, end) intervals of `location` left free between `start` and `end`
+        """
+        slots = []
+        booked = (
+            self.booked(location, start, end)
+            .order_by("date")
+            .values_list("date", "ends_at")
+        )
+        for date, ends_at in booked:
+            if date > start:
+                slots.append((start, date))
+            start = max(start, ends_at)
+        if start < end:
+            slots.append((start, end))
+        return slots
+
+    def update_search_vector(self):
+        """
+        Recompute the weighted full text search document of the events
+        title > tags > location > description
+        """
+        tags = (
+            Tags.objects.filter(events=OuterRef("pk"))
+            .order_by()
+            .values("events")
+            .annotate(names=StringAgg("name", " "))
+            .values("names")
+        )
+        return self.update(
+            search_vector=(
+                SearchVector("title", weight="A", config=SEARCH_CONFIG)
+                + SearchVector(
+                    Coalesce(Subquery(tags), Value(""), output_field=TextField()),
+                    weight="B",
+                    config=SEARCH_CONFIG,
+                )
+                + SearchVector("location", weight="C", config=SEARCH_CONFIG)
+                + SearchVector("description", weight="D", config=SEARCH_CONFIG)
+            ),
+        )
 
 
 class Event(models.Model):
@@ -27,9 +261,21 @@ class Event(models.Model):
     type = models.CharField(max_length=15, choices=EventType.choices, default=EventType.OTHER)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name="events")
     attendees = models.ManyToManyField(User, related_name="attendees", blank=True)
+    # maintained by harmony.events.signals, repaired by reconcile_attendees_counts
+    attendees_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     tags = models.ManyToManyField("Tags", related_name="events", blank=True)
     duration = models.DurationField(blank=True, null=True)
+    # date + duration, kept by save() (timestamptz + interval cannot be indexed)
+    ends_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # maintained by harmony.events.signals, see EventQuerySet.update_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
+    # bumped by harmony.events.signals whenever attendees are added or removed,
+    # together with updated_at it validates cached copies of the event (ETag)
+    attendees_version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = EventQuerySet.as_manager()
 
     def __str__(self):
         if self.organizer.type == "COMMUNITY":
@@ -37,10 +283,115 @@ class Event(models.Model):
         else:
             return f"{self.title} by {self.organizer.member.first_name} {self.organizer.member.last_name}"
 
+    def save(self, *args, **kwargs):
+        self.set_ends_at()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"date", "duration"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "ends_at"}
+        super().save(*args, **kwargs)
+
+    def set_ends_at(self):
+        """
+        Derive ends_at from date and duration, for paths that skip save() (bulk_create)
+        """
+        self.ends_at = self.date + self.duration if self.duration is not None else None
+
+    def attendee_rows(self):
+        """
+        The attendees as values() rows ordered by user id, names joined in
+        Read from the attendees table, without loading User instances
+        """
+        return (
+            Event.attendees.through.objects.filter(event_id=self.pk)
+            .order_by("user_id")
+            .values(
+                "user_id",
+                username=F("user__username"),
+                type=F("user__type"),
+                name=display_name("user"),
+            )
+        )
+
+    def can_manage(self, user):
+        """
+        The organizer and staff can manage the attendees of an event
+        """
+        return user.is_staff or self.organizer_id == user.id
+
+    def add_attendees(self, user_ids):
+        """
+        RSVP many users to this event
+        Returns the ids of the users who were not attending yet
+        """
+        added = {user_id for _, user_id in insert_attendees([self.pk], user_ids)}
+        if added:
+            send_attendees_changed(
+                self,
+                "post_add",
+                reverse=False,
+                pk_set=added,
+                using=self._state.db,
+            )
+        return added
+
+    def remove_attendees(self, user_ids):
+        """
+        Cancel the RSVPs of many users to this event
+        Returns the ids of the users who were attending
+        """
+        removed = {user_id for _, user_id in delete_attendees([self.pk], user_ids)}
+        if removed:
+            send_attendees_changed(
+                self,
+                "post_remove",
+                reverse=False,
+                pk_set=removed,
+                using=self._state.db,
+            )
+        return removed
+
     class Meta:
         verbose_name_plural = "events"
         verbose_name = "event"
-        ordering = ["-date"]
+        # matches event_date_id_idx, so that ordered pages are index scans
+        ordering = ["-date", "id"]
+        indexes = [
+            # ordering, keyset pagination and date range filters of the event feed
+            models.Index(fields=["-date", "id"], name="event_date_id_idx"),
+            models.Index(
+                fields=["-attendees_count", "id"],
+                name="event_attendees_count_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            GinIndex(
+                fields=["location"],
+                name="event_location_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                # ends_at = date + duration is NULL and passes when either is NULL
+                check=Q(duration__isnull=True, ends_at__isnull=True)
+                | Q(
+                    duration__isnull=False,
+                    ends_at__isnull=False,
+                    ends_at=F("date") + F("duration"),
+                ),
+                name="event_ends_at_matches_duration",
+            ),
+            # no two events in the same place at the same time, backed by a GiST index
+            # on (location, tstzrange(date, ends_at)), see EventQuerySet.booked
+            ExclusionConstraint(
+                name="event_no_double_booking",
+                expressions=[
+                    ("location", RangeOperators.EQUAL),
+                    (booked_span(), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(ends_at__isnull=False),
+                violation_error_message=DOUBLE_BOOKING_MESSAGE,
+            ),
+        ]
 
     # def get_absolute_url(self):
     #     """
@@ -65,3 +416,83 @@ class Tags(models.Model):
         verbose_name_plural = "tags"
         verbose_name = "tag"
         ordering = ["name"]
+        indexes = [
+            # case insensitive prefix lookups, LOWER(name) LIKE 'prefix%'
+            models.Index(
+                OpClass(Lower("name"), name="text_pattern_ops"),
+                name="tag_name_lower_prefix_idx",
+            ),
+        ]
+
+
+class EventImport(models.Model):
+    """
+    Class for EventImport model
+    A CSV or NDJSON file of events uploaded by an organizer,
+    imported in the background by harmony.events.tasks.import_events
+    """
+
+    class Format(models.TextChoices):
+        CSV = "CSV", "CSV"
+        NDJSON = "NDJSON", "NDJSON"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    organizer = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="event_imports",
+    )
+    file = models.FileField(upload_to="event_imports/")
+    format = models.CharField(max_length=6, choices=Format.choices)
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    # [{"row": 3, "errors": {"date": [...]}}, ...], 1-based row numbers
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "event imports"
+        verbose_name = "event import"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
+
+
+class EventRecommendation(models.Model):
+    """
+    Class for EventRecommendation model
+    The upcoming events recommended to a user from the tags of the events they
+    attended, best first. Computed for every user at once by
+    harmony.events.tasks.refresh_recommendations
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="event_recommendation",
+    )
+    event_ids = ArrayField(models.PositiveIntegerField(), default=list)
+    scores = ArrayField(models.FloatField(), default=list)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "event recommendations"
+        verbose_name = "event recommendation"
+
+    def __str__(self):
+        return f"Recommendations for {self.user}"
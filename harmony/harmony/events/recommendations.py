@@ -0,0 +1,115 @@
+import numpy as np
+from django.db.models import Count
+from django.db.models import F
+from scipy import sparse
+
+from harmony.events.models import Event
+
+
+def normalize_rows(matrix):
+    """
+    Scale the rows of a sparse matrix to unit length,
+    so that products are cosine similarities
+    """
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def index_of(ids, values):
+    """
+    Positions of `values` in the sorted array of unique `ids`
+    """
+    return np.searchsorted(ids, values)
+
+
+def score_upcoming_events(now, size):
+    """
+    Top `size` upcoming events for every user who attended tagged events
+    A user's interests are the tags of the events they attended (user x tag,
+    weighted by attendance), an event is its tags (event x tag). Scores for
+    all users and upcoming events are the cosine similarities of the two,
+    computed with a single sparse matrix product. Events the user attends
+    or organizes are left out.
+    Returns {user_id: ([event ids best first], [scores])}
+    """
+    interests = np.array(
+        Event.attendees.through.objects.filter(event__tags__isnull=False)
+        .values("user_id", tag_id=F("event__tags"))
+        .annotate(weight=Count("id"))
+        .values_list("user_id", "tag_id", "weight")
+        .order_by(),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    upcoming_tags = Event.tags.through.objects.filter(event__date__gte=now)
+    event_tags = np.array(
+        upcoming_tags.values_list("event_id", "tags_id"),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    if not len(interests) or not len(event_tags):
+        return {}
+
+    user_ids = np.unique(interests[:, 0])
+    event_ids = np.unique(event_tags[:, 0])
+    tag_ids = np.unique(np.concatenate([interests[:, 1], event_tags[:, 1]]))
+
+    users_tags = sparse.csr_matrix(
+        (
+            interests[:, 2].astype(np.float64),
+            (index_of(user_ids, interests[:, 0]), index_of(tag_ids, interests[:, 1])),
+        ),
+        shape=(len(user_ids), len(tag_ids)),
+    )
+    events_tags = sparse.csr_matrix(
+        (
+            np.ones(len(event_tags)),
+            (
+                index_of(event_ids, event_tags[:, 0]),
+                index_of(tag_ids, event_tags[:, 1]),
+            ),
+        ),
+        shape=(len(event_ids), len(tag_ids)),
+    )
+    scores = (normalize_rows(users_tags) @ normalize_rows(events_tags).T).tocsr()
+
+    # (user, event) pairs to leave out, limited to the users and events of the matrix
+    taken = np.array(
+        [
+            *Event.attendees.through.objects.filter(
+                event__date__gte=now,
+                user_id__in=user_ids.tolist(),
+            ).values_list("user_id", "event_id"),
+            *Event.objects.filter(
+                date__gte=now,
+                organizer_id__in=user_ids.tolist(),
+            ).values_list("organizer_id", "id"),
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    taken = taken[np.isin(taken[:, 1], event_ids)]
+    if len(taken):
+        mask = sparse.csr_matrix(
+            (
+                np.ones(len(taken)),
+                (index_of(user_ids, taken[:, 0]), index_of(event_ids, taken[:, 1])),
+            ),
+            shape=scores.shape,
+        )
+        mask.data[:] = 1
+        scores = (scores - scores.multiply(mask)).tocsr()
+    scores.eliminate_zeros()
+
+    recommendations = {}
+    for row, user_id in enumerate(user_ids.tolist()):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        if start == end:
+            continue
+        row_scores = scores.data[start:end]
+        row_events = event_ids[scores.indices[start:end]]
+        # best first, ties broken by event id
+        order = np.lexsort((row_events, -row_scores))[:size]
+        recommendations[user_id] = (
+            row_events[order].tolist(),
+            row_scores[order].tolist(),
+        )
+    return recommendations
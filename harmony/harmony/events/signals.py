@@ -0,0 +1,180 @@
+from weakref import WeakKeyDictionary
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from harmony.events.cache import invalidate_events
+from harmony.events.cache import invalidate_tags
+from harmony.events.models import Event
+from harmony.events.models import Tags
+from harmony.events.tasks import fan_out_events
+from harmony.events.tasks import rebuild_timelines
+from harmony.users.models import Community
+from harmony.users.models import Member
+
+# ids of the related rows of an instance being cleared, which are only
+# known at pre_clear, kept for its post_clear
+cleared_event_ids: WeakKeyDictionary = WeakKeyDictionary()
+cleared_member_ids: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_changed_events(instance, action, reverse, pk_set, accessor):
+    """
+    Events affected by an m2m_changed signal on one of Event's relations,
+    sent from either side of it. `accessor` is the reverse accessor on the
+    related model (e.g. "events" for tags).
+    Returns None for the actions that do not change anything yet.
+    """
+    if action == "pre_clear":
+        if reverse:
+            # the affected events are only known before the rows are gone
+            cleared_event_ids[instance] = list(
+                getattr(instance, accessor).values_list("pk", flat=True),
+            )
+        return None
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return None
+    if not reverse:
+        return Event.objects.filter(pk=instance.pk)
+    if action == "post_clear":
+        return Event.objects.filter(pk__in=cleared_event_ids.pop(instance, []))
+    return Event.objects.filter(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Event)
+def update_event_search_vector(sender, instance, *, raw=False, **kwargs):
+    """
+    Keep the search document in sync with the event's own columns
+    """
+    if raw:
+        return
+    Event.objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(m2m_changed, sender=Event.tags.through)
+def update_tagged_events_search_vector(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs,
+):
+    """
+    Tags are part of the search document, so adding or removing them
+    from either side of the relation refreshes the affected events
+    """
+    events = get_changed_events(instance, action, reverse, pk_set, "events")
+    if events is not None:
+        events.update_search_vector()
+
+
+@receiver(post_save, sender=Tags)
+def update_renamed_tag_events_search_vector(
+    sender,
+    instance,
+    created,
+    *,
+    raw=False,
+    **kwargs,
+):
+    if raw or created:
+        return
+    Event.objects.filter(tags=instance).update_search_vector()
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def update_attendees_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recount attendees_count and change the ETag of events whose attendees
+    were added, removed, cleared or set
+    """
+    events = get_changed_events(instance, action, reverse, pk_set, "attendees")
+    if events is not None:
+        events.update_attendees_count(attendees_version=F("attendees_version") + 1)
+
+
+@receiver(post_save, sender=Community)
+@receiver(post_save, sender=Member)
+def touch_organized_events(sender, instance, *, raw=False, **kwargs):
+    """
+    Organizer names are part of the event payloads,
+    so renaming one changes the ETag of their events
+    """
+    if not raw:
+        Event.objects.filter(organizer_id=instance.user_id).update(updated_at=Now())
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Tags)
+@receiver(post_delete, sender=Tags)
+# organizer names are part of the event payloads
+@receiver(post_save, sender=Community)
+@receiver(post_save, sender=Member)
+def invalidate_events_on_save(sender, *, raw=False, **kwargs):
+    if not raw:
+        invalidate_events()
+
+
+@receiver(m2m_changed, sender=Event.tags.through)
+@receiver(m2m_changed, sender=Event.attendees.through)
+def invalidate_events_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_events()
+
+
+@receiver(post_save, sender=Tags)
+@receiver(post_delete, sender=Tags)
+# deleting an event removes its tag rows, which changes their usage
+@receiver(post_delete, sender=Event)
+def invalidate_tags_on_save(sender, *, raw=False, **kwargs):
+    if not raw:
+        invalidate_tags()
+
+
+@receiver(m2m_changed, sender=Event.tags.through)
+def invalidate_tags_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_tags()
+
+
+@receiver(post_save, sender=Event)
+def publish_event(sender, instance, created, *, raw=False, **kwargs):
+    """
+    Deliver a new event to the timelines of the organizer's members
+    once it is committed, see harmony.events.timelines
+    """
+    if created and not raw:
+        transaction.on_commit(
+            lambda: fan_out_events.delay(instance.organizer_id, [instance.pk]),
+        )
+
+
+@receiver(m2m_changed, sender=Community.members.through)
+def rebuild_member_timelines(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Members who joined or left a community get their timeline rebuilt,
+    from either side of the relation
+    """
+    if action == "pre_clear":
+        if not reverse:
+            cleared_member_ids[instance] = list(
+                instance.members.values_list("pk", flat=True),
+            )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        user_ids = [instance.pk]
+    elif action == "post_clear":
+        user_ids = cleared_member_ids.pop(instance, [])
+    else:
+        user_ids = list(pk_set)
+    if user_ids:
+        transaction.on_commit(lambda: rebuild_timelines.delay(user_ids))
@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Max
+from django.utils import timezone
+
+from config import celery_app
+from harmony.events.cache import invalidate_events
+from harmony.events.imports import MAX_IMPORT_ERRORS
+from harmony.events.imports import import_chunk
+from harmony.events.imports import read_rows
+from harmony.events.models import Event
+from harmony.events.models import EventImport
+from harmony.events.models import EventRecommendation
+from harmony.events.recommendations import score_upcoming_events
+from harmony.events.timelines import push_events
+from harmony.events.timelines import rebuild_timeline
+from harmony.users.models import Community
+from harmony.utils.imports import chunked
+
+
+@celery_app.task()
+def reconcile_attendees_counts(batch_size=1000):
+    """
+    Repair Event.attendees_count drift (e.g. attendees written with raw SQL)
+    Events are walked in primary key ranges, one UPDATE per batch touching only
+    the drifted rows, so that no long lock is held on the events table.
+    """
+    last_id = Event.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    repaired = 0
+    for start in range(0, last_id + 1, batch_size):
+        repaired += Event.objects.filter(
+            id__gte=start,
+            id__lt=start + batch_size,
+        ).reconcile_attendees_count()
+    return repaired
+
+
+@celery_app.task()
+def import_events(import_id, chunk_size=None):
+    """
+    Import the events of an uploaded CSV / NDJSON file
+    The file is streamed from storage and imported chunk by chunk, progress
+    and per-row errors are saved on the EventImport after every chunk.
+    """
+    chunk_size = chunk_size or settings.EVENT_IMPORT_CHUNK_SIZE
+    event_import = EventImport.objects.get(pk=import_id)
+    imports = EventImport.objects.filter(pk=import_id)
+    errors: list[dict] = []
+    try:
+        total_rows = sum(1 for _ in read_rows(event_import))
+        imports.update(status=EventImport.Status.RUNNING, total_rows=total_rows)
+        for chunk in chunked(read_rows(event_import), chunk_size):
+            created, chunk_errors = import_chunk(event_import, chunk)
+            if created:
+                fan_out_events.delay(event_import.organizer_id, created)
+            errors += chunk_errors[: MAX_IMPORT_ERRORS - len(errors)]
+            imports.update(
+                processed_rows=F("processed_rows") + len(chunk),
+                created_count=F("created_count") + len(created),
+                failed_count=F("failed_count") + len(chunk_errors),
+                errors=errors,
+            )
+            invalidate_events()
+    except Exception as e:
+        # e.g. a file that is not UTF-8, the rows imported so far are kept
+        imports.update(
+            status=EventImport.Status.FAILED,
+            errors=[*errors, {"row": None, "errors": [str(e)]}],
+            finished_at=timezone.now(),
+        )
+        raise
+    imports.update(status=EventImport.Status.DONE, finished_at=timezone.now())
+    return imports.values_list("created_count", flat=True).get()
+
+
+@celery_app.task()
+def refresh_recommendations(size=None):
+    """
+    Recompute the recommended events of every user, see harmony.events.recommendations
+    Rows are upserted in batches, users without recommendations anymore lose theirs.
+    """
+    now = timezone.now()
+    recommendations = score_upcoming_events(
+        now,
+        size or settings.EVENT_RECOMMENDATIONS_SIZE,
+    )
+    with transaction.atomic():
+        EventRecommendation.objects.bulk_create(
+            [
+                EventRecommendation(
+                    user_id=user_id,
+                    event_ids=event_ids,
+                    scores=scores,
+                    updated_at=now,
+                )
+                for user_id, (event_ids, scores) in recommendations.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["event_ids", "scores", "updated_at"],
+        )
+        EventRecommendation.objects.filter(updated_at__lt=now).delete()
+    return len(recommendations)
+
+
+@celery_app.task()
+def fan_out_events(organizer_id, event_ids, batch_size=None):
+    """
+    Push newly published events to the timelines of the organizer's members
+    Members are walked in user id ranges and every batch is delivered by its
+    own task, so that a large community is spread over the workers.
+    Events organized by a member have no timelines to reach.
+    """
+    batch_size = batch_size or settings.TIMELINE_FANOUT_BATCH_SIZE
+    members = (
+        Community.members.through.objects.filter(community_id=organizer_id)
+        .order_by("member_id")
+        .values_list("member_id", flat=True)
+    )
+    last_id = 0
+    while batch := list(members.filter(member_id__gt=last_id)[:batch_size]):
+        deliver_events.delay(batch, event_ids)
+        last_id = batch[-1]
+
+
+@celery_app.task()
+def deliver_events(user_ids, event_ids):
+    push_events(user_ids, event_ids)
+
+
+@celery_app.task()
+def rebuild_timelines(user_ids):
+    for user_id in user_ids:
+        rebuild_timeline(user_id)
@@ -0,0 +1,34 @@
+from datetime import UTC
+from datetime import timedelta
+
+from factory import Faker
+from factory import LazyFunction
+from factory import Sequence
+from factory.django import DjangoModelFactory
+
+from harmony.events.models import Event
+from harmony.events.models import Tags
+from harmony.users.tests.factories import CommunityFactory
+
+
+class TagsFactory(DjangoModelFactory):
+    name = Faker("word")
+
+    class Meta:
+        model = Tags
+        django_get_or_create = ["name"]
+
+
+class EventFactory(DjangoModelFactory):
+    title = Faker("sentence", nb_words=4)
+    description = Faker("paragraph")
+    date = Faker("date_time_this_year", before_now=False, after_now=True, tzinfo=UTC)
+    # one room per event, so that events of a batch never double book
+    location = Sequence(lambda n: f"Room {n}")
+    type = Event.EventType.WORKSHOP
+    # events are organized by the user behind a community profile
+    organizer = LazyFunction(lambda: CommunityFactory().user)
+    duration = timedelta(hours=2)
+
+    class Meta:
+        model = Event
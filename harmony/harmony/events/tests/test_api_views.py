@@ -0,0 +1,266 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from harmony.events.api.filters import EventFilter
+from harmony.events.api.views import EventPagination
+from harmony.events.models import Event
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    return APIClient()
+
+
+ATTENDEES_PER_EVENT = 3
+
+
+def _create_events(count: int) -> None:
+    members = MemberFactory.create_batch(ATTENDEES_PER_EVENT)
+    attendees = [member.user for member in members]
+    for event in EventFactory.create_batch(count):
+        event.attendees.set(attendees)
+
+
+class TestEventListAPIView:
+    url = reverse("events:event-list")
+
+    @pytest.mark.parametrize("count", [1, 10])
+    def test_query_count_is_constant(
+        self,
+        api_client,
+        django_assert_num_queries,
+        count,
+    ):
+        _create_events(count)
+        # savepoint + page count + page of events with organizer joined in
+        # + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(4):
+            response = api_client.get(self.url)
+
+        assert response.status_code == HTTPStatus.OK
+        results = response.data["data"]["results"]
+        assert len(results) == count
+        assert all(event["attendees_count"] == ATTENDEES_PER_EVENT for event in results)
+
+    def test_search_does_not_inflate_attendee_count(self, api_client):
+        _create_events(1)
+        event = EventFactory(title="Harmony hackathon")
+        event.tags.create(name="hackathon")
+        event.tags.create(name="coding")
+        attendees = [member.user for member in MemberFactory.create_batch(2)]
+        event.attendees.set(attendees)
+
+        response = api_client.get(self.url, {"search": "hackathon"})
+
+        results = response.data["data"]["results"]
+        assert [result["id"] for result in results] == [event.id]
+        assert results[0]["attendees_count"] == len(attendees)
+        assert results[0]["organizer"] == event.organizer.community.name
+
+
+class TestEventDetailAPIView:
+    def test_query_count_is_constant(self, api_client, django_assert_num_queries):
+        _create_events(1)
+        event = EventFactory()
+        attendees = [member.user for member in MemberFactory.create_batch(10)]
+        event.attendees.set(attendees)
+        api_client.force_authenticate(MemberFactory().user)
+
+        # savepoint + ETag validators + event with organizer joined in
+        # + attendees preview + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(5):
+            response = api_client.get(
+                reverse("events:event-detail", kwargs={"id": event.id}),
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["data"]["attendees_count"] == len(attendees)
+        # the full list is at /api/events/<id>/attendees/
+        assert "attendees" not in response.data["data"]
+        assert (
+            response.data["data"]["attendees_preview"]
+            == sorted(event.attendees.values_list("id", flat=True))[:5]
+        )
+
+
+class TestEventAdmin:
+    def test_changelist_query_count_is_constant(
+        self,
+        admin_client,
+        django_assert_max_num_queries,
+    ):
+        _create_events(10)
+        with django_assert_max_num_queries(8):
+            response = admin_client.get(reverse("admin:events_event_changelist"))
+        assert response.status_code == HTTPStatus.OK
+
+
+class TestEventListKeysetPagination:
+    url = reverse("events:event-list")
+
+    def test_walks_every_event_once(self, api_client):
+        events = EventFactory.create_batch(25)
+        # events sharing a date are ordered by id
+        events += EventFactory.create_batch(3, date=events[0].date)
+
+        seen = []
+        response = api_client.get(self.url, {"pagination": "cursor"})
+        while True:
+            assert response.status_code == HTTPStatus.OK
+            payload = response.data["data"]
+            assert "count" not in payload
+            seen += [event["id"] for event in payload["results"]]
+            if payload["next"] is None:
+                break
+            response = api_client.get(payload["next"])
+
+        assert len(seen) == len(events)
+        expected = Event.objects.order_by("-date", "id").values_list("id", flat=True)
+        assert seen == list(expected)
+
+    def test_cursor_keeps_microseconds(self, api_client):
+        # the second page starts within the millisecond the first one ended in
+        date = timezone.now().replace(microsecond=500_500) + timedelta(days=1)
+        events = [
+            EventFactory(date=date - timedelta(microseconds=n)) for n in range(11)
+        ]
+        first = EventFactory(date=date - timedelta(seconds=1))
+
+        response = api_client.get(self.url, {"pagination": "cursor"})
+        response = api_client.get(response.data["data"]["next"])
+
+        assert [event["id"] for event in response.data["data"]["results"]] == [
+            events[-1].id,
+            first.id,
+        ]
+
+    def test_page_is_not_counted(self, api_client, django_assert_num_queries):
+        _create_events(12)
+        # savepoint + page of events + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(3):
+            response = api_client.get(self.url, {"pagination": "cursor"})
+        assert len(response.data["data"]["results"]) == EventPagination.page_size
+
+    def test_cursor_seeks_the_index(self):
+        pagination = EventPagination()
+        position = [timezone.now(), 1]
+        queryset = Event.objects.order_by(*pagination.ordering).filter(
+            pagination.get_keyset_filter(position),
+        )
+        with connection.cursor() as cursor:
+            # the table is too small for the planner to pick an index on its own
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            sql, params = queryset.values("id").query.sql_with_params()
+            cursor.execute(f"EXPLAIN {sql} LIMIT 10", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert "event_date_id_idx" in plan
+        # seeks to the cursor rather than filtering every row before it
+        assert "Index Cond: (date <=" in plan
+
+    def test_invalid_cursor(self, api_client):
+        response = api_client.get(self.url, {"cursor": "not-a-cursor"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.data["success"] is False
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"ordering": "title"},
+            {"search": "concert"},
+            {"search": "hall", "fuzzy": "true"},
+        ],
+    )
+    def test_ordered_cursor_pages(self, api_client, params):
+        # keyset pages cannot follow another order, rejected rather than ignored
+        response = api_client.get(self.url, {"pagination": "cursor", **params})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.data["success"] is False
+
+
+class TestEventListOrdering:
+    def test_by_attendees_count(self, api_client):
+        quiet, popular = EventFactory.create_batch(2)
+        popular.attendees.set([member.user for member in MemberFactory.create_batch(2)])
+
+        response = api_client.get(
+            reverse("events:event-list"),
+            {"ordering": "-attendees_count"},
+        )
+
+        assert [event["id"] for event in response.data["data"]["results"]] == [
+            popular.id,
+            quiet.id,
+        ]
+
+
+class TestEventDateFilters:
+    url = reverse("events:event-list")
+
+    @pytest.fixture()
+    def events(self):
+        now = timezone.now()
+        return {
+            "past": EventFactory(date=now - timedelta(days=3)),
+            "tomorrow": EventFactory(date=now + timedelta(days=1)),
+            "next_month": EventFactory(date=now + timedelta(days=30)),
+        }
+
+    @pytest.mark.parametrize(
+        ("params", "expected"),
+        [
+            ({"upcoming": "true"}, ["next_month", "tomorrow"]),
+            ({"past": "true"}, ["past"]),
+            ({"week": "true"}, ["tomorrow"]),
+            ({"upcoming": "false"}, ["next_month", "tomorrow", "past"]),
+        ],
+    )
+    def test_windows(self, api_client, events, params, expected):
+        response = api_client.get(self.url, params)
+
+        assert [event["id"] for event in response.data["data"]["results"]] == [
+            events[name].id for name in expected
+        ]
+
+    def test_range(self, api_client, events):
+        response = api_client.get(
+            self.url,
+            {
+                "date__gte": (timezone.now() - timedelta(days=4)).isoformat(),
+                "date__lt": events["next_month"].date.isoformat(),
+            },
+        )
+
+        assert [event["id"] for event in response.data["data"]["results"]] == [
+            events["tomorrow"].id,
+            events["past"].id,
+        ]
+
+    def test_upcoming_is_an_index_range_scan(self):
+        queryset = EventFilter({"upcoming": "true"}, queryset=Event.objects.all()).qs
+        with connection.cursor() as cursor:
+            # the table is too small for the planner to pick an index on its own
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            sql, params = queryset.values("id").query.sql_with_params()
+            cursor.execute(f"EXPLAIN {sql} LIMIT 10", params)
+            page_plan = "\n".join(row[0] for row in cursor.fetchall())
+            sql, params = queryset.order_by().values("id").query.sql_with_params()
+            count_sql = f"EXPLAIN SELECT COUNT(*) FROM ({sql}) AS page"  # noqa: S608
+            cursor.execute(count_sql, params)
+            count_plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert "event_date_id_idx" in page_plan
+        assert "Sort" not in page_plan
+        assert "Index Only Scan using event_date_id_idx" in count_plan
@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.api.serializers import ATTENDEES_PREVIEW_SIZE
+from harmony.events.models import Event
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    return APIClient()
+
+
+def _create_events(count: int) -> None:
+    attendees = [member.user for member in MemberFactory.create_batch(3)]
+    for event in EventFactory.create_batch(count):
+        event.attendees.set(attendees)
+
+
+class TestAsyncEventListAPIView:
+    url = reverse("events:event-list-async")
+
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"page": 2}, {"pagination": "cursor"}, {"ordering": "title"}],
+    )
+    def test_same_pages_as_the_sync_view(self, api_client, params):
+        _create_events(12)
+
+        response = api_client.get(self.url, params)
+
+        assert response.status_code == HTTPStatus.OK
+        expected = api_client.get(reverse("events:event-list"), params).json()
+        assert response.json()["data"]["results"] == expected["data"]["results"]
+
+    def test_query_count_is_constant(self, api_client, django_assert_num_queries):
+        count = 10
+        _create_events(count)
+        # page count + page of events with organizer joined in, no savepoints
+        with django_assert_num_queries(2):
+            response = api_client.get(self.url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["data"]["count"] == count
+        assert response["X-Cache"] == "MISS"
+
+    def test_cached(self, api_client, django_assert_num_queries):
+        _create_events(1)
+        etag = api_client.get(self.url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = api_client.get(self.url)
+            not_modified = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response["X-Cache"] == "HIT"
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_walks_every_event_once(self, api_client):
+        EventFactory.create_batch(25)
+
+        seen = []
+        response = api_client.get(self.url, {"pagination": "cursor"})
+        while True:
+            payload = response.json()["data"]
+            seen += [event["id"] for event in payload["results"]]
+            if payload["next"] is None:
+                break
+            response = api_client.get(payload["next"])
+
+        assert seen == list(
+            Event.objects.order_by("-date", "id").values_list("id", flat=True),
+        )
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"cursor": "not-a-cursor"},
+            {"page": 9},
+            {"pagination": "cursor", "ordering": "title"},
+        ],
+    )
+    def test_invalid_page(self, api_client, params):
+        response = api_client.get(self.url, params)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()["success"] is False
+
+    def test_post_not_allowed(self, api_client):
+        assert api_client.post(self.url).status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+class TestAsyncEventDetailAPIView:
+    def _url(self, event):
+        return reverse("events:event-detail-async", kwargs={"id": event.id})
+
+    def test_same_payload_as_the_sync_view(self, api_client, django_assert_num_queries):
+        event = EventFactory()
+        event.attendees.set([member.user for member in MemberFactory.create_batch(7)])
+        api_client.force_authenticate(MemberFactory().user)
+
+        # ETag validators + event with organizer joined in + attendees preview
+        with django_assert_num_queries(3):
+            response = api_client.get(self._url(event))
+
+        assert response.status_code == HTTPStatus.OK
+        expected = api_client.get(
+            reverse("events:event-detail", kwargs={"id": event.id}),
+        )
+        assert response.json() == expected.json()
+        assert response["ETag"] == expected["ETag"]
+        preview = response.json()["data"]["attendees_preview"]
+        assert len(preview) == ATTENDEES_PREVIEW_SIZE
+
+    def test_not_modified(self, api_client):
+        event = EventFactory()
+        api_client.force_authenticate(MemberFactory().user)
+        last_modified = api_client.get(self._url(event))["Last-Modified"]
+
+        assert (
+            api_client.get(
+                self._url(event),
+                HTTP_IF_MODIFIED_SINCE=last_modified,
+            ).status_code
+            == HTTPStatus.NOT_MODIFIED
+        )
+
+    def test_not_found(self, api_client):
+        api_client.force_authenticate(MemberFactory().user)
+
+        response = api_client.get(
+            reverse("events:event-detail-async", kwargs={"id": 0}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.json()["message"] == "Event not found"
+
+    def test_authentication_required(self, api_client):
+        response = api_client.get(self._url(EventFactory()))
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.api.views import AttendeePagination
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(MemberFactory().user)
+    return client
+
+
+@pytest.fixture()
+def event():
+    event = EventFactory()
+    event.attendees.add(
+        *[member.user for member in MemberFactory.create_batch(4)],
+        CommunityFactory().user,
+    )
+    return event
+
+
+class TestEventAttendeesAPIView:
+    def test_walks_every_attendee_once(
+        self,
+        api_client,
+        event,
+        monkeypatch,
+        django_assert_num_queries,
+    ):
+        monkeypatch.setattr(AttendeePagination, "page_size", 2)
+
+        seen = []
+        url = reverse("events:event-attendees", kwargs={"id": event.id})
+        while url:
+            # savepoint + event + page of attendees
+            # + savepoint release (ATOMIC_REQUESTS)
+            with django_assert_num_queries(4):
+                response = api_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            seen += response.data["data"]["results"]
+            url = response.data["data"]["next"]
+
+        attendees = event.attendees.order_by("id")
+        assert [attendee["id"] for attendee in seen] == [user.id for user in attendees]
+        assert (
+            seen[0]["name"]
+            == f"{attendees[0].member.first_name} {attendees[0].member.last_name}"
+        )
+        assert seen[-1]["name"] == attendees[4].community.name
+
+    def test_unknown_event(self, api_client):
+        response = api_client.get(reverse("events:event-attendees", kwargs={"id": 0}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestEventAttendeeIdsAPIView:
+    def test_streams_all_ids(self, api_client, event):
+        response = api_client.get(
+            reverse("events:event-attendee-ids", kwargs={"id": event.id}),
+        )
+
+        assert response.streaming
+        content = b"".join(response.streaming_content).decode()
+        assert content.splitlines() == [
+            str(pk) for pk in sorted(event.attendees.values_list("id", flat=True))
+        ]
+
+    def test_unknown_event(self, api_client):
+        response = api_client.get(
+            reverse("events:event-attendee-ids", kwargs={"id": 0}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.autocomplete import search_tags
+from harmony.events.autocomplete import tag_index
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def tags():
+    python, pytorch, rust = (
+        TagsFactory(name=name) for name in ["Python", "pytorch", "rust"]
+    )
+    TagsFactory(name="pyramid")
+    for event in EventFactory.create_batch(3):
+        event.tags.add(pytorch, rust)
+    EventFactory().tags.add(python)
+    return python, pytorch, rust
+
+
+class TestTagIndex:
+    def test_prefix_ranked_by_usage(self, tags, django_assert_num_queries):
+        # the index is built with one query, then served from memory
+        with django_assert_num_queries(1):
+            assert tag_index.search("PY", 10) == [
+                ("pytorch", 3),
+                ("Python", 1),
+                ("pyramid", 0),
+            ]
+        with django_assert_num_queries(0):
+            assert tag_index.search("pyt", 2) == [("pytorch", 3), ("Python", 1)]
+            assert tag_index.search("go", 10) == []
+
+    def test_rebuilt_when_tags_change(self, tags):
+        python = tags[0]
+        tag_index.search("py", 10)
+
+        for event in EventFactory.create_batch(4):
+            event.tags.add(python)
+        TagsFactory(name="pyspark")
+
+        assert tag_index.search("py", 10) == [
+            ("Python", 5),
+            ("pytorch", 3),
+            ("pyramid", 0),
+            ("pyspark", 0),
+        ]
+
+    def test_database_fallback(self, tags, settings, django_assert_num_queries):
+        settings.TAG_AUTOCOMPLETE_INDEX_LIMIT = 2
+        tag_index.search("py", 10)
+
+        with django_assert_num_queries(1):
+            assert tag_index.search("PY", 2) == [("pytorch", 3), ("Python", 1)]
+
+    def test_fallback_uses_prefix_index(self, tags):
+        sql, params = _fallback_sql("py")
+        with connection.cursor() as cursor:
+            # the table is too small for the planner to pick an index on its own
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        assert "tag_name_lower_prefix_idx" in plan
+
+
+def _fallback_sql(prefix):
+    captured = []
+
+    def capture(execute, sql, params, many, context):
+        captured.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        search_tags(prefix, 10)
+    return captured[0]
+
+
+class TestTagAutocompleteAPIView:
+    def test_suggestions(self, tags):
+        response = APIClient().get(
+            reverse("events:tag-autocomplete"),
+            {"q": "py", "limit": "1"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["data"] == [{"name": "pytorch", "usage": 3}]
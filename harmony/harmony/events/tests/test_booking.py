@@ -0,0 +1,142 @@
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from harmony.events.api.serializers import EventCreateSerializer
+from harmony.events.models import Event
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import CommunityFactory
+
+pytestmark = pytest.mark.django_db
+
+DAY = date(2030, 5, 6)
+
+
+def _at(hour, minute=0):
+    return timezone.make_aware(datetime.combine(DAY, time(hour, minute)))
+
+
+@pytest.fixture()
+def api_client():
+    client = APIClient()
+    client.force_authenticate(CommunityFactory().user)
+    return client
+
+
+@pytest.fixture()
+def booked():
+    return [
+        EventFactory(location="Main hall", date=_at(10), duration=timedelta(hours=2)),
+        EventFactory(location="Main hall", date=_at(11), duration=None),
+        EventFactory(location="Main hall", date=_at(14), duration=timedelta(hours=1)),
+        EventFactory(location="Lab", date=_at(9), duration=timedelta(hours=8)),
+    ]
+
+
+class TestDoubleBooking:
+    def _create(self, api_client, **data):
+        payload = {
+            "title": "Talk",
+            "description": "d",
+            "date": DAY.isoformat(),
+            "location": "Main hall",
+            "type": "MEETING",
+            **data,
+        }
+        return api_client.post(reverse("events:event-create"), payload)
+
+    @pytest.mark.parametrize(
+        ("start", "duration", "status_code"),
+        [
+            ("11:30", "01:00:00", 400),
+            ("09:00", "01:30:00", 400),
+            ("09:00", "12:00:00", 400),
+            # back to back with the ends of the 10:00 and 14:00 events
+            ("12:00", "02:00:00", 201),
+            ("15:00", "01:00:00", 201),
+            # an event without a duration does not book the room
+            ("11:00", "", 201),
+        ],
+    )
+    @pytest.mark.usefixtures("booked")
+    def test_create(self, api_client, start, duration, status_code):
+        response = self._create(api_client, time=start, duration=duration)
+
+        assert response.status_code == status_code
+        if status_code == HTTPStatus.BAD_REQUEST:
+            assert "location" in response.data["errors"]
+
+    def test_concurrent_booking(self, api_client, booked, monkeypatch):
+        # the other request committed after this one checked the location
+        monkeypatch.setattr(EventCreateSerializer, "check_double_booking", False)
+
+        response = self._create(api_client, time="11:30", duration="01:00:00")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.data["success"] is False
+        assert "location" in response.data["errors"]
+
+    def test_constraint(self, booked):
+        with pytest.raises(IntegrityError, match="event_no_double_booking"):
+            EventFactory(
+                location="Main hall",
+                date=_at(13, 30),
+                duration=timedelta(hours=1),
+            )
+
+    def test_duration_without_ends_at(self, booked):
+        # a write path that skips set_ends_at() must not bypass the exclusion
+        event = EventFactory.build(
+            location="Main hall",
+            date=_at(10, 30),
+            duration=timedelta(hours=1),
+        )
+        with pytest.raises(IntegrityError, match="event_ends_at_matches_duration"):
+            Event.objects.bulk_create([event])
+
+    def test_clash_check_matches_the_constraint_index(self):
+        # same predicate and expressions as event_no_double_booking, so that its
+        # GiST index can answer the clash check
+        sql = str(Event.objects.booked("Main hall", _at(9), _at(18)).query)
+
+        assert '"events_event"."ends_at" IS NOT NULL' in sql
+        assert '"events_event"."location" = ' in sql
+        assert 'TSTZRANGE("events_event"."date", "events_event"."ends_at") &&' in sql
+
+
+class TestEventFreeSlotsAPIView:
+    url = reverse("events:event-free-slots")
+
+    def test_free_slots(self, api_client, booked):
+        response = api_client.get(
+            self.url,
+            {"location": "Main hall", "date": DAY.isoformat()},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert [(slot["start"], slot["end"]) for slot in response.data["data"]] == [
+            (_at(0), _at(10)),
+            (_at(12), _at(14)),
+            (_at(15), _at(0) + timedelta(days=1)),
+        ]
+
+    def test_free_all_day(self, api_client, booked):
+        response = api_client.get(
+            self.url,
+            {"location": "Roof", "date": DAY.isoformat()},
+        )
+
+        assert len(response.data["data"]) == 1
+
+    def test_invalid_query(self, api_client):
+        response = api_client.get(self.url, {"location": "Main hall"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
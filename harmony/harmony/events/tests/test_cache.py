@@ -0,0 +1,122 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.cache import event_list_cache
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    return APIClient()
+
+
+class TestEventListCache:
+    url = reverse("events:event-list")
+
+    def test_second_request_is_a_hit(self, api_client, django_assert_num_queries):
+        EventFactory.create_batch(3)
+
+        first = api_client.get(self.url)
+        # only the ATOMIC_REQUESTS savepoint and its release
+        with django_assert_num_queries(2):
+            second = api_client.get(self.url)
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert event_list_cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_relative_filters_are_cached_per_time_window(self, api_client, monkeypatch):
+        EventFactory.create_batch(3)
+        first = api_client.get(self.url, {"upcoming": "true"})
+        assert api_client.get(self.url, {"upcoming": "true"})["X-Cache"] == "HIT"
+        api_client.get(self.url)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + event_list_cache.time_bucket)
+
+        response = api_client.get(self.url, {"upcoming": "true"})
+        assert response["X-Cache"] == "MISS"
+        assert response["ETag"] != first["ETag"]
+        # pages that do not depend on the current time are kept
+        assert api_client.get(self.url)["X-Cache"] == "HIT"
+
+    def test_query_string_is_normalized(self, api_client):
+        EventFactory.create_batch(3)
+
+        api_client.get(self.url, {"ordering": "title", "page": 1})
+        response = api_client.get(f"{self.url}?page=1&ordering=title")
+
+        assert response["X-Cache"] == "HIT"
+        assert api_client.get(self.url, {"ordering": "-title"})["X-Cache"] == "MISS"
+
+    def test_event_save_invalidates(self, api_client):
+        event = EventFactory(title="Before")
+        api_client.get(self.url)
+
+        event.title = "After"
+        event.save()
+
+        response = api_client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["data"]["results"][0]["title"] == "After"
+
+    def test_event_delete_invalidates(self, api_client):
+        event = EventFactory()
+        api_client.get(self.url)
+
+        event.delete()
+
+        assert api_client.get(self.url).data["data"]["results"] == []
+
+    def test_attendee_change_invalidates(self, api_client):
+        event = EventFactory()
+        api_client.get(self.url)
+
+        event.attendees.add(MemberFactory().user)
+
+        assert (
+            api_client.get(self.url).data["data"]["results"][0]["attendees_count"] == 1
+        )
+
+    def test_tag_change_invalidates(self, api_client):
+        event = EventFactory(title="Weekly meetup")
+        assert (
+            api_client.get(self.url, {"tags__name": "robotics"}).data["data"]["results"]
+            == []
+        )
+
+        event.tags.add(TagsFactory(name="robotics"))
+
+        response = api_client.get(self.url, {"tags__name": "robotics"})
+        assert [result["id"] for result in response.data["data"]["results"]] == [
+            event.id,
+        ]
+
+    def test_organizer_rename_invalidates(self, api_client):
+        event = EventFactory()
+        api_client.get(self.url)
+
+        community = event.organizer.community
+        community.name = "Renamed Society"
+        community.save()
+
+        assert (
+            api_client.get(self.url).data["data"]["results"][0]["organizer"]
+            == "Renamed Society"
+        )
+
+    def test_failures_are_not_cached(self, api_client):
+        api_client.get(self.url, {"cursor": "not-a-cursor"})
+        response = api_client.get(self.url, {"cursor": "not-a-cursor"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not response.has_header("X-Cache")
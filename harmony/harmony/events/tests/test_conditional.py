@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(MemberFactory().user)
+    return client
+
+
+class TestEventDetailConditional:
+    def _url(self, event):
+        return reverse("events:event-detail", kwargs={"id": event.id})
+
+    def test_unchanged_event_is_not_serialized(
+        self,
+        api_client,
+        django_assert_num_queries,
+    ):
+        event = EventFactory()
+        etag = api_client.get(self._url(event))["ETag"]
+
+        # savepoint + validators + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(3):
+            response = api_client.get(self._url(event), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.content == b""
+
+    def test_last_modified(self, api_client):
+        event = EventFactory()
+        last_modified = api_client.get(self._url(event))["Last-Modified"]
+
+        response = api_client.get(
+            self._url(event),
+            HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_attendee_change_changes_etag(self, api_client):
+        event = EventFactory()
+        etag = api_client.get(self._url(event))["ETag"]
+
+        MemberFactory().user.attendees.add(event)
+
+        response = api_client.get(self._url(event), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"] != etag
+        assert response.data["data"]["attendees_count"] == 1
+
+    def test_organizer_rename_changes_etag(self, api_client):
+        event = EventFactory()
+        etag = api_client.get(self._url(event))["ETag"]
+
+        community = event.organizer.community
+        community.name = "Renamed Society"
+        community.save()
+
+        assert (
+            api_client.get(self._url(event), HTTP_IF_NONE_MATCH=etag).status_code
+            == HTTPStatus.OK
+        )
+
+    def test_missing_event(self, api_client):
+        response = api_client.get(reverse("events:event-detail", kwargs={"id": 0}))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not response.has_header("ETag")
+
+
+class TestEventListConditional:
+    url = reverse("events:event-list")
+
+    def test_unchanged_page(self, api_client):
+        EventFactory.create_batch(3)
+        etag = api_client.get(self.url)["ETag"]
+
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_pages_have_their_own_etag(self, api_client):
+        EventFactory.create_batch(3)
+        assert (
+            api_client.get(self.url)["ETag"]
+            != api_client.get(self.url, {"ordering": "title"})["ETag"]
+        )
+
+    def test_event_change_changes_etag(self, api_client):
+        event = EventFactory()
+        etag = api_client.get(self.url)["ETag"]
+
+        event.attendees.add(MemberFactory().user)
+
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["data"]["results"][0]["attendees_count"] == 1
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import MemberFactory
+from harmony.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _content(response):
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+class TestEventExportAPIView:
+    @pytest.mark.parametrize("count", [1, 10])
+    def test_csv(self, django_assert_num_queries, count):
+        events = EventFactory.create_batch(count)
+        events[0].tags.add(TagsFactory(name="rust"), TagsFactory(name="go"))
+        events[0].attendees.add(MemberFactory().user)
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=True))
+
+        response = client.get(
+            reverse("events:event-export", kwargs={"export_format": "csv"}),
+        )
+        # every row comes out of a single statement, whatever the number of events
+        with django_assert_num_queries(1):
+            rows = list(csv.DictReader(io.StringIO(_content(response))))
+
+        assert response["Content-Type"] == "text/csv"
+        assert 'filename="events.csv"' in response["Content-Disposition"]
+        assert [int(row["id"]) for row in rows] == sorted(event.id for event in events)
+        assert rows[0]["organizer_name"] == events[0].organizer.community.name
+        assert rows[0]["tag_names"] == "go, rust"
+        assert rows[0]["attendees_count"] == "1"
+
+    def test_ndjson(self):
+        event = EventFactory()
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=True))
+
+        response = client.get(
+            reverse("events:event-export", kwargs={"export_format": "ndjson"}),
+        )
+
+        rows = [json.loads(line) for line in _content(response).splitlines()]
+        assert [row["id"] for row in rows] == [event.id]
+        assert rows[0]["tag_names"] == ""
+
+    def test_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(MemberFactory().user)
+
+        response = client.get(
+            reverse("events:event-export", kwargs={"export_format": "csv"}),
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_unknown_format(self):
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=True))
+
+        response = client.get(
+            reverse("events:event-export", kwargs={"export_format": "xlsx"}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestEventAttendeesExportAPIView:
+    def test_roster(self):
+        event = EventFactory()
+        member = MemberFactory()
+        CommunityFactory().members.add(member)
+        community = CommunityFactory()
+        event.attendees.add(member.user, community.user)
+        client = APIClient()
+        client.force_authenticate(event.organizer)
+
+        response = client.get(
+            reverse(
+                "events:event-attendees-export",
+                kwargs={"id": event.id, "export_format": "csv"},
+            ),
+        )
+
+        rows = list(csv.DictReader(io.StringIO(_content(response))))
+        # ordered by user id
+        assert [row["username"] for row in rows] == [
+            member.user.username,
+            community.user.username,
+        ]
+        assert rows[0]["name"] == f"{member.first_name} {member.last_name}"
+        assert rows[0]["communities"] == member.communities.get().name
+        assert rows[1]["name"] == community.name
+        assert rows[1]["communities"] == ""
+
+    def test_only_the_organizer(self):
+        event = EventFactory()
+        client = APIClient()
+        client.force_authenticate(MemberFactory().user)
+
+        response = client.get(
+            reverse(
+                "events:event-attendees-export",
+                kwargs={"id": event.id, "export_format": "csv"},
+            ),
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
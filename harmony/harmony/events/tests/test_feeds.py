@@ -0,0 +1,182 @@
+import time
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from harmony.events.cache import event_feed_cache
+from harmony.events.feeds import user_feed_token
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import UserFactory
+from harmony.utils.ical import MAX_LINE_OCTETS
+from harmony.utils.ical import fold_line
+
+pytestmark = pytest.mark.django_db
+
+
+def community_feed_url(community):
+    return reverse("events:community-feed", kwargs={"id": community.user_id})
+
+
+class TestICal:
+    def test_folds_long_lines_on_character_boundaries(self):
+        line = "SUMMARY:" + "é" * 60
+        folded = fold_line(line).split("\r\n ")
+
+        assert all(len(part.encode()) <= MAX_LINE_OCTETS for part in folded)
+        assert "".join(folded) == line
+
+
+class TestEventFeeds:
+    @pytest.fixture()
+    def community(self):
+        return CommunityFactory(name="Robotics Club")
+
+    @pytest.fixture()
+    def events(self, community):
+        first = EventFactory(
+            organizer=community.user,
+            title="Build night; bring tools, snacks",
+            date=datetime(2099, 1, 10, 12, 30, tzinfo=UTC),
+        )
+        second = EventFactory(
+            organizer=community.user,
+            date=timezone.now() + timedelta(days=3),
+        )
+        # too old for the feed
+        EventFactory(
+            organizer=community.user,
+            date=timezone.now() - timedelta(days=365),
+        )
+        # organized by someone else
+        EventFactory()
+        return first, second
+
+    def test_community_feed(self, events, community):
+        response = APIClient().get(community_feed_url(community))
+        body = response.content.decode()
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "text/calendar; charset=utf-8"
+        assert body.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+        assert body.endswith("END:VEVENT\r\nEND:VCALENDAR\r\n")
+        assert "X-WR-CALNAME:Robotics Club\r\n" in body
+        assert body.count("BEGIN:VEVENT") == len(events)
+        assert f"UID:event-{events[0].id}@harmony\r\n" in body
+        assert "SUMMARY:Build night\\; bring tools\\, snacks\r\n" in body
+        assert "DTSTART:20990110T123000Z\r\nDTEND:20990110T143000Z\r\n" in body
+
+    def test_cached_and_conditional(self, events, community, django_assert_num_queries):
+        client = APIClient()
+        url = community_feed_url(community)
+        response = client.get(url)
+
+        with django_assert_num_queries(0):
+            assert client.get(url).content == response.content
+            assert (
+                client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code
+                == HTTPStatus.NOT_MODIFIED
+            )
+
+    def test_invalidated_on_change(self, events, community):
+        client = APIClient()
+        url = community_feed_url(community)
+        response = client.get(url)
+
+        events[1].title = "Rescheduled"
+        events[1].save()
+
+        changed = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert changed.status_code == HTTPStatus.OK
+        assert changed["ETag"] != response["ETag"]
+        assert "SUMMARY:Rescheduled\r\n" in changed.content.decode()
+
+    def test_expires_with_the_time_window(self, events, community, monkeypatch):
+        client = APIClient()
+        url = community_feed_url(community)
+        response = client.get(url)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + event_feed_cache.time_bucket)
+
+        # the oldest event may have left the FEED_HISTORY window
+        assert (
+            client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code
+            == HTTPStatus.OK
+        )
+
+    def test_renders_only_changed_events(
+        self,
+        events,
+        community,
+        django_assert_num_queries,
+    ):
+        client = APIClient()
+        url = community_feed_url(community)
+        client.get(url)
+
+        EventFactory(organizer=community.user, date=timezone.now() + timedelta(days=5))
+
+        # the community, the feed's ids and the one new event, the others come from
+        # the cache
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.content.decode().count("BEGIN:VEVENT") == len(events) + 1
+
+    def test_unknown_community(self):
+        response = APIClient().get(reverse("events:community-feed", kwargs={"id": 0}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_tag_feed(self, events):
+        tag = TagsFactory(name="robots")
+        events[0].tags.add(tag)
+
+        response = APIClient().get(
+            reverse("events:tag-feed", kwargs={"name": "robots"}),
+        )
+        body = response.content.decode()
+
+        assert response.status_code == HTTPStatus.OK
+        assert "X-WR-CALNAME:#robots\r\n" in body
+        assert body.count("BEGIN:VEVENT") == 1
+
+    def test_user_feed(self, events):
+        user = UserFactory()
+        events[1].attendees.add(user)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        url = client.get(reverse("events:event-feed-url")).data["data"]["url"]
+        response = APIClient().get(url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert f"UID:event-{events[1].id}@harmony\r\n" in response.content.decode()
+        assert response.content.decode().count("BEGIN:VEVENT") == 1
+
+    def test_user_feed_rejects_tampered_token(self):
+        token = user_feed_token(UserFactory())
+
+        response = APIClient().get(
+            reverse("events:user-feed", kwargs={"token": token[:-1] + "x"}),
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_user_feed_revoked_by_password_change(self, events):
+        user = UserFactory()
+        url = reverse("events:user-feed", kwargs={"token": user_feed_token(user)})
+        assert APIClient().get(url).status_code == HTTPStatus.OK
+
+        user.set_password("a new password")
+        user.save()
+
+        # the feed is still cached
+        assert APIClient().get(url).status_code == HTTPStatus.NOT_FOUND
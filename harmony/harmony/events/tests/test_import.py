@@ -0,0 +1,213 @@
+import json
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from harmony.events.models import Event
+from harmony.events.models import EventImport
+from harmony.events.models import Tags
+from harmony.events.tasks import import_events
+from harmony.users.tests.factories import CommunityFactory
+
+pytestmark = pytest.mark.django_db
+
+CSV = """title,description,date,time,location,type,tags,duration
+Intro to Rust,Basics,2030-01-10,18:00,Pune,WORKSHOP,"rust, systems",02:00:00
+Hack night,All night,2030-01-11,20:00,Mumbai,MEETING,,
+Broken,No date,,18:00,Pune,WORKSHOP,,
+Wrong type,Bad,2030-01-12,18:00,Pune,PARTY,rust,
+"""
+# the first two rows of CSV are valid
+CSV_VALID_ROWS = 2
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+
+@pytest.fixture()
+def organizer():
+    return CommunityFactory().user
+
+
+def _import(organizer, name, content, file_format=EventImport.Format.CSV):
+    return EventImport.objects.create(
+        organizer=organizer,
+        file=SimpleUploadedFile(name, content.encode()),
+        format=file_format,
+    )
+
+
+class TestImportEvents:
+    def test_csv(self, organizer):
+        event_import = _import(organizer, "events.csv", CSV)
+
+        assert import_events(event_import.id, chunk_size=3) == CSV_VALID_ROWS
+
+        event_import.refresh_from_db()
+        assert event_import.status == EventImport.Status.DONE
+        assert (event_import.total_rows, event_import.processed_rows) == (4, 4)
+        assert (event_import.created_count, event_import.failed_count) == (2, 2)
+        assert [error["row"] for error in event_import.errors] == [3, 4]
+        assert "date" in event_import.errors[0]["errors"]
+        assert "type" in event_import.errors[1]["errors"]
+
+        rust = Event.objects.get(title="Intro to Rust")
+        assert rust.organizer == organizer
+        # date and time are in TIME_ZONE, as for EventCreateAPIView
+        assert (
+            timezone.localtime(rust.date).strftime("%Y-%m-%d %H:%M")
+            == "2030-01-10 18:00"
+        )
+        assert sorted(rust.tags.values_list("name", flat=True)) == ["rust", "systems"]
+        # created without post_save, the search document is filled in anyway
+        assert list(Event.objects.filter(search_vector="systems")) == [rust]
+
+    def test_ndjson_reuses_existing_tags(self, organizer):
+        Tags.objects.create(name="rust")
+        rows = [
+            {
+                "title": "One",
+                "description": "d",
+                "date": "2030-02-01",
+                "time": "10:00",
+                "location": "Pune",
+                "tags": ["rust"],
+            },
+            {
+                "title": "Two",
+                "description": "d",
+                "date": "2030-02-02",
+                "time": "10:00",
+                "location": "Pune",
+                "tags": ["rust", "go"],
+            },
+        ]
+        content = "\n".join([*map(json.dumps, rows), "", "not json"]) + "\n"
+        event_import = _import(
+            organizer,
+            "events.ndjson",
+            content,
+            EventImport.Format.NDJSON,
+        )
+
+        import_events(event_import.id)
+
+        event_import.refresh_from_db()
+        assert (event_import.created_count, event_import.failed_count) == (2, 1)
+        assert [error["row"] for error in event_import.errors] == [3]
+        assert set(Tags.objects.values_list("name", flat=True)) == {"rust", "go"}
+        assert Event.objects.filter(tags__name="rust").count() == len(rows)
+
+    def test_chunk_queries_do_not_grow_with_rows(
+        self,
+        organizer,
+        django_assert_max_num_queries,
+    ):
+        count = 200
+        rows = "".join(
+            f"Event {n},d,2030-03-01,10:00,Pune,MEETING,tag{n % 3},\n"
+            for n in range(count)
+        )
+        event_import = _import(
+            organizer,
+            "events.csv",
+            CSV.splitlines()[0] + "\n" + rows,
+        )
+
+        with django_assert_max_num_queries(15):
+            import_events(event_import.id, chunk_size=500)
+
+        assert Event.objects.count() == count
+
+    def test_double_bookings(self, organizer):
+        rows = [
+            "Booked,d,2030-01-10,18:00,Hall,MEETING,,02:00:00",
+            # overlaps the row above
+            "Clash,d,2030-01-10,19:00,Hall,MEETING,,01:00:00",
+            "Back to back,d,2030-01-10,20:00,Hall,MEETING,,01:00:00",
+            # overlaps an existing event
+            "Late,d,2030-01-10,22:30,Hall,MEETING,,01:00:00",
+        ]
+        content = "\n".join([CSV.splitlines()[0], *rows, ""])
+        Event.objects.create(
+            title="Existing",
+            description="d",
+            date=datetime(2030, 1, 10, 23, tzinfo=timezone.get_current_timezone()),
+            duration=timedelta(hours=1),
+            location="Hall",
+            organizer=organizer,
+        )
+        event_import = _import(organizer, "events.csv", content)
+
+        import_events(event_import.id)
+
+        event_import.refresh_from_db()
+        assert [error["row"] for error in event_import.errors] == [2, 4]
+        assert "location" in event_import.errors[0]["errors"]
+        assert set(Event.objects.values_list("title", flat=True)) == {
+            "Existing",
+            "Booked",
+            "Back to back",
+        }
+
+    def test_undecodable_file_fails(self, organizer):
+        event_import = EventImport.objects.create(
+            organizer=organizer,
+            file=SimpleUploadedFile("events.csv", b"title\n\xff\xfe\n"),
+            format=EventImport.Format.CSV,
+        )
+
+        with pytest.raises(UnicodeDecodeError):
+            import_events(event_import.id)
+
+        event_import.refresh_from_db()
+        assert event_import.status == EventImport.Status.FAILED
+        assert event_import.errors[-1]["row"] is None
+
+
+class TestEventImportAPIViews:
+    def test_upload_and_progress(self, organizer, django_capture_on_commit_callbacks):
+        client = APIClient()
+        client.force_authenticate(organizer)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("events:event-import"),
+                {"file": SimpleUploadedFile("events.csv", CSV.encode())},
+                format="multipart",
+            )
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.data["data"]["format"] == EventImport.Format.CSV
+        url = reverse(
+            "events:event-import-detail",
+            kwargs={"id": response.data["data"]["id"]},
+        )
+        response = client.get(url)
+        assert response.data["data"]["status"] == EventImport.Status.DONE
+        assert response.data["data"]["created_count"] == CSV_VALID_ROWS
+
+        client.force_authenticate(CommunityFactory().user)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_unknown_format(self, organizer):
+        client = APIClient()
+        client.force_authenticate(organizer)
+
+        response = client.post(
+            reverse("events:event-import"),
+            {"file": SimpleUploadedFile("events.xlsx", b"...")},
+            format="multipart",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert "format" in response.data["errors"]
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+from django.db import connection
+from django.db import transaction
+
+from harmony.events.models import Event
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _count(event):
+    event.refresh_from_db(fields=["attendees_count"])
+    return event.attendees_count
+
+
+class TestAttendeesCount:
+    def test_add_remove_clear(self):
+        event = EventFactory()
+        users = [member.user for member in MemberFactory.create_batch(3)]
+
+        event.attendees.add(*users)
+        assert _count(event) == len(users)
+
+        # adding an existing attendee again is not counted twice
+        event.attendees.add(users[0])
+        assert _count(event) == len(users)
+
+        event.attendees.remove(users[0])
+        assert _count(event) == len(users) - 1
+
+        event.attendees.clear()
+        assert _count(event) == 0
+
+    def test_set(self):
+        event = EventFactory()
+        users = [member.user for member in MemberFactory.create_batch(3)]
+        event.attendees.set(users[:2])
+
+        event.attendees.set(users[1:])
+
+        assert _count(event) == len(users[1:])
+
+    def test_from_the_user_side(self):
+        events = EventFactory.create_batch(2)
+        user = MemberFactory().user
+
+        user.attendees.add(*events)
+        assert [_count(event) for event in events] == [1, 1]
+
+        user.attendees.remove(events[0])
+        assert [_count(event) for event in events] == [0, 1]
+
+        user.attendees.clear()
+        assert [_count(event) for event in events] == [0, 0]
+
+    def test_reconcile_only_touches_drifted_events(self):
+        drifted, correct = EventFactory.create_batch(2)
+        drifted.attendees.add(MemberFactory().user)
+        Event.objects.filter(pk=drifted.pk).update(attendees_count=7)
+
+        assert Event.objects.reconcile_attendees_count() == 1
+        assert _count(drifted) == 1
+        assert _count(correct) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_rsvps_are_both_counted():
+    event = EventFactory()
+    users = [member.user for member in MemberFactory.create_batch(2)]
+    first, second = users
+    counted = threading.Event()
+    release = threading.Event()
+
+    def rsvp():
+        try:
+            with transaction.atomic():
+                event.attendees.add(second)
+                counted.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=rsvp)
+    thread.start()
+    counted.wait(5)
+    # the recount below waits on the lock of the other RSVP until it commits
+    threading.Timer(0.5, release.set).start()
+    event.attendees.add(first)
+    thread.join()
+
+    assert _count(event) == len(users)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from harmony.events.models import EventRecommendation
+from harmony.events.tasks import refresh_recommendations
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _event(*tags, days=7):
+    event = EventFactory(date=timezone.now() + timedelta(days=days))
+    event.tags.add(*tags)
+    return event
+
+
+@pytest.fixture()
+def user():
+    return MemberFactory().user
+
+
+@pytest.fixture()
+def upcoming(user):
+    rust, python, go = (TagsFactory(name=name) for name in ["rust", "python", "go"])
+    # interests: rust three times (with the upcoming event below), python once
+    for event in [_event(rust, days=-30), _event(rust, python, days=-10)]:
+        event.attendees.add(user)
+    attending = _event(rust)
+    attending.attendees.add(user)
+    return {
+        "rust": _event(rust),
+        "rust_python": _event(rust, python),
+        "python": _event(python),
+        "go": _event(go),
+        "attending": attending,
+    }
+
+
+class TestRefreshRecommendations:
+    def test_ranked_by_shared_tags(self, user, upcoming):
+        assert refresh_recommendations() == 1
+
+        recommendation = EventRecommendation.objects.get(user=user)
+        # unrelated and already attended events are left out
+        assert recommendation.event_ids == [
+            upcoming["rust"].id,
+            upcoming["rust_python"].id,
+            upcoming["python"].id,
+        ]
+        assert recommendation.scores == sorted(recommendation.scores, reverse=True)
+
+    def test_stale_recommendations_are_removed(self, user, upcoming):
+        refresh_recommendations()
+        user.attendees.clear()
+
+        assert refresh_recommendations() == 0
+        assert not EventRecommendation.objects.exists()
+
+
+class TestEventRecommendedAPIView:
+    url = reverse("events:event-recommended")
+
+    def test_reads_precomputed_recommendations(
+        self,
+        user,
+        upcoming,
+        django_assert_num_queries,
+    ):
+        refresh_recommendations(size=2)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        # savepoint + recommendation row + events with organizer joined in
+        # + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(4):
+            response = client.get(self.url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert [event["id"] for event in response.data["data"]] == [
+            upcoming["rust"].id,
+            upcoming["rust_python"].id,
+        ]
+
+    def test_most_attended_without_recommendations(self, user, upcoming):
+        upcoming["go"].attendees.add(
+            *[member.user for member in MemberFactory.create_batch(2)],
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get(self.url)
+
+        assert response.data["data"][0]["id"] == upcoming["go"].id
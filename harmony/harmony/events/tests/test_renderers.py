@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import io
+import uuid
+from http import HTTPStatus
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+from harmony.utils.parsers import ORJSONParser
+from harmony.utils.renderers import ORJSONRenderer
+from harmony.utils.response import response_payload
+
+
+@pytest.fixture()
+def payload():
+    return response_payload(
+        success=True,
+        message=_("Events list fetched"),
+        data={
+            "utc": datetime.datetime(2024, 5, 1, 18, 30, tzinfo=datetime.UTC),
+            "paris": datetime.datetime(
+                2024,
+                5,
+                1,
+                18,
+                30,
+                0,
+                250000,
+                tzinfo=ZoneInfo("Europe/Paris"),
+            ),
+            # rendered as is, without an offset
+            "naive": datetime.datetime(2024, 5, 1, 18, 30),  # noqa: DTZ001
+            "date": datetime.date(2024, 5, 1),
+            "time": datetime.time(18, 30),
+            "duration": datetime.timedelta(hours=2, minutes=30),
+            "price": decimal.Decimal("12.50"),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "error": ErrorDetail("Invalid", code="invalid"),
+            "counts": {1: "one", 2: "two"},
+            "text": "café \u2028 \u2029",
+        },
+    )
+
+
+class TestORJSONRenderer:
+    def test_same_output_as_json_renderer(self, payload):
+        assert ORJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+    def test_empty(self):
+        assert ORJSONRenderer().render(None) == b""
+
+    def test_indent(self, payload):
+        rendered = ORJSONRenderer().render(payload, "application/json; indent=4")
+
+        assert rendered.startswith(b'{\n  "success": true')
+
+    @pytest.mark.django_db()
+    def test_event_detail(self):
+        event = EventFactory(duration=datetime.timedelta(hours=2))
+        api_client = APIClient()
+        api_client.force_authenticate(MemberFactory().user)
+
+        response = api_client.get(
+            reverse("events:event-detail", kwargs={"id": event.id}),
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Type"] == "application/json"
+        assert response.json()["data"]["duration"] == "02:00:00"
+
+
+class TestORJSONParser:
+    def test_parse(self):
+        body = '{"title": "café", "attendees": [1, 2], "duration": "02:00:00"}'.encode()
+
+        assert ORJSONParser().parse(io.BytesIO(body)) == {
+            "title": "café",
+            "attendees": [1, 2],
+            "duration": "02:00:00",
+        }
+
+    @pytest.mark.parametrize("body", [b'{"title": ', b'{"price": NaN}', b'"\xff"'])
+    def test_invalid(self, body):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(body))
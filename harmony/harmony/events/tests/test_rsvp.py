@@ -0,0 +1,166 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.db import transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.models import insert_attendees
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def api_client() -> APIClient:
+    return APIClient()
+
+
+def _counters(event):
+    event.refresh_from_db(fields=["attendees_count", "attendees_version"])
+    return event.attendees_count, event.attendees_version
+
+
+class TestEventAttendeesBulkAPIView:
+    def test_add_and_remove(self, api_client, django_assert_num_queries):
+        event = EventFactory()
+        users = [member.user for member in MemberFactory.create_batch(5)]
+        event.attendees.add(users[0])
+        api_client.force_authenticate(event.organizer)
+        url = reverse("events:event-attendees-bulk", kwargs={"id": event.id})
+        ids = [user.id for user in users]
+
+        # savepoint + event + ids exist + INSERT + lock + counters
+        # + rows to remove + DELETE + lock + counters + savepoint release
+        with django_assert_num_queries(11):
+            response = api_client.post(
+                url,
+                {"add": ids[1:], "remove": ids[:1]},
+                format="json",
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["data"] == {"added": ids[1:], "removed": ids[:1]}
+        assert set(event.attendees.values_list("id", flat=True)) == set(ids[1:])
+        assert _counters(event) == (4, 3)
+
+    def test_existing_attendees_are_not_added_twice(self, api_client):
+        event = EventFactory()
+        users = [member.user for member in MemberFactory.create_batch(3)]
+        event.attendees.add(*users[:2])
+        api_client.force_authenticate(event.organizer)
+        url = reverse("events:event-attendees-bulk", kwargs={"id": event.id})
+
+        response = api_client.post(
+            url,
+            {"add": [user.id for user in users]},
+            format="json",
+        )
+
+        assert response.data["data"]["added"] == [users[2].id]
+        assert _counters(event)[0] == len(users)
+
+    def test_only_the_organizer(self, api_client):
+        event = EventFactory()
+        api_client.force_authenticate(MemberFactory().user)
+        url = reverse("events:event-attendees-bulk", kwargs={"id": event.id})
+
+        response = api_client.post(url, {"add": [event.organizer.id]}, format="json")
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not event.attendees.exists()
+
+    def test_unknown_users(self, api_client):
+        event = EventFactory()
+        user = MemberFactory().user
+        api_client.force_authenticate(event.organizer)
+        url = reverse("events:event-attendees-bulk", kwargs={"id": event.id})
+
+        response = api_client.post(
+            url,
+            {"add": [user.id, user.id + 1000]},
+            format="json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.data["errors"]["missing"] == [str(user.id + 1000)]
+        assert not event.attendees.exists()
+
+
+class TestUserEventsBulkAPIView:
+    url = reverse("events:event-rsvp")
+
+    def test_join_and_leave(self, api_client, django_assert_num_queries):
+        events = EventFactory.create_batch(4)
+        user = MemberFactory().user
+        user.attendees.add(events[0])
+        api_client.force_authenticate(user)
+        ids = [event.id for event in events]
+
+        # savepoint + ids exist + events to join + INSERT + lock + counters
+        # + savepoint release, nothing is queried for the empty "remove"
+        with django_assert_num_queries(7):
+            response = api_client.post(
+                self.url,
+                {"add": ids, "remove": []},
+                format="json",
+            )
+        assert response.data["data"] == {"added": ids[1:], "removed": []}
+
+        response = api_client.post(self.url, {"remove": ids[2:]}, format="json")
+
+        assert response.data["data"] == {"added": [], "removed": ids[2:]}
+        assert [_counters(event)[0] for event in events] == [1, 1, 0, 0]
+
+    def test_invalidates_event_list(self, api_client):
+        event = EventFactory()
+        list_url = reverse("events:event-list")
+        api_client.get(list_url)
+        api_client.force_authenticate(MemberFactory().user)
+
+        api_client.post(self.url, {"add": [event.id]}, format="json")
+
+        response = api_client.get(list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["data"]["results"][0]["attendees_count"] == 1
+
+    @pytest.mark.parametrize(
+        "payload",
+        [{}, {"add": [], "remove": []}, {"add": [1], "remove": [1]}],
+    )
+    def test_invalid_payload(self, api_client, payload):
+        api_client.force_authenticate(MemberFactory().user)
+
+        response = api_client.post(self.url, payload, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_rsvp_is_not_reported_as_added():
+    event = EventFactory()
+    user = MemberFactory().user
+    inserted = threading.Event()
+    release = threading.Event()
+
+    def rsvp():
+        try:
+            with transaction.atomic():
+                insert_attendees([event.id], [user.id])
+                inserted.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=rsvp)
+    thread.start()
+    inserted.wait(5)
+    # waits on the unique index until the other RSVP commits
+    threading.Timer(0.5, release.set).start()
+    added = insert_attendees([event.id], [user.id])
+    thread.join()
+
+    assert added == set()
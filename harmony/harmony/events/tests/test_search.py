@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.models import Event
+from harmony.events.tests.factories import EventFactory
+from harmony.events.tests.factories import TagsFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _search(term, **params):
+    response = APIClient().get(reverse("events:event-list"), {"search": term, **params})
+    assert response.status_code == HTTPStatus.OK
+    return [event["id"] for event in response.data["data"]["results"]]
+
+
+class TestEventSearch:
+    def test_results_are_ranked_by_field_weight(self):
+        in_description = EventFactory(
+            title="Annual meetup",
+            description="Robotics demos all day",
+        )
+        in_location = EventFactory(title="Open house", location="Robotics lab")
+        in_title = EventFactory(title="Robotics workshop")
+        EventFactory(title="Poetry slam")
+
+        assert _search("robotics") == [in_title.id, in_location.id, in_description.id]
+
+    def test_explicit_ordering_wins_over_rank(self):
+        first = EventFactory(title="Chess club", description="Chess")
+        second = EventFactory(title="Chess night")
+
+        assert _search("chess", ordering="title") == [first.id, second.id]
+
+    def test_stemmed_terms_match(self):
+        event = EventFactory(title="Painting session")
+        assert _search("paintings") == [event.id]
+
+    def test_tag_changes_update_the_vector(self):
+        event = EventFactory(title="Weekly meetup")
+        tag = TagsFactory(name="blockchain")
+
+        event.tags.add(tag)
+        assert _search("blockchain") == [event.id]
+
+        tag.name = "cryptography"
+        tag.save()
+        assert _search("cryptography") == [event.id]
+
+        tag.events.clear()
+        assert _search("cryptography") == []
+
+    def test_each_event_is_returned_once(self):
+        event = EventFactory(title="Hackathon")
+        event.tags.add(TagsFactory(name="hackathon"), TagsFactory(name="coding"))
+
+        assert _search("hackathon coding") == [event.id]
+
+    def test_title_edit_updates_the_vector(self):
+        event = EventFactory(title="Drama rehearsal")
+        Event.objects.filter(pk=event.pk).update(title="Dance rehearsal")
+        event.refresh_from_db()
+        event.save()
+
+        assert _search("dance") == [event.id]
+        assert _search("drama") == []
+
+
+class TestEventFuzzySearch:
+    def test_misspelled_location(self):
+        event = EventFactory(location="Auditorium Hall")
+        EventFactory(location="Seminar Room 2")
+
+        assert _search("auditorim", fuzzy="true") == [event.id]
+
+    def test_full_text_search_does_not_match_typos(self):
+        EventFactory(location="Auditorium Hall")
+        assert _search("auditorim") == []
@@ -0,0 +1,24 @@
+import pytest
+from celery.result import EagerResult
+
+from harmony.events.models import Event
+from harmony.events.tasks import reconcile_attendees_counts
+from harmony.events.tests.factories import EventFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reconcile_attendees_counts(settings):
+    events = EventFactory.create_batch(5)
+    user = MemberFactory().user
+    user.attendees.add(*events)
+    drifted = [events[0].pk, events[3].pk]
+    Event.objects.filter(pk__in=drifted).update(attendees_count=0)
+
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    task_result = reconcile_attendees_counts.delay(batch_size=2)
+
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result == len(drifted)
+    assert set(Event.objects.values_list("attendees_count", flat=True)) == {1}
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.events.tasks import fan_out_events
+from harmony.events.tests.factories import EventFactory
+from harmony.events.timelines import get_redis
+from harmony.events.timelines import read_timeline
+from harmony.events.timelines import timeline_key
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _timelines(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    yield
+    keys = list(get_redis().scan_iter(timeline_key("*")))
+    if keys:
+        get_redis().delete(*keys)
+
+
+@pytest.fixture()
+def community():
+    return CommunityFactory()
+
+
+@pytest.fixture()
+def members(community):
+    members = MemberFactory.create_batch(3)
+    community.members.add(*members)
+    return [member.user for member in members]
+
+
+def _publish(community, django_capture_on_commit_callbacks, count=1):
+    with django_capture_on_commit_callbacks(execute=True):
+        return [EventFactory(organizer=community.user) for _ in range(count)]
+
+
+class TestFanOut:
+    def test_published_events_reach_every_member(
+        self,
+        community,
+        members,
+        django_capture_on_commit_callbacks,
+    ):
+        events = _publish(community, django_capture_on_commit_callbacks, count=2)
+        EventFactory()
+
+        for user in members:
+            assert read_timeline(user.id, None, 10) == [events[1].id, events[0].id]
+
+    def test_members_delivered_in_batches(
+        self,
+        community,
+        members,
+        django_assert_num_queries,
+    ):
+        event = EventFactory(organizer=community.user)
+
+        # one query per batch of members, plus the empty one that ends the walk
+        with django_assert_num_queries(3):
+            fan_out_events(community.user_id, [event.id], batch_size=2)
+        assert all(read_timeline(user.id, None, 10) == [event.id] for user in members)
+
+    def test_trimmed(
+        self,
+        settings,
+        community,
+        members,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.TIMELINE_MAX_LENGTH = 2
+        events = _publish(community, django_capture_on_commit_callbacks, count=3)
+
+        assert read_timeline(members[0].id, None, 10) == [events[2].id, events[1].id]
+
+    def test_rebuilt_on_join_and_leave(
+        self,
+        community,
+        django_capture_on_commit_callbacks,
+    ):
+        events = _publish(community, django_capture_on_commit_callbacks, count=2)
+        member = MemberFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.communities.add(community)
+        assert read_timeline(member.user_id, None, 10) == [events[1].id, events[0].id]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            community.members.clear()
+        assert read_timeline(member.user_id, None, 10) == []
+
+
+class TestEventTimelineAPIView:
+    url = reverse("events:event-timeline")
+
+    def test_pages(
+        self,
+        community,
+        members,
+        django_capture_on_commit_callbacks,
+        django_assert_max_num_queries,
+    ):
+        events = _publish(community, django_capture_on_commit_callbacks, count=12)
+        events[5].delete()
+        client = APIClient()
+        client.force_authenticate(members[0])
+
+        response = client.get(self.url)
+        page = response.data["data"]
+        assert response.status_code == HTTPStatus.OK
+        assert [event["id"] for event in page["results"]] == [
+            event.id for event in events[:1:-1] if event.pk
+        ]
+
+        # the events of the page are fetched in one query, whatever the size of the
+        # timeline
+        with django_assert_max_num_queries(4):
+            page = client.get(page["next"]).data["data"]
+        assert [event["id"] for event in page["results"]] == [
+            events[1].id,
+            events[0].id,
+        ]
+        assert page["next"] is None
+
+    def test_invalid_cursor(self, members):
+        client = APIClient()
+        client.force_authenticate(members[0])
+
+        assert (
+            client.get(self.url, {"cursor": "abc"}).status_code == HTTPStatus.NOT_FOUND
+        )
+
+    def test_requires_authentication(self):
+        assert APIClient().get(self.url).status_code == HTTPStatus.UNAUTHORIZED
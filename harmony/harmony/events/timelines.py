@@ -0,0 +1,67 @@
+from django.conf import settings
+
+from harmony.events.models import Event
+from harmony.users.models import Community
+from harmony.utils.redis import connect
+
+# Every member has a sorted set of the events published by their communities,
+# scored by event id: ids grow with publication, so they order the timeline
+# and double as the cursor of its pages.
+TIMELINE_KEY = "timeline:{}"
+
+
+def get_redis():
+    return connect(settings.TIMELINE_REDIS_URL)
+
+
+def timeline_key(user_id):
+    return TIMELINE_KEY.format(user_id)
+
+
+def push_events(user_ids, event_ids):
+    """
+    Add events to the timelines of users, trimmed to TIMELINE_MAX_LENGTH,
+    in one round trip
+    """
+    mapping = {event_id: event_id for event_id in event_ids}
+    pipeline = get_redis().pipeline(transaction=False)
+    for user_id in user_ids:
+        key = timeline_key(user_id)
+        pipeline.zadd(key, mapping)
+        pipeline.zremrangebyrank(key, 0, -settings.TIMELINE_MAX_LENGTH - 1)
+    pipeline.execute()
+
+
+def rebuild_timeline(user_id):
+    """
+    Replace the timeline of a user with the latest events of their communities,
+    after they joined or left one
+    """
+    communities = Community.objects.filter(members=user_id).values("user_id")
+    event_ids = list(
+        Event.objects.filter(organizer__in=communities)
+        .order_by("-id")
+        .values_list("id", flat=True)[: settings.TIMELINE_MAX_LENGTH],
+    )
+    key = timeline_key(user_id)
+    pipeline = get_redis().pipeline()
+    pipeline.delete(key)
+    if event_ids:
+        pipeline.zadd(key, {event_id: event_id for event_id in event_ids})
+    pipeline.execute()
+
+
+def read_timeline(user_id, before, count):
+    """
+    Ids of the `count` latest events of a timeline older than `before`
+    (an event id, None for the first page), newest first
+    """
+    maximum = f"({before}" if before is not None else "+inf"
+    ids = get_redis().zrevrangebyscore(
+        timeline_key(user_id),
+        maximum,
+        "-inf",
+        start=0,
+        num=count,
+    )
+    return [int(event_id) for event_id in ids]
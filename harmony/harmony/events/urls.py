@@ -1,10 +1,86 @@
 from django.urls import path
-from harmony.events.api.views import EventListAPIView, EventDetailAPIView, EventCreateAPIView
+
+from harmony.events.api.async_views import AsyncEventDetailAPIView
+from harmony.events.api.async_views import AsyncEventListAPIView
+from harmony.events.api.views import EventAttendeeIdsAPIView
+from harmony.events.api.views import EventAttendeesAPIView
+from harmony.events.api.views import EventAttendeesBulkAPIView
+from harmony.events.api.views import EventAttendeesExportAPIView
+from harmony.events.api.views import EventCreateAPIView
+from harmony.events.api.views import EventDetailAPIView
+from harmony.events.api.views import EventExportAPIView
+from harmony.events.api.views import EventFeedURLAPIView
+from harmony.events.api.views import EventFreeSlotsAPIView
+from harmony.events.api.views import EventImportCreateAPIView
+from harmony.events.api.views import EventImportDetailAPIView
+from harmony.events.api.views import EventListAPIView
+from harmony.events.api.views import EventRecommendedAPIView
+from harmony.events.api.views import EventTimelineAPIView
+from harmony.events.api.views import TagAutocompleteAPIView
+from harmony.events.api.views import UserEventsBulkAPIView
+from harmony.events.views import community_event_feed_view
+from harmony.events.views import tag_event_feed_view
+from harmony.events.views import user_event_feed_view
 
 app_name = "events"
 urlpatterns = [
     path("", EventListAPIView.as_view(), name="event-list"),
     path("<int:id>/", EventDetailAPIView.as_view(), name="event-detail"),
+    # served without holding a worker under ASGI, see config/asgi.py
+    path("async/", AsyncEventListAPIView.as_view(), name="event-list-async"),
+    path(
+        "async/<int:id>/",
+        AsyncEventDetailAPIView.as_view(),
+        name="event-detail-async",
+    ),
     path("create/", EventCreateAPIView.as_view(), name="event-create"),
+    path(
+        "<int:id>/attendees/",
+        EventAttendeesAPIView.as_view(),
+        name="event-attendees",
+    ),
+    path(
+        "<int:id>/attendees/ids/",
+        EventAttendeeIdsAPIView.as_view(),
+        name="event-attendee-ids",
+    ),
+    path(
+        "<int:id>/attendees/bulk/",
+        EventAttendeesBulkAPIView.as_view(),
+        name="event-attendees-bulk",
+    ),
+    path("rsvp/", UserEventsBulkAPIView.as_view(), name="event-rsvp"),
+    path("import/", EventImportCreateAPIView.as_view(), name="event-import"),
+    path(
+        "import/<int:id>/",
+        EventImportDetailAPIView.as_view(),
+        name="event-import-detail",
+    ),
+    path(
+        "export/<str:export_format>/",
+        EventExportAPIView.as_view(),
+        name="event-export",
+    ),
+    path(
+        "<int:id>/attendees/export/<str:export_format>/",
+        EventAttendeesExportAPIView.as_view(),
+        name="event-attendees-export",
+    ),
+    path("free-slots/", EventFreeSlotsAPIView.as_view(), name="event-free-slots"),
+    path("timeline/", EventTimelineAPIView.as_view(), name="event-timeline"),
+    path("recommended/", EventRecommendedAPIView.as_view(), name="event-recommended"),
+    path(
+        "tags/autocomplete/",
+        TagAutocompleteAPIView.as_view(),
+        name="tag-autocomplete",
+    ),
+    path("feeds/me/", EventFeedURLAPIView.as_view(), name="event-feed-url"),
+    path("feeds/users/<str:token>.ics", user_event_feed_view, name="user-feed"),
+    path(
+        "feeds/communities/<int:id>.ics",
+        community_event_feed_view,
+        name="community-feed",
+    ),
+    path("feeds/tags/<str:name>.ics", tag_event_feed_view, name="tag-feed"),
 
 ]
@@ -0,0 +1,98 @@
+from abc import ABC
+from abc import abstractmethod
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.http import HttpResponseNotFound
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
+
+from harmony.events.cache import event_feed_cache
+from harmony.events.feeds import feed_etag
+from harmony.events.feeds import render_feed
+from harmony.events.feeds import user_id_from_feed_token
+from harmony.events.models import Event
+from harmony.events.models import Tags
+from harmony.users.models import Community
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class EventFeedView(ABC, View):
+    """
+    Base view of the .ics feeds
+    The rendered feed is cached as bytes under the events generation, so the
+    signals that invalidate the event list invalidate the feeds too, and
+    If-None-Match is answered without touching the database.
+    Subclasses return the name of the calendar and its events from get_feed,
+    or None when there is no such feed.
+    """
+
+    content_type = "text/calendar; charset=utf-8"
+
+    @method_decorator(condition(etag_func=feed_etag))
+    def get(self, request, **kwargs):
+        key = event_feed_cache.get_key(request)
+        body = event_feed_cache.get(key)
+        if body is None:
+            feed = self.get_feed(**kwargs)
+            if feed is None:
+                return HttpResponseNotFound()
+            name, events = feed
+            body = render_feed(name, events)
+            event_feed_cache.set(key, body)
+        return HttpResponse(body, content_type=self.content_type)
+
+    @abstractmethod
+    def get_feed(self, **kwargs):
+        """
+        The name of the calendar and its events, None when there is no such feed
+        """
+
+
+class UserEventFeedView(EventFeedView):
+    """
+    Events a user RSVPed to, addressed by the token of
+    harmony.events.feeds.user_feed_token
+    """
+
+    def get(self, request, token):
+        # checked before the cached feed and its ETag, which outlive the token
+        self.user_id = user_id_from_feed_token(token)
+        if self.user_id is None:
+            return HttpResponseNotFound()
+        return super().get(request, token=token)
+
+    def get_feed(self, token):
+        return "My Harmony events", Event.objects.filter(attendees=self.user_id)
+
+
+class CommunityEventFeedView(EventFeedView):
+    """
+    Events organized by a community
+    """
+
+    def get_feed(self, id):  # noqa: A002, the URL kwarg
+        name = (
+            Community.objects.filter(user_id=id).values_list("name", flat=True).first()
+        )
+        if name is None:
+            return None
+        return name, Event.objects.filter(organizer_id=id)
+
+
+class TagEventFeedView(EventFeedView):
+    """
+    Events with a tag
+    """
+
+    def get_feed(self, name):
+        tag = Tags.objects.filter(name=name).first()
+        if tag is None:
+            return None
+        return f"#{tag.name}", Event.objects.filter(tags=tag)
+
+
+user_event_feed_view = UserEventFeedView.as_view()
+community_event_feed_view = CommunityEventFeedView.as_view()
+tag_event_feed_view = TagEventFeedView.as_view()
@@ -3,11 +3,14 @@ from django.contrib import admin
 from django.contrib.auth import admin as auth_admin
 from django.contrib.auth import decorators
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from harmony.users.forms import UserAdminChangeForm
 from harmony.users.forms import UserAdminCreationForm
 from harmony.users.models import Member
+from harmony.users.models import MemberImport
+from harmony.users.tasks import import_members
 
 User = get_user_model()
 
@@ -44,3 +47,45 @@ class MemberAdmin(admin.ModelAdmin):
         (_("Personal info"), {"fields": ("first_name", "last_name", "date_of_birth")}),
     )
 
+
+@admin.register(MemberImport)
+class MemberImportAdmin(admin.ModelAdmin):
+    list_display = [
+        "file",
+        "created_by",
+        "status",
+        "processed_rows",
+        "total_rows",
+        "created_count",
+        "failed_count",
+    ]
+    list_filter = ["status"]
+    fields = [
+        "file",
+        "status",
+        "total_rows",
+        "processed_rows",
+        "created_count",
+        "failed_count",
+        "errors",
+        "finished_at",
+    ]
+    readonly_fields = [
+        "status",
+        "total_rows",
+        "processed_rows",
+        "created_count",
+        "failed_count",
+        "errors",
+        "finished_at",
+    ]
+
+    def save_model(self, request, obj, form, change):
+        """
+        Uploading a roster queues its import once the upload is committed
+        """
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+        if not change:
+            transaction.on_commit(lambda: import_members.delay(obj.pk))
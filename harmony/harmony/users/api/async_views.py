@@ -0,0 +1,206 @@
+import json
+
+from allauth.account import app_settings as allauth_account_settings
+from allauth.account.utils import complete_signup
+from allauth.account.utils import filter_users_by_username
+from asgiref.sync import sync_to_async
+from dj_rest_auth.app_settings import api_settings
+from dj_rest_auth.jwt_auth import set_jwt_cookies
+from dj_rest_auth.utils import jwt_encode
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.http import JsonResponse
+from rest_framework import serializers
+from rest_framework import status
+from rest_framework.response import Response
+
+from harmony.users.api.serializers import UserRegisterSerializer
+from harmony.users.api.serializers import UserSerializer
+from harmony.users.api.views import UserListView
+from harmony.users.hashing import password_hashing
+from harmony.users.hashing import verify_password
+from harmony.utils.executors import ExecutorSaturatedError
+from harmony.utils.response import response_payload
+from harmony.utils.views import AsyncAPIView
+from harmony.utils.views import AsyncGenericAPIView
+
+User = get_user_model()
+
+INVALID_CREDENTIALS_MESSAGE = "Unable to log in with provided credentials."
+SATURATED_MESSAGE = "Too many logins in progress, retry shortly."
+
+# Async counterparts of dj_rest_auth's LoginView and RegisterView, with the same
+# request and response bodies. Served by the ASGI application (config.asgi),
+# password hashing runs in harmony.users.hashing.password_hashing instead of
+# pinning a worker, so other requests keep being served during a login burst.
+
+
+def _parse_body(request):
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return {**request.POST.dict(), **request.FILES.dict()}
+
+
+def _jwt_response(request, user, status):
+    access, refresh = jwt_encode(user)
+    serializer = api_settings.JWT_SERIALIZER(
+        instance={"user": user, "access": access, "refresh": refresh},
+        context={"request": request},
+    )
+    return JsonResponse(serializer.data, status=status), access, refresh
+
+
+def _saturated_response():
+    return JsonResponse(
+        {"detail": SATURATED_MESSAGE},
+        status=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+class LoginAPIView(AsyncAPIView):
+    """
+    This class represents the async login view.
+    Authentication is not required for this view.
+    Returns the JWT pair and the user, and sets the JWT cookies.
+    """
+
+    http_method_names = ["post", "options"]
+
+    async def post(self, request, *args, **kwargs):
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({"detail": "Malformed request body."}, status=400)
+        errors = {
+            field: ["This field is required."]
+            for field in ("username", "password")
+            if not isinstance(data.get(field), str) or not data[field]
+        }
+        if errors:
+            return JsonResponse(errors, status=400)
+
+        # case insensitive like allauth's backend, which the sync login goes through
+        user = await filter_users_by_username(data["username"]).afirst()
+        encoded = user.password if user else None
+        try:
+            valid, upgraded = await password_hashing.run(
+                verify_password,
+                encoded,
+                data["password"],
+            )
+        except ExecutorSaturatedError:
+            return _saturated_response()
+        if not valid or user is None or not user.is_active:
+            return JsonResponse(
+                {"non_field_errors": [INVALID_CREDENTIALS_MESSAGE]},
+                status=400,
+            )
+        if upgraded:
+            await User.objects.filter(pk=user.pk).aupdate(password=upgraded)
+
+        response, access, refresh = _jwt_response(request, user, status=200)
+        set_jwt_cookies(response, access, refresh)
+        return response
+
+
+def _register(request, serializer):
+    with transaction.atomic():
+        user = serializer.save(request)
+        complete_signup(
+            request,
+            user,
+            allauth_account_settings.EMAIL_VERIFICATION,
+            None,
+        )
+    return user
+
+
+class RegisterAPIView(AsyncAPIView):
+    """
+    This class represents the async registration view.
+    Authentication is not required for this view.
+    Creates a member or community like dj_rest_auth's RegisterView and returns the
+    JWT pair.
+    """
+
+    http_method_names = ["post", "options"]
+
+    async def post(self, request, *args, **kwargs):
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({"detail": "Malformed request body."}, status=400)
+        serializer = UserRegisterSerializer(data=data, context={"request": request})
+        # uniqueness lookups and password validators, no hashing
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+        password = serializer.validated_data["password1"]
+        # validate_password1 has no user to compare the password with, and save()
+        # skips the validators once password1 is hashed here, so run them now
+        candidate = User(
+            username=serializer.validated_data["username"],
+            email=serializer.validated_data["email"],
+        )
+        try:
+            validate_password(password, user=candidate)
+        except ValidationError as exc:
+            return JsonResponse(serializers.as_serializer_error(exc), status=400)
+        try:
+            serializer.password_hash = await password_hashing.run(
+                make_password,
+                password,
+            )
+        except ExecutorSaturatedError:
+            return _saturated_response()
+        user = await sync_to_async(_register)(request, serializer)
+        response, _, _ = _jwt_response(request, user, status=201)
+        return response
+
+
+class AsyncUserListView(AsyncGenericAPIView):
+    """
+    This class represents the async list view for users.
+    Authentication is not required for this view.
+    Takes the filters of UserListView and returns the same pages.
+    """
+
+    view_class = UserListView
+
+    async def get(self, request, *args, **kwargs):
+        view = self.view
+        try:
+            queryset = view.filter_queryset(view.get_queryset())
+            page = await self.apaginate_queryset(queryset)
+            if page is not None:
+                serializer = UserSerializer(
+                    page,
+                    many=True,
+                    context={"request": request},
+                )
+                response = view.get_paginated_response(serializer.data)
+                response.data = response_payload(
+                    success=True,
+                    data=response.data,
+                    message="Users fetched successfully",
+                )
+                return response
+            users = [user async for user in queryset.aiterator()]
+            serializer = UserSerializer(users, many=True, context={"request": request})
+            response = response_payload(
+                success=True,
+                data=serializer.data,
+                message="Users fetched successfully",
+            )
+            return Response(response, status=status.HTTP_200_OK)
+        except Http404:
+            return Response(
+                response_payload(success=False, message="Users not found"),
+                status=status.HTTP_404_NOT_FOUND,
+            )
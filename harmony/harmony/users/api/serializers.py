@@ -1,8 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from harmony.users.models import User, Member, Community
 from dj_rest_auth.registration.serializers import RegisterSerializer
 from dj_rest_auth.serializers import LoginSerializer, JWTSerializer
+from dj_rest_auth.jwt_auth import CookieTokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from harmony.users.revocation import revocation_list
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -13,6 +20,8 @@ class UserSerializer(serializers.ModelSerializer):
     date_joined = serializers.DateTimeField(read_only=True)
     type = serializers.ChoiceField(choices=User.UserType.choices, default=User.UserType.COMMUNITY)
     avatar = serializers.ImageField(required=False)
+    # {"64": {"webp": url, "jpg": url}, ...}, empty until the thumbnails are rendered
+    avatar_thumbnails = serializers.SerializerMethodField()
     is_superuser = serializers.BooleanField(read_only=True)
     is_staff = serializers.BooleanField(read_only=True)
     is_active = serializers.BooleanField(read_only=True)
@@ -26,6 +35,7 @@ class UserSerializer(serializers.ModelSerializer):
             "date_joined",
             "type",
             "avatar",
+            "avatar_thumbnails",
             "is_superuser",
             "is_staff",
             "is_active",
@@ -35,6 +45,19 @@ class UserSerializer(serializers.ModelSerializer):
             "url": {"view_name": "api:user-detail", "lookup_field": "pk"},
         }
 
+    def get_avatar_thumbnails(self, obj):
+        request = self.context.get("request")
+        thumbnails = obj.avatar_thumbnails.get("sizes", {}) if obj.avatar else {}
+        return {
+            size: {
+                extension: request.build_absolute_uri(default_storage.url(name))
+                if request
+                else default_storage.url(name)
+                for extension, name in variants.items()
+            }
+            for size, variants in thumbnails.items()
+        }
+
 
 class UserRegisterSerializer(RegisterSerializer):
     username = serializers.CharField(required=True, max_length=150)
@@ -66,8 +89,22 @@ class UserRegisterSerializer(RegisterSerializer):
             raise serializers.ValidationError("Email already exists.")
         return attrs
 
+    # set by the async registration view, which hashes password1 off the event loop
+    password_hash = None
+
+    def get_cleaned_data(self):
+        data = super().get_cleaned_data()
+        if self.password_hash:
+            # hashed by the view, which also ran the validators against the user:
+            # without password1 allauth's save_user sets an unusable password,
+            # replaced in save(), and RegisterSerializer.save skips clean_password
+            del data["password1"]
+        return data
+
     def save(self, request):
         user = super().save(request)
+        if self.password_hash:
+            user.password = self.password_hash
         user.username = self.validated_data.get('username')
         user.type = self.validated_data.get('type')
         user.avatar = self.validated_data.get('avatar')
@@ -165,3 +202,58 @@ class CommunitySerializer(serializers.ModelSerializer):
         ]
 
         read_only_fields = ("id", "user")
+
+
+class CommunitySummarySerializer(serializers.ModelSerializer):
+    """
+    Serializer for the community list and detail, from Community.objects.for_listing()
+    Flat on purpose: the user is select_related and the member count annotated.
+    """
+    id = serializers.IntegerField(source="user_id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    avatar = serializers.ImageField(source="user.avatar", read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Community
+        fields = [
+            "id",
+            "username",
+            "avatar",
+            "name",
+            "description",
+            "member_count",
+        ]
+
+
+class CommunityMemberSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the members of a community, with their user select_related
+    """
+    id = serializers.IntegerField(source="user_id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    avatar = serializers.ImageField(source="user.avatar", read_only=True)
+
+    class Meta:
+        model = Member
+        fields = [
+            "id",
+            "username",
+            "avatar",
+            "first_name",
+            "last_name",
+        ]
+
+
+class RevocableTokenRefreshSerializer(CookieTokenRefreshSerializer):
+    """
+    Refreshes like dj_rest_auth, unless the refresh token was revoked at logout
+    """
+
+    def validate(self, attrs):
+        attrs["refresh"] = self.extract_refresh_token()
+        refresh = RefreshToken(attrs["refresh"])
+        if revocation_list.is_revoked(refresh[jwt_settings.JTI_CLAIM]):
+            msg = "Token is revoked"
+            raise InvalidToken(msg, code="token_revoked")
+        return super().validate(attrs)
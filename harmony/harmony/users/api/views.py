@@ -1,33 +1,79 @@
+from contextlib import suppress
+
+from dj_rest_auth.app_settings import api_settings as rest_auth_settings
+from dj_rest_auth.jwt_auth import get_refresh_view
+from dj_rest_auth.views import LogoutView
 from django.contrib.auth import get_user_model
 from django.http import Http404
-from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.generics import ListAPIView, CreateAPIView, UpdateAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.generics import ListAPIView, UpdateAPIView, RetrieveAPIView
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from harmony.users.api.serializers import UserSerializer, MemberSerializer, CommunitySerializer
+from harmony.users.api.serializers import UserSerializer, MemberSerializer
+from harmony.users.api.serializers import CommunitySerializer
+from harmony.users.api.serializers import CommunitySummarySerializer
+from harmony.users.api.serializers import CommunityMemberSerializer
+from harmony.users.api.serializers import RevocableTokenRefreshSerializer
+from harmony.users.cache import community_cache, community_etag
+from harmony.users.hashing import password_hashing
 from harmony.users.models import Member, Community
+from harmony.users.revocation import revoke_token
+from harmony.utils.filters import TrigramSearchFilter
+from harmony.utils.pagination import KeysetPagination
 from harmony.utils.response import response_payload
 
 User = get_user_model()
 
 
+class UserPagination(KeysetPagination):
+    """
+    Page numbers by default, ?pagination=cursor for keyset pages on (-date_joined, id)
+    """
+
+    ordering = ("-date_joined", "id")
+
+
+class CommunityPagination(KeysetPagination):
+    """
+    Page numbers by default, ?pagination=cursor for keyset pages on (name, user_id)
+    """
+
+    ordering = ("name", "user_id")
+
+
+class CommunityMemberPagination(KeysetPagination):
+    """
+    Keyset pages of members on user id, no page numbers
+    """
+
+    ordering = ("user_id",)
+    page_size = 100
+    fallback_class = None
+
+
 class UserListView(ListAPIView):
     """
     This class represents the list view for users.
     Authentication is not required for this view.
     We can list members or communities using filters
+    ?search=...&fuzzy=true also matches member and community names and tolerates typos
     """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserPagination
     permission_classes = [
         AllowAny,
     ]
     filter_backends = [
-        SearchFilter,
+        TrigramSearchFilter,
         DjangoFilterBackend,
     ]
     filterset_fields = [
@@ -37,6 +83,13 @@ class UserListView(ListAPIView):
         "username",
         "email",
     ]
+    trigram_search_fields = [
+        "username",
+        "email",
+        "community__name",
+        "member__first_name",
+        "member__last_name",
+    ]
     ordering = ["-user__date_joined"]
 
 
@@ -81,8 +134,11 @@ class MemberUpdateAPIView(UpdateAPIView):
     ]
 
     def get_object(self):
-        user_id = self.request.user.id
-        return Member.objects.get(user_id=user_id)
+        user = self.request.user
+        # never anonymous behind IsAuthenticated
+        if not isinstance(user, User):
+            raise Http404
+        return Member.objects.get(user_id=user.id)
 
     def update(self, request, *args, **kwargs):
         try:
@@ -114,14 +170,17 @@ class CommunityUpdateView(UpdateAPIView):
     """
 
     queryset = Community.objects.all()
-    serializer_class = MemberSerializer
+    serializer_class = CommunitySerializer
     permission_classes = [
         IsAuthenticated,
     ]
 
     def get_object(self):
-        user_id = self.request.user.id
-        return Community.objects.get(user_id=user_id)
+        user = self.request.user
+        # never anonymous behind IsAuthenticated
+        if not isinstance(user, User):
+            raise Http404
+        return Community.objects.get(user_id=user.id)
 
     def update(self, request, *args, **kwargs):
         try:
@@ -145,5 +204,189 @@ class CommunityUpdateView(UpdateAPIView):
             )
 
 
+class CommunityListAPIView(ListAPIView):
+    """
+    This class represents the list view for communities.
+    Authentication is not required for this view.
+    Member counts are annotated in the same query as the page.
+    Pages are served from community_cache until a community or its members change.
+    """
+
+    queryset = Community.objects.for_listing().order_by("name", "user_id")
+    serializer_class = CommunitySummarySerializer
+    pagination_class = CommunityPagination
+    permission_classes = [
+        AllowAny,
+    ]
+    filter_backends = [
+        TrigramSearchFilter,
+    ]
+    search_fields = [
+        "name",
+    ]
+    trigram_search_fields = [
+        "name",
+    ]
+
+    @method_decorator(condition(etag_func=community_etag))
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns a page of communities.
+        """
+        cache_key = community_cache.get_key(request)
+        cached = community_cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = CommunitySummarySerializer(
+            page,
+            many=True,
+            context={"request": request},
+        )
+        response = self.get_paginated_response(serializer.data)
+        response.data = response_payload(
+            success=True,
+            data=response.data,
+            message="Communities fetched successfully",
+        )
+        community_cache.set(cache_key, response.data)
+        return response
+
+
+class CommunityDetailAPIView(RetrieveAPIView):
+    """
+    This class represents the detail view for communities.
+    Authentication is not required for this view.
+    Served from community_cache until the community or its members change.
+    """
+
+    queryset = Community.objects.for_listing()
+    serializer_class = CommunitySummarySerializer
+    permission_classes = [
+        AllowAny,
+    ]
+
+    @method_decorator(condition(etag_func=community_etag))
+    def get(self, request, id, *args, **kwargs):  # noqa: A002, the URL kwarg
+        """
+        This function returns a community with its member count.
+        """
+        cache_key = community_cache.get_key(request)
+        cached = community_cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+        community = self.get_queryset().filter(user_id=id).first()
+        if community is None:
+            return Response(
+                response_payload(success=False, message="Community not found"),
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        serializer = CommunitySummarySerializer(community, context={"request": request})
+        response = response_payload(
+            success=True,
+            data=serializer.data,
+            message="Community fetched successfully",
+        )
+        community_cache.set(cache_key, response)
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class CommunityMembersAPIView(ListAPIView):
+    """
+    This class represents the members of a community.
+    Authentication is not required for this view.
+    Pages are keyset paginated on user id, follow `next` for the next one,
+    and cost the same two queries whatever the size of the community.
+    """
+
+    serializer_class = CommunityMemberSerializer
+    pagination_class = CommunityMemberPagination
+    permission_classes = [
+        AllowAny,
+    ]
+
+    def get(self, request, id, *args, **kwargs):  # noqa: A002
+        """
+        This function returns a page of members of a community.
+        """
+        if not Community.objects.filter(user_id=id).exists():
+            return Response(
+                response_payload(success=False, message="Community not found"),
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        page = self.paginate_queryset(
+            Member.objects.filter(community=id).select_related("user"),
+        )
+        serializer = CommunityMemberSerializer(
+            page,
+            many=True,
+            context={"request": request},
+        )
+        response = self.get_paginated_response(serializer.data)
+        response.data = response_payload(
+            success=True,
+            data=response.data,
+            message="Community members fetched successfully",
+        )
+        return response
+
+
+class PasswordHashingMetricsAPIView(APIView):
+    """
+    This class represents the concurrency metrics of the password hashing pool.
+    Only staff can access this view.
+    The counters are those of the process serving the request.
+    """
+
+    permission_classes = [
+        IsAdminUser,
+    ]
+
+    def get(self, request, *args, **kwargs):
+        """
+        This function returns the pool size, the logins hashing or queued, and the
+        totals so far.
+        """
+        return Response(
+            response_payload(
+                success=True,
+                data=password_hashing.stats(),
+                message="Metrics fetched successfully",
+            ),
+            status=status.HTTP_200_OK,
+        )
+
+
+class LogoutAPIView(LogoutView):
+    """
+    This class represents the logout view.
+    Like dj_rest_auth's LogoutView it clears the JWT cookies, and it also revokes
+    the access token of the request and the refresh token (from the body or the
+    cookie) until they expire, see harmony.users.revocation.
+    """
+
+    def logout(self, request):
+        if request.auth is not None:
+            revoke_token(request.auth)
+        refresh = request.data.get("refresh") or request.COOKIES.get(
+            rest_auth_settings.JWT_AUTH_REFRESH_COOKIE,
+        )
+        if refresh:
+            # expired or forged, nothing to revoke
+            with suppress(TokenError):
+                revoke_token(RefreshToken(refresh))
+        return super().logout(request)
+
+
+# dj_rest_auth builds its refresh view class in get_refresh_view()
+class TokenRefreshAPIView(get_refresh_view()):  # type: ignore[misc]
+    """
+    This class represents the access token refresh view.
+    Revoked refresh tokens are rejected.
+    """
+
+    serializer_class = RevocableTokenRefreshSerializer
+
 
 # delete views pending
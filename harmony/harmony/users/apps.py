@@ -1,6 +1,7 @@
 import contextlib
 
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 from django.utils.translation import gettext_lazy as _
 
 
@@ -11,3 +12,8 @@ class UsersConfig(AppConfig):
     def ready(self):
         with contextlib.suppress(ImportError):
             import harmony.users.signals  # noqa: F401
+
+        from harmony.utils.filters import set_word_similarity_threshold
+
+        # the trigram indexes are in this app's migrations
+        connection_created.connect(set_word_similarity_threshold)
@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from harmony.users.cache import user_namespace
+from harmony.users.models import User
+from harmony.users.revocation import revocation_list
+from harmony.utils.cache import get_generation
+
+# left out of the cached users so that no password hash sits in the cache,
+# loaded on access by the few views that check or change the password
+DEFERRED_FIELDS = {"password"}
+
+CACHED_FIELDS = [
+    field.attname
+    for field in User._meta.fields  # noqa: SLF001, documented API
+    if field.concrete and field.attname not in DEFERRED_FIELDS
+]
+
+
+class UserCache:
+    """
+    Two tier cache of the users named by access tokens
+    Every lookup reads the user's version stamp from the shared cache, then
+    takes the user's fields from a per-process LRU, from the shared cache
+    under that version, or from the database, in that order. A new version
+    orphans every copy at once, without scanning processes or keys.
+    Lookups return a fresh User per call, built without a query, with
+    DEFERRED_FIELDS loaded on access.
+    """
+
+    def __init__(self):
+        # user id -> (version, fields), least recently used first
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        """
+        The user with this id, None if there is none
+        """
+        namespace = user_namespace(user_id)
+        # the version is read first, a change during the query orphans what it loaded
+        version = get_generation(namespace)
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None:
+                self.entries.move_to_end(user_id)
+        if entry is None or entry[0] != version:
+            key = f"{namespace}:{version}"
+            fields = cache.get(key)
+            if fields is None:
+                fields = User.objects.filter(pk=user_id).values(*CACHED_FIELDS).first()
+                if fields is None:
+                    return None
+                cache.set(key, fields, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+            entry = (version, fields)
+            self.put(user_id, entry)
+        fields = entry[1]
+        return User.from_db(User.objects.db, list(fields), list(fields.values()))
+
+    def put(self, user_id, entry):
+        with self.lock:
+            self.entries[user_id] = entry
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > settings.AUTH_USER_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    JWTCookieAuthentication resolving the user of the token through user_cache
+    instead of loading it on every request, and rejecting revoked tokens
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revocation_list.is_revoked(validated_token[api_settings.JTI_CLAIM]):
+            raise InvalidToken(_("Token is revoked"), code="token_revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            msg = _("Token contained no recognizable user identification")
+            raise InvalidToken(msg) from None
+
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            password_hash = get_md5_hash_password(user.password)
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed",
+                )
+
+        return user
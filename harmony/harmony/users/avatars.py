@@ -0,0 +1,84 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+from PIL import ImageOps
+
+THUMBNAIL_DIR = "avatars/thumbnails"
+
+# Pillow format and save options of every variant, by file extension
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def open_avatar(file, size):
+    """
+    Decode an avatar, upright and in RGB(A)
+    JPEGs are decoded at the smallest scale that still covers `size`,
+    which is much cheaper than decoding the full image and resizing it.
+    """
+    image = Image.open(file)
+    image.draft("RGB", (size, size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        transparent = "transparency" in image.info or image.mode in ("LA", "PA")
+        image = image.convert("RGBA" if transparent else "RGB")
+    return image
+
+
+def encode(image, extension):
+    image_format, options = THUMBNAIL_FORMATS[extension]
+    if image_format == "JPEG" and image.mode == "RGBA":
+        # JPEG has no alpha, flatten on white
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def save_content_hashed(content, size, extension):
+    """
+    Store a thumbnail under the hash of its bytes, so that identical
+    thumbnails are stored once and a new avatar never reuses a cached URL
+    """
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    name = f"{THUMBNAIL_DIR}/{digest}_{size}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def render_thumbnails(avatar):
+    """
+    Square thumbnails of an avatar at every AVATAR_THUMBNAIL_SIZES, in every
+    THUMBNAIL_FORMATS
+    Returns the storage names as {"64": {"webp": ..., "jpg": ...}, ...}
+    """
+    sizes = sorted(settings.AVATAR_THUMBNAIL_SIZES, reverse=True)
+    with avatar.open("rb") as file:
+        image = open_avatar(file, sizes[0])
+        image.load()
+    thumbnails = {}
+    for size in sizes:
+        # each size is resized from the previous, larger one
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        thumbnails[str(size)] = {
+            extension: save_content_hashed(encode(image, extension), size, extension)
+            for extension in THUMBNAIL_FORMATS
+        }
+    return thumbnails
+
+
+def thumbnails_are_stale(user):
+    """
+    Whether the thumbnails of a user were rendered from another avatar than the
+    current one
+    """
+    return (user.avatar.name or "") != user.avatar_thumbnails.get("source", "")
@@ -0,0 +1,46 @@
+import hashlib
+
+from django.conf import settings
+
+from harmony.utils.cache import ResponseCache
+from harmony.utils.cache import bump_generation
+
+# generation of the community summaries,
+# bumped by harmony.users.signals whenever a community or its members change
+COMMUNITIES_NAMESPACE = "communities"
+
+community_cache = ResponseCache(
+    namespace=COMMUNITIES_NAMESPACE,
+    prefix="communities",
+    timeout=settings.COMMUNITY_CACHE_TIMEOUT,
+)
+
+
+def invalidate_communities():
+    bump_generation(COMMUNITIES_NAMESPACE)
+
+
+def user_namespace(user_id):
+    """
+    Namespace whose generation is the version stamp of a user cached by
+    harmony.users.authentication
+    """
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    """
+    Orphan the cached copies of a user, called by harmony.users.signals whenever
+    a user is saved (which covers password changes and deactivation) or deleted.
+    QuerySet.update() bypasses it, update users through save() or call this.
+    """
+    bump_generation(user_namespace(user_id))
+
+
+def community_etag(request, *args, **kwargs):
+    """
+    A community page only changes with the communities generation, which is part of
+    its cache key
+    """
+    key = community_cache.get_key(request)
+    return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
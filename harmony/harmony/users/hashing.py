@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import make_password
+
+from harmony.utils.executors import BoundedExecutor
+
+# Argon2 is deliberately slow and memory hungry (100 MiB per hash with Django's
+# defaults), the async login and registration views hash in this bounded pool
+# so that a burst of logins neither blocks the event loop nor exhausts memory.
+password_hashing = BoundedExecutor(
+    name="password-hashing",
+    max_workers=settings.PASSWORD_HASHING_THREADS,
+    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+    niceness=settings.PASSWORD_HASHING_NICENESS,
+)
+
+
+def verify_password(encoded, password):
+    """
+    Whether a password matches its hash, and the new hash if the hasher's
+    parameters changed since (None otherwise)
+    Unknown users (encoded None) cost a hash as well, so that response times
+    do not tell which usernames exist.
+    """
+    if encoded is None:
+        make_password(password)
+        return False, None
+    upgraded = []
+    valid = check_password(
+        password,
+        encoded,
+        setter=lambda raw: upgraded.append(make_password(raw)),
+    )
+    return valid, upgraded[0] if upgraded else None
@@ -0,0 +1,175 @@
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from harmony.users.models import Member
+from harmony.users.models import User
+
+# per-row errors kept on a MemberImport, failed_count keeps counting past it
+MAX_IMPORT_ERRORS = 1000
+
+USERNAME_TAKEN_MESSAGE = "A user with that username already exists."
+EMAIL_TAKEN_MESSAGE = "A user with that email already exists."
+
+# passwords sent to a hashing process at a time, one per task would spend more on
+# pickling
+HASHES_PER_TASK = 16
+
+
+class RosterRowSerializer(serializers.Serializer):
+    """
+    A row of a member roster, normalized like UserRegisterSerializer does
+    Passwords go through AUTH_PASSWORD_VALIDATORS, as at registration. Rows
+    without a password get an unusable one, their members set it with the
+    password reset flow.
+    """
+
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    prn_number = serializers.CharField(max_length=10)
+    date_of_birth = serializers.DateField()
+    first_name = serializers.CharField(max_length=30, required=False, default="")
+    last_name = serializers.CharField(max_length=30, required=False, default="")
+    password = serializers.CharField(required=False, write_only=True)
+
+    def validate(self, attrs):
+        attrs["username"] = attrs["username"].lower().strip()
+        attrs["email"] = attrs["email"].lower().strip()
+        if "password" in attrs:
+            user = User(username=attrs["username"], email=attrs["email"])
+            try:
+                validate_password(attrs["password"], user=user)
+            except DjangoValidationError as e:
+                raise ValidationError({"password": e.messages}) from e
+        return attrs
+
+
+def read_roster(member_import):
+    """
+    Stream the rows of a roster from storage, without loading it in memory
+    Empty cells are left out so that optional fields get their default
+    """
+    with member_import.file.open("rb") as file:
+        stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        for row in csv.DictReader(stream):
+            yield {
+                name.strip(): value.strip()
+                for name, value in row.items()
+                if name and value
+            }
+
+
+def password_hashing_pool(workers=None):
+    """
+    Executor hashing passwords on every core
+    Celery's prefork workers are daemonic and cannot start processes, there
+    the hashing falls back to threads: argon2-cffi releases the GIL while
+    hashing, so they still run in parallel.
+    """
+    workers = workers or os.cpu_count()
+    if multiprocessing.current_process().daemon:
+        return ThreadPoolExecutor(max_workers=workers)
+    # workers started with "spawn" import nothing from the parent
+    return ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+
+
+def hash_passwords(pool, passwords):
+    """
+    Hashes of the passwords, in order, unusable ones for the missing passwords
+    """
+    hashes = [
+        make_password(None) if password is None else None for password in passwords
+    ]
+    given = [
+        (i, password) for i, password in enumerate(passwords) if password is not None
+    ]
+    encoded = pool.map(
+        make_password,
+        [password for _, password in given],
+        chunksize=HASHES_PER_TASK,
+    )
+    for (i, _), password in zip(given, encoded, strict=True):
+        hashes[i] = password
+    return hashes
+
+
+def find_taken(rows):
+    """
+    Usernames and emails of the rows that already belong to a user, in one query
+    """
+    usernames = {data["username"] for _, data in rows}
+    emails = {data["email"] for _, data in rows}
+    taken = User.objects.filter(
+        Q(username__in=usernames) | Q(email__in=emails),
+    ).values_list("username", "email")
+    taken_usernames, taken_emails = set(), set()
+    for username, email in taken:
+        taken_usernames.add(username)
+        taken_emails.add(email)
+    return taken_usernames, taken_emails
+
+
+def import_chunk(chunk, pool):
+    """
+    Validate a chunk of roster rows and create their users and members with a
+    handful of queries, whatever the size of the chunk
+    Usernames and emails already taken, by a user or an earlier row, are
+    rejected. Returns the number of members created and the errors of the
+    rejected rows.
+    """
+    serializer = RosterRowSerializer()
+    rows, errors = [], []
+    for number, data in chunk:
+        try:
+            rows.append((number, serializer.run_validation(data)))
+        except ValidationError as e:
+            errors.append({"row": number, "errors": e.detail})
+
+    taken_usernames, taken_emails = find_taken(rows)
+    accepted = []
+    for number, data in rows:
+        row_errors = {}
+        if data["username"] in taken_usernames:
+            row_errors["username"] = [USERNAME_TAKEN_MESSAGE]
+        if data["email"] in taken_emails:
+            row_errors["email"] = [EMAIL_TAKEN_MESSAGE]
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+            continue
+        taken_usernames.add(data["username"])
+        taken_emails.add(data["email"])
+        accepted.append(data)
+    errors.sort(key=lambda error: error["row"])
+
+    passwords = hash_passwords(pool, [data.pop("password", None) for data in accepted])
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=data.pop("username"),
+                    email=data.pop("email"),
+                    password=password,
+                    type=User.UserType.MEMBER,
+                )
+                for data, password in zip(accepted, passwords, strict=True)
+            ],
+        )
+        Member.objects.bulk_create(
+            [
+                Member(user=user, **data)
+                for user, data in zip(users, accepted, strict=True)
+            ],
+        )
+    return len(users), errors
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from harmony.users.models import MemberImport
+from harmony.users.tasks import import_members
+
+
+class Command(BaseCommand):
+    help = (
+        "Create members from a CSV roster with username, email, prn_number and "
+        "date_of_birth columns (first_name, last_name and password are optional)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("roster", type=Path, help="Path of the CSV roster")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows inserted per transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes, one per core by default",
+        )
+
+    def handle(self, *args, **options):
+        roster = options["roster"]
+        if not roster.is_file():
+            msg = f"{roster} does not exist"
+            raise CommandError(msg)
+        with roster.open("rb") as file:
+            member_import = MemberImport.objects.create(
+                file=File(file, name=roster.name),
+            )
+
+        # runs in this process, progress is recorded like for an upload from the admin
+        import_members(
+            member_import.pk,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+        )
+
+        member_import.refresh_from_db()
+        for error in member_import.errors:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {member_import.created_count} members, "
+                f"rejected {member_import.failed_count} of "
+                f"{member_import.total_rows} rows",
+            ),
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from harmony.users.revocation import revoke_token
+
+
+class Command(BaseCommand):
+    help = "Revoke access or refresh tokens until they expire, e.g. after they leaked"
+
+    def add_arguments(self, parser):
+        parser.add_argument("tokens", nargs="+", help="Encoded tokens")
+
+    def handle(self, *args, **options):
+        revoked = 0
+        for raw in options["tokens"]:
+            try:
+                token = UntypedToken(raw)
+            except TokenError as e:
+                # expired tokens are rejected anyway
+                self.stderr.write(f"{raw[:16]}...: {e}")
+                continue
+            revoke_token(token)
+            revoked += 1
+        if not revoked:
+            msg = "No token revoked"
+            raise CommandError(msg)
+        self.stdout.write(
+            self.style.SUCCESS(f"Revoked {revoked} of {len(options['tokens'])} tokens"),
+        )
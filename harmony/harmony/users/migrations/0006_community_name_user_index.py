@@ -0,0 +1,17 @@
+# Generated by Django 4.2.10 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='community',
+            index=models.Index(fields=['name', 'user'], name='community_name_user_idx'),
+        ),
+    ]
@@ -1,9 +1,31 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Concat
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 
+def display_name(user):
+    """
+    Community name or member full name of the user at the `user` lookup path
+    (e.g. "organizer"), to annotate querysets of related models with
+    """
+    return Coalesce(
+        F(f"{user}__community__name"),
+        Concat(
+            F(f"{user}__member__first_name"),
+            Value(" "),
+            F(f"{user}__member__last_name"),
+        ),
+        output_field=models.CharField(),
+    )
+
+
 class User(AbstractUser):
     """
     Default custom user model for Harmony.
@@ -19,6 +41,9 @@ class User(AbstractUser):
     password = models.CharField(_("Password"), max_length=255, blank=False, null=False)
     date_joined = models.DateTimeField(_("Date Joined"), auto_now_add=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    # {"source": avatar name, "sizes": {"64": {"webp": name, "jpg": name}, ...}},
+    # rendered by harmony.users.tasks.generate_avatar_thumbnails
+    avatar_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     type = models.CharField(_("User Type"), max_length=3, choices=UserType.choices, default=UserType.MEMBER)
     first_name = None
     last_name = None
@@ -30,6 +55,23 @@ class User(AbstractUser):
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["email"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # keyset pagination of the user list
+            models.Index(fields=["-date_joined", "id"], name="user_date_joined_id_idx"),
+            # fuzzy ?search= of the user list
+            GinIndex(
+                fields=["username"],
+                name="user_username_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["email"],
+                name="user_email_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
@@ -58,6 +100,30 @@ class Member(models.Model):
         verbose_name_plural = "members"
         verbose_name = "member"
         ordering = ["first_name"]
+        indexes = [
+            GinIndex(
+                fields=["first_name"],
+                name="member_first_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["last_name"],
+                name="member_last_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+
+class CommunityQuerySet(models.QuerySet):
+    """
+    QuerySet for the Community model
+    """
+
+    def for_listing(self):
+        """
+        Communities with their user and member count, in one statement
+        """
+        return self.select_related("user").annotate(member_count=Count("members"))
 
 
 class Community(models.Model):
@@ -70,6 +136,8 @@ class Community(models.Model):
     description = models.TextField(_("Description"), blank=True, null=True)
     members = models.ManyToManyField(Member, related_name="communities", related_query_name="community")
 
+    objects = CommunityQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -77,3 +145,56 @@ class Community(models.Model):
         verbose_name_plural = "communities"
         verbose_name = "community"
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                fields=["name"],
+                name="community_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            # keyset pagination of the community list
+            models.Index(fields=["name", "user"], name="community_name_user_idx"),
+        ]
+
+
+class MemberImport(models.Model):
+    """
+    Model for a MemberImport in Harmony.
+    A CSV roster of members uploaded by staff (or given to the import_members
+    command), imported in the background by harmony.users.tasks.import_members
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    file = models.FileField(_("Roster"), upload_to="member_imports/")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="member_imports",
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    # [{"row": 3, "errors": {"email": [...]}}, ...], 1-based row numbers
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "member imports"
+        verbose_name = "member import"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
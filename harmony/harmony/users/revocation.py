@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from redis import RedisError
+from rest_framework_simplejwt.settings import api_settings
+
+from harmony.utils.bloom import BloomFilter
+from harmony.utils.redis import connect
+
+logger = logging.getLogger(__name__)
+
+# jti -> expiry (unix time) of the revoked tokens that have not expired yet
+REVOKED_KEY = "auth:revoked"
+
+
+def get_redis():
+    return connect(settings.TOKEN_REVOCATION_REDIS_URL)
+
+
+class RevocationList:
+    """
+    Revoked tokens, by jti, until they expire on their own
+    Redis holds them in a sorted set scored by expiry. In front of it, each
+    process keeps a Bloom filter of the set, rebuilt at most every
+    TOKEN_REVOCATION_REFRESH_INTERVAL seconds: a jti missing from the filter
+    is not revoked, which is answered without leaving the process. Only the
+    hits, revoked tokens and ~1% false positives, are confirmed in Redis.
+    A token revoked by another process is accepted here until the next rebuild.
+    """
+
+    def __init__(self):
+        self.bloom = None
+        self.built_at = None
+        self.lock = threading.Lock()
+
+    def get_filter(self):
+        """
+        The Bloom filter of the revoked jtis, rebuilt first when it is older than the
+        interval
+        """
+        bloom, built_at = self.bloom, self.built_at
+        interval = settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+        if bloom is not None and built_at is not None:
+            if time.monotonic() - built_at < interval:
+                return bloom
+        # one thread rebuilds, the others keep using the current filter meanwhile
+        if not self.lock.acquire(blocking=bloom is None):
+            return bloom
+        try:
+            if self.bloom is bloom:
+                self.rebuild()
+            return self.bloom
+        finally:
+            self.lock.release()
+
+    def rebuild(self):
+        try:
+            jtis = get_redis().zrangebyscore(REVOKED_KEY, time.time(), "+inf")
+        except RedisError:
+            # keep accepting tokens on the current filter, and retry after the
+            # interval
+            logger.exception("Could not load the revoked tokens")
+            if self.bloom is None:
+                self.bloom = BloomFilter.from_items([])
+        else:
+            self.bloom = BloomFilter.from_items(jti.decode() for jti in jtis)
+        self.built_at = time.monotonic()
+
+    def is_revoked(self, jti):
+        if jti not in self.get_filter():
+            return False
+        try:
+            expires_at = get_redis().zscore(REVOKED_KEY, jti)
+        except RedisError:
+            # most filter hits are revoked tokens
+            logger.exception("Could not check a revoked token")
+            return True
+        return expires_at is not None and expires_at > time.time()
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke the token `jti` until `expires_at` (unix time), its own expiry
+        Without Redis the revocation is logged and only seen by this process.
+        """
+        now = time.time()
+        if expires_at <= now:
+            return
+        lifetime = max(
+            api_settings.ACCESS_TOKEN_LIFETIME,
+            api_settings.REFRESH_TOKEN_LIFETIME,
+        )
+        try:
+            pipeline = get_redis().pipeline()
+            pipeline.zadd(REVOKED_KEY, {jti: expires_at})
+            pipeline.zremrangebyscore(REVOKED_KEY, "-inf", now)
+            # outlives every token in the set, if revocations stop
+            pipeline.expire(REVOKED_KEY, lifetime)
+            pipeline.execute()
+        except RedisError:
+            logger.exception("Could not revoke a token")
+        # this process sees it right away, the others at their next rebuild
+        self.get_filter().add(jti)
+
+    def clear(self):
+        with self.lock:
+            self.bloom = None
+            self.built_at = None
+
+
+revocation_list = RevocationList()
+
+
+def revoke_token(token):
+    """
+    Revoke a validated simplejwt token until it expires
+    """
+    revocation_list.revoke(token[api_settings.JTI_CLAIM], token["exp"])
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from harmony.users.avatars import thumbnails_are_stale
+from harmony.users.cache import invalidate_communities
+from harmony.users.cache import invalidate_user
+from harmony.users.models import Community
+from harmony.users.models import User
+from harmony.users.tasks import generate_avatar_thumbnails
+
+
+@receiver(post_save, sender=Community)
+@receiver(post_delete, sender=Community)
+def invalidate_communities_on_save(sender, *, raw=False, **kwargs):
+    if not raw:
+        invalidate_communities()
+
+
+@receiver(m2m_changed, sender=Community.members.through)
+def invalidate_communities_on_members_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_communities()
+
+
+@receiver(post_save, sender=User)
+def invalidate_communities_on_user_save(
+    sender,
+    instance,
+    *,
+    update_fields=None,
+    raw=False,
+    **kwargs,
+):
+    """
+    Username and avatar are part of the summaries, logins only touch last_login
+    """
+    if raw or instance.type != User.UserType.COMMUNITY:
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_communities()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, *, raw=False, **kwargs):
+    """
+    Any field may be part of the cached user, last_login included
+    """
+    if not raw:
+        invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def queue_avatar_thumbnails(sender, instance, *, raw=False, **kwargs):
+    """
+    Avatars are decoded by a worker once the upload is committed, never in the
+    request
+    """
+    if not raw and thumbnails_are_stale(instance):
+        transaction.on_commit(lambda: generate_avatar_thumbnails.delay(instance.pk))
@@ -1,6 +1,24 @@
+import logging
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image
+from PIL import UnidentifiedImageError
 
 from config import celery_app
+from harmony.users.avatars import render_thumbnails
+from harmony.users.cache import invalidate_user
+from harmony.users.imports import MAX_IMPORT_ERRORS
+from harmony.users.imports import import_chunk
+from harmony.users.imports import password_hashing_pool
+from harmony.users.imports import read_roster
+from harmony.users.models import MemberImport
+from harmony.utils.imports import chunked
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -9,3 +27,69 @@ User = get_user_model()
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
     return User.objects.count()
+
+
+@celery_app.task()
+def generate_avatar_thumbnails(user_id):
+    """
+    Render the thumbnails of a user's avatar, see harmony.users.avatars
+    Only saved if the avatar did not change in the meantime, a newer upload
+    has its own task queued. An avatar that cannot be decoded gets no sizes,
+    its thumbnails are not rendered again until the avatar changes.
+    """
+    user = User.objects.filter(pk=user_id).only("avatar").first()
+    if user is None:
+        return None
+    source = user.avatar.name or ""
+    sizes = {}
+    if source:
+        try:
+            sizes = render_thumbnails(user.avatar)
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            logger.exception("Could not render the thumbnails of %s", source)
+    thumbnails = {"source": source, "sizes": sizes}
+    unchanged = Q(avatar=source) if source else Q(avatar="") | Q(avatar__isnull=True)
+    users = User.objects.filter(unchanged, pk=user_id)
+    if users.update(avatar_thumbnails=thumbnails):
+        # update() skips the post_save signal that orphans the cached user
+        invalidate_user(user_id)
+    return thumbnails
+
+
+@celery_app.task()
+def import_members(import_id, chunk_size=None, workers=None):
+    """
+    Create the members of an uploaded roster, see harmony.users.imports
+    Passwords are hashed by a pool shared by all chunks, users and members are
+    bulk created chunk by chunk, progress and per-row errors are saved on the
+    MemberImport after every chunk.
+    """
+    chunk_size = chunk_size or settings.MEMBER_IMPORT_CHUNK_SIZE
+    member_import = MemberImport.objects.get(pk=import_id)
+    imports = MemberImport.objects.filter(pk=import_id)
+    errors: list[dict] = []
+    try:
+        total_rows = sum(1 for _ in read_roster(member_import))
+        imports.update(status=MemberImport.Status.RUNNING, total_rows=total_rows)
+        with password_hashing_pool(
+            workers or settings.PASSWORD_HASHING_WORKERS,
+        ) as pool:
+            for chunk in chunked(read_roster(member_import), chunk_size):
+                created, chunk_errors = import_chunk(chunk, pool)
+                errors += chunk_errors[: MAX_IMPORT_ERRORS - len(errors)]
+                imports.update(
+                    processed_rows=F("processed_rows") + len(chunk),
+                    created_count=F("created_count") + created,
+                    failed_count=F("failed_count") + len(chunk_errors),
+                    errors=errors,
+                )
+    except Exception as e:
+        # e.g. a file that is not UTF-8, the members created so far are kept
+        imports.update(
+            status=MemberImport.Status.FAILED,
+            errors=[*errors, {"row": None, "errors": [str(e)]}],
+            finished_at=timezone.now(),
+        )
+        raise
+    imports.update(status=MemberImport.Status.DONE, finished_at=timezone.now())
+    return imports.values_list("created_count", flat=True).get()
@@ -1,16 +1,22 @@
 from collections.abc import Sequence
 from typing import Any
 
+import factory
 from django.contrib.auth import get_user_model
 from factory import Faker
+from factory import SubFactory
 from factory import post_generation
 from factory.django import DjangoModelFactory
 
+from harmony.users.models import Community
+from harmony.users.models import Member
+from harmony.users.models import User
+
 
 class UserFactory(DjangoModelFactory):
-    username = Faker("user_name")
+    # unique, Faker's user names repeat and users are got or created by username
+    username = factory.Sequence(lambda n: f"user{n}")
     email = Faker("email")
-    name = Faker("name")
 
     @post_generation
     def password(self, create: bool, extracted: Sequence[Any], **kwargs):  # noqa: FBT001
@@ -38,3 +44,23 @@ class UserFactory(DjangoModelFactory):
     class Meta:
         model = get_user_model()
         django_get_or_create = ["username"]
+
+
+class MemberFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory, type=User.UserType.MEMBER)
+    first_name = Faker("first_name")
+    last_name = Faker("last_name")
+    prn_number = Faker("numerify", text="##########")
+    date_of_birth = Faker("date_of_birth", minimum_age=17, maximum_age=25)
+
+    class Meta:
+        model = Member
+
+
+class CommunityFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory, type=User.UserType.COMMUNITY)
+    name = Faker("company")
+    description = Faker("sentence")
+
+    class Meta:
+        model = Community
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.users.models import User
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import MemberFactory
+from harmony.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUserListKeysetPagination:
+    url = reverse("users:member-list")
+
+    def test_walks_every_user_once(self):
+        UserFactory.create_batch(23)
+        client = APIClient()
+
+        seen = []
+        response = client.get(self.url, {"pagination": "cursor"})
+        while True:
+            payload = response.data["data"]
+            seen += [user["id"] for user in payload["results"]]
+            if payload["next"] is None:
+                break
+            response = client.get(payload["next"])
+
+        expected = User.objects.order_by("-date_joined", "id").values_list(
+            "id",
+            flat=True,
+        )
+        assert seen == list(expected)
+
+    def test_page_numbers_by_default(self):
+        users = UserFactory.create_batch(3)
+        response = APIClient().get(self.url)
+        assert response.data["data"]["count"] == len(users)
+
+
+class TestUserListFuzzySearch:
+    url = reverse("users:member-list")
+
+    def _search(self, term):
+        response = APIClient().get(self.url, {"search": term, "fuzzy": "true"})
+        assert response.status_code == HTTPStatus.OK
+        return [user["id"] for user in response.data["data"]["results"]]
+
+    def test_misspelled_community_name(self):
+        community = CommunityFactory(name="Photography Society")
+        CommunityFactory(name="Debate Club")
+
+        assert self._search("photgraphy") == [community.user_id]
+
+    def test_misspelled_member_name(self):
+        member = MemberFactory(first_name="Aishwarya", last_name="Kulkarni")
+        MemberFactory(first_name="Rahul", last_name="Deshpande")
+
+        assert self._search("kulkarny") == [member.user_id]
+
+    def test_best_match_first(self):
+        exact = UserFactory(username="sahil_patil")
+        close = UserFactory(username="sahil_pati1")
+
+        assert self._search("sahil_patil")[:2] == [exact.id, close.id]
+
+    def test_threshold_is_set_per_connection(self, settings):
+        settings.TRIGRAM_WORD_SIMILARITY_THRESHOLD = 0.42
+        new_connection = connection.copy()
+        try:
+            with new_connection.cursor() as cursor:
+                cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+                threshold = cursor.fetchone()[0]
+        finally:
+            new_connection.close()
+        assert float(threshold) == settings.TRIGRAM_WORD_SIMILARITY_THRESHOLD
+        assert "options" not in connection.settings_dict["OPTIONS"]
+
+    def test_substring_search_without_fuzzy(self):
+        user = UserFactory(username="photographer")
+        CommunityFactory(name="Photography Society")
+
+        response = APIClient().get(self.url, {"search": "photograph"})
+        assert [result["id"] for result in response.data["data"]["results"]] == [
+            user.id,
+        ]
@@ -0,0 +1,262 @@
+import asyncio
+import os
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.users.hashing import password_hashing
+from harmony.users.models import Member
+from harmony.users.models import User
+from harmony.users.tests.factories import UserFactory
+from harmony.utils.executors import BoundedExecutor
+from harmony.utils.executors import ExecutorSaturatedError
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBoundedExecutor:
+    def test_rejects_past_max_pending(self):
+        max_pending = 2
+        executor = BoundedExecutor("test", max_workers=1, max_pending=max_pending)
+        release = threading.Event()
+
+        async def burst():
+            calls = [
+                asyncio.ensure_future(executor.run(release.wait))
+                for _ in range(max_pending)
+            ]
+            await asyncio.sleep(0.05)
+            stats = executor.stats()
+            with pytest.raises(ExecutorSaturatedError):
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*calls)
+            return stats
+
+        stats = asyncio.run(burst())
+
+        assert (stats["pending"], stats["running"], stats["queued"]) == (2, 1, 1)
+        assert executor.stats()["completed"] == max_pending
+        assert executor.stats()["rejected"] == 1
+        assert executor.stats()["pending"] == 0
+
+    @pytest.mark.skipif(
+        not hasattr(os, "setpriority"),
+        reason="no per thread priorities",
+    )
+    def test_niceness(self):
+        executor = BoundedExecutor("test", max_workers=1, max_pending=1, niceness=5)
+
+        def priority():
+            return os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+        assert asyncio.run(executor.run(priority)) == priority() + 5
+
+
+class TestLoginAPIView:
+    url = reverse("async_login")
+
+    @pytest.fixture()
+    def user(self):
+        return UserFactory(username="asha", password="s3cret-pass")  # noqa: S106
+
+    def test_login(self, user, client):
+        response = client.post(
+            self.url,
+            {"username": "asha", "password": "s3cret-pass"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["user"]["id"] == user.id
+        assert data["access"]
+        assert data["refresh"]
+        assert response.cookies["access"].value == data["access"]
+        # the token authenticates the other endpoints
+        api_client = APIClient()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+        assert (
+            api_client.get(reverse("events:event-feed-url")).status_code
+            == HTTPStatus.OK
+        )
+
+    @pytest.mark.parametrize("url", [reverse("async_login"), reverse("rest_login")])
+    def test_username_case(self, user, client, url):
+        # matched case insensitively on both paths, like allauth does
+        response = client.post(
+            url,
+            {"username": "Asha", "password": "s3cret-pass"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["access"]
+
+    @pytest.mark.parametrize(
+        ("username", "password"),
+        [("asha", "wrong"), ("nobody", "s3cret-pass")],
+    )
+    def test_invalid_credentials(self, user, client, username, password):
+        completed = password_hashing.stats()["completed"]
+
+        response = client.post(self.url, {"username": username, "password": password})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            "non_field_errors": ["Unable to log in with provided credentials."],
+        }
+        # unknown usernames cost a hash too
+        assert password_hashing.stats()["completed"] == completed + 1
+
+    def test_required_fields(self, client):
+        response = client.post(self.url, {}, content_type="application/json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()) == {"username", "password"}
+
+    def test_saturated(self, user, client, monkeypatch):
+        monkeypatch.setattr(password_hashing, "max_pending", 0)
+
+        response = client.post(
+            self.url,
+            {"username": "asha", "password": "s3cret-pass"},
+        )
+
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == "1"
+
+    def test_upgrades_the_hash(self, settings, client):
+        settings.PASSWORD_HASHERS = [
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+        user = UserFactory(username="ravi")
+        User.objects.filter(pk=user.pk).update(
+            password=make_password("s3cret-pass", hasher="md5"),
+        )
+
+        response = client.post(
+            self.url,
+            {"username": "ravi", "password": "s3cret-pass"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$")
+        assert user.check_password("s3cret-pass")
+
+    def test_get_not_allowed(self, client):
+        assert client.get(self.url).status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+class TestRegisterAPIView:
+    url = reverse("async_register")
+
+    def test_register(self, client):
+        response = client.post(
+            self.url,
+            {
+                "username": "Asha",
+                "email": "asha@college.edu",
+                "password1": "s3cret-pass-1",
+                "password2": "s3cret-pass-1",
+                "type": User.UserType.MEMBER,
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        user = User.objects.get(username="asha")
+        assert response.json()["user"]["id"] == user.id
+        assert user.check_password("s3cret-pass-1")
+        assert Member.objects.filter(user=user).exists()
+
+    def test_invalid(self, client):
+        UserFactory(username="asha")
+
+        response = client.post(
+            self.url,
+            {
+                "username": "asha",
+                "email": "asha@college.edu",
+                "password1": "s3cret-pass-1",
+                "password2": "other",
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not User.objects.filter(email="asha@college.edu").exists()
+
+    def test_password_similar_to_the_username(self, client):
+        completed = password_hashing.stats()["completed"]
+
+        response = client.post(
+            self.url,
+            {
+                "username": "Robotics",
+                "email": "club@college.edu",
+                "password1": "robotics-club",
+                "password2": "robotics-club",
+            },
+            content_type="application/json",
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        [error] = response.json()["non_field_errors"]
+        assert "too similar to the username" in error.lower()
+        assert not User.objects.filter(username="robotics").exists()
+        # rejected before hashing
+        assert password_hashing.stats()["completed"] == completed
+
+
+class TestPasswordHashingMetricsAPIView:
+    url = reverse("users:password-hashing-metrics")
+
+    def test_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(UserFactory())
+        assert client.get(self.url).status_code == HTTPStatus.FORBIDDEN
+
+        client.force_authenticate(UserFactory(is_staff=True))
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert {
+            "workers",
+            "pending",
+            "running",
+            "queued",
+            "completed",
+            "rejected",
+        } <= set(response.data["data"])
+
+
+class TestAsyncUserListView:
+    url = reverse("users:member-list-async")
+
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"page": 2}, {"pagination": "cursor"}, {"type": User.UserType.MEMBER}],
+    )
+    def test_same_pages_as_the_sync_view(self, client, params):
+        UserFactory.create_batch(6, type=User.UserType.MEMBER)
+        UserFactory.create_batch(6, type=User.UserType.COMMUNITY)
+
+        response = client.get(self.url, params)
+
+        assert response.status_code == HTTPStatus.OK
+        expected = client.get(reverse("users:member-list"), params).json()
+        assert response.json()["data"]["results"] == expected["data"]["results"]
+
+    def test_query_count(self, client, django_assert_num_queries):
+        users = UserFactory.create_batch(3)
+        # page count + page of users, no savepoints
+        with django_assert_num_queries(2):
+            response = client.get(self.url)
+
+        assert response.json()["data"]["count"] == len(users)
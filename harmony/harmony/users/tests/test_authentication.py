@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from harmony.users.authentication import user_cache
+from harmony.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+# an authenticated endpoint that only reads the request user
+URL = reverse("rest_user_details")
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture()
+def user():
+    return UserFactory()
+
+
+@pytest.fixture()
+def api_client(user) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+class TestCachedJWTCookieAuthentication:
+    def test_no_user_query_in_steady_state(self, api_client, django_assert_num_queries):
+        # savepoint + user + savepoint release (ATOMIC_REQUESTS)
+        with django_assert_num_queries(3):
+            assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(2):
+            assert api_client.get(URL).status_code == HTTPStatus.OK
+
+    def test_shared_cache_serves_other_processes(
+        self,
+        api_client,
+        django_assert_num_queries,
+    ):
+        api_client.get(URL)
+        # another process has an empty LRU
+        user_cache.clear()
+
+        with django_assert_num_queries(2):
+            assert api_client.get(URL).status_code == HTTPStatus.OK
+
+    def test_deactivation(self, user, api_client):
+        api_client.get(URL)
+
+        user.is_active = False
+        user.save()
+
+        response = api_client.get(URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json()["code"] == "user_inactive"
+
+    def test_deleted_user(self, user, api_client):
+        api_client.get(URL)
+
+        user.delete()
+
+        assert api_client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_save_refreshes_the_user(self, user):
+        user_cache.get(user.id)
+
+        user.username = "renamed"
+        user.save()
+
+        assert user_cache.get(user.id).username == "renamed"
+
+    def test_password_is_not_cached(self, user, django_assert_num_queries):
+        user.set_password("new-s3cret")
+        user.save()
+
+        cached = user_cache.get(user.id)
+
+        assert "password" in cached.get_deferred_fields()
+        # loaded on access
+        with django_assert_num_queries(1):
+            assert cached.check_password("new-s3cret")
+
+    def test_fresh_user_per_lookup(self, user):
+        first = user_cache.get(user.id)
+        first.username = "changed in a request"
+
+        assert user_cache.get(user.id).username == user.username
+        assert user_cache.get(user.id) == user
+
+    def test_lru_eviction(self, settings):
+        settings.AUTH_USER_CACHE_SIZE = 2
+        users = UserFactory.create_batch(3)
+
+        for user in users:
+            user_cache.get(user.id)
+
+        assert list(user_cache.entries) == [users[1].id, users[2].id]
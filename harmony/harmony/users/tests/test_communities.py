@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from harmony.users.models import Community
+from harmony.users.models import Member
+from harmony.users.tests.factories import CommunityFactory
+from harmony.users.tests.factories import MemberFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def communities():
+    chess, robotics = CommunityFactory(name="Chess"), CommunityFactory(name="Robotics")
+    chess.members.add(*MemberFactory.create_batch(3))
+    robotics.members.add(*MemberFactory.create_batch(1))
+    CommunityFactory(name="Astronomy")
+    return chess, robotics
+
+
+class TestCommunityListAPIView:
+    url = reverse("users:community-list")
+
+    def test_member_counts(self, communities, django_assert_num_queries):
+        # the page and its count, whatever the number of communities and members,
+        # plus the ATOMIC_REQUESTS savepoint and its release
+        with django_assert_num_queries(4):
+            response = APIClient().get(self.url)
+
+        results = response.data["data"]["results"]
+        assert [(c["name"], c["member_count"]) for c in results] == [
+            ("Astronomy", 0),
+            ("Chess", 3),
+            ("Robotics", 1),
+        ]
+        assert results[1]["id"] == communities[0].user_id
+
+    def test_cached_until_members_change(self, communities, django_assert_num_queries):
+        client = APIClient()
+        response = client.get(self.url)
+
+        # only the ATOMIC_REQUESTS savepoints and their releases
+        with django_assert_num_queries(4):
+            assert client.get(self.url).data == response.data
+            assert (
+                client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code
+                == HTTPStatus.NOT_MODIFIED
+            )
+
+        robotics = communities[1]
+        robotics.members.add(MemberFactory())
+
+        results = client.get(self.url).data["data"]["results"]
+        assert results[2]["member_count"] == robotics.members.count()
+
+    def test_keyset_pages(self, communities):
+        CommunityFactory.create_batch(12)
+        client = APIClient()
+
+        seen = []
+        response = client.get(self.url, {"pagination": "cursor"})
+        while True:
+            seen += [community["id"] for community in response.data["data"]["results"]]
+            if response.data["data"]["next"] is None:
+                break
+            response = client.get(response.data["data"]["next"])
+        assert len(seen) == len(set(seen)) == Community.objects.count()
+
+
+class TestCommunityDetailAPIView:
+    def test_detail(self, communities):
+        chess = communities[0]
+        url = reverse("users:community-detail", kwargs={"id": chess.user_id})
+
+        response = APIClient().get(url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["data"]["member_count"] == chess.members.count()
+        assert response.data["data"]["username"] == chess.user.username
+
+    def test_invalidated_on_rename(self, communities):
+        chess = communities[0]
+        url = reverse("users:community-detail", kwargs={"id": chess.user_id})
+        client = APIClient()
+        client.get(url)
+
+        chess.name = "Chess Club"
+        chess.save()
+
+        assert client.get(url).data["data"]["name"] == "Chess Club"
+
+    def test_not_found(self):
+        response = APIClient().get(reverse("users:community-detail", kwargs={"id": 0}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestCommunityMembersAPIView:
+    def test_walks_every_member_in_constant_queries(
+        self,
+        communities,
+        django_assert_num_queries,
+    ):
+        chess = communities[0]
+        chess.members.add(*MemberFactory.create_batch(120))
+        url = reverse("users:community-members", kwargs={"id": chess.user_id})
+        client = APIClient()
+
+        seen = []
+        response = client.get(url)
+        while True:
+            seen += [member["id"] for member in response.data["data"]["results"]]
+            if response.data["data"]["next"] is None:
+                break
+            # the community check and the page, members come with their user,
+            # plus the ATOMIC_REQUESTS savepoint and its release
+            with django_assert_num_queries(4):
+                response = client.get(response.data["data"]["next"])
+
+        assert seen == list(
+            Member.objects.filter(community=chess)
+            .order_by("user_id")
+            .values_list("user_id", flat=True),
+        )
+        assert len(seen) == chess.members.count()
+
+    def test_not_found(self):
+        response = APIClient().get(reverse("users:community-members", kwargs={"id": 0}))
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from harmony.users.imports import hash_passwords
+from harmony.users.imports import import_chunk
+from harmony.users.imports import password_hashing_pool
+from harmony.users.models import Member
+from harmony.users.models import MemberImport
+from harmony.users.models import User
+from harmony.users.tasks import import_members
+from harmony.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+ROSTER = """username,email,prn_number,date_of_birth,first_name,last_name,password
+Asha,asha@college.edu,1001,2004-05-01,Asha,Rao,s3cret-pass
+ravi,ravi@college.edu,1002,2004-06-02,Ravi,,
+taken,new@college.edu,1003,2004-07-03,,,
+dup,ASHA@college.edu,1004,2004-08-04,,,
+broken,not-an-email,1005,someday,,,
+"""
+
+
+def _import(content):
+    return MemberImport.objects.create(
+        file=SimpleUploadedFile("roster.csv", content.encode()),
+    )
+
+
+class TestImportMembers:
+    def test_roster(self):
+        UserFactory(username="taken")
+        member_import = _import(ROSTER)
+
+        created = import_members(member_import.id, chunk_size=2, workers=2)
+
+        member_import.refresh_from_db()
+        assert member_import.status == MemberImport.Status.DONE
+        assert (member_import.total_rows, member_import.processed_rows) == (5, 5)
+        assert (created, member_import.failed_count) == (2, 3)
+        assert member_import.created_count == created
+        assert [
+            (error["row"], sorted(error["errors"])) for error in member_import.errors
+        ] == [
+            (3, ["username"]),
+            (4, ["email"]),
+            (5, ["date_of_birth", "email"]),
+        ]
+
+        asha = Member.objects.select_related("user").get(prn_number="1001")
+        assert (asha.user.username, asha.user.email, asha.user.type) == (
+            "asha",
+            "asha@college.edu",
+            User.UserType.MEMBER,
+        )
+        assert (asha.first_name, asha.last_name, asha.date_of_birth) == (
+            "Asha",
+            "Rao",
+            date(2004, 5, 1),
+        )
+        assert asha.user.check_password("s3cret-pass")
+        # no password in the roster, set through the password reset flow
+        assert not User.objects.get(username="ravi").has_usable_password()
+
+    def test_duplicates_detected_in_one_query(self, django_assert_num_queries):
+        UserFactory(username="taken")
+        chunk = [
+            (
+                1,
+                {
+                    "username": "taken",
+                    "email": "a@college.edu",
+                    "prn_number": "1",
+                    "date_of_birth": "2004-01-01",
+                },
+            ),
+            (
+                2,
+                {
+                    "username": "b",
+                    "email": "b@college.edu",
+                    "prn_number": "2",
+                    "date_of_birth": "2004-01-01",
+                },
+            ),
+            (
+                3,
+                {
+                    "username": "B",
+                    "email": "c@college.edu",
+                    "prn_number": "3",
+                    "date_of_birth": "2004-01-01",
+                },
+            ),
+        ]
+
+        # the duplicate lookup, then a savepoint around one INSERT per table
+        with ThreadPoolExecutor(max_workers=1) as pool, django_assert_num_queries(5):
+            created, errors = import_chunk(chunk, pool)
+
+        assert created == 1
+        assert [error["row"] for error in errors] == [1, 3]
+
+    def test_passwords_validated(self):
+        chunk = [
+            (
+                1,
+                {
+                    "username": "a",
+                    "email": "a@college.edu",
+                    "prn_number": "1",
+                    "date_of_birth": "2004-01-01",
+                    "password": "1",
+                },
+            ),
+            (
+                2,
+                {
+                    "username": "priya.sharma",
+                    "email": "priya@college.edu",
+                    "prn_number": "2",
+                    "date_of_birth": "2004-01-01",
+                    # too close to the username
+                    "password": "Priya.Sharma",
+                },
+            ),
+        ]
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            created, errors = import_chunk(chunk, pool)
+
+        assert created == 0
+        assert [(error["row"], list(error["errors"])) for error in errors] == [
+            (1, ["password"]),
+            (2, ["password"]),
+        ]
+        assert not User.objects.exists()
+
+    def test_passwords_hashed_in_a_process_pool(self):
+        with password_hashing_pool(2) as pool:
+            hashes = hash_passwords(pool, ["one", None, "two"])
+
+        assert check_password("one", hashes[0])
+        assert hashes[1].startswith("!")
+        assert check_password("two", hashes[2])
+
+    def test_command(self, tmp_path, capsys):
+        roster = tmp_path / "roster.csv"
+        roster.write_text(ROSTER)
+
+        call_command("import_members", str(roster), "--workers", "1")
+
+        out, err = capsys.readouterr()
+        assert "Created 3 members, rejected 2 of 5 rows" in out
+        assert "row 5:" in err
+        assert Member.objects.count() == MemberImport.objects.get().created_count
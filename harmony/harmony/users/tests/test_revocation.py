@@ -0,0 +1,163 @@
+import time
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from redis import RedisError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from harmony.users import revocation
+from harmony.users.authentication import user_cache
+from harmony.users.revocation import REVOKED_KEY
+from harmony.users.revocation import get_redis
+from harmony.users.revocation import revocation_list
+from harmony.users.tests.factories import UserFactory
+from harmony.utils.bloom import BloomFilter
+
+pytestmark = pytest.mark.django_db
+
+URL = reverse("events:event-feed-url")
+
+
+@pytest.fixture(autouse=True)
+def _empty_revocation_list():
+    get_redis().delete(REVOKED_KEY)
+    revocation_list.clear()
+    user_cache.clear()
+    yield
+    get_redis().delete(REVOKED_KEY)
+    revocation_list.clear()
+    user_cache.clear()
+
+
+@pytest.fixture()
+def user():
+    return UserFactory()
+
+
+@pytest.fixture()
+def refresh(user):
+    return RefreshToken.for_user(user)
+
+
+@pytest.fixture()
+def access(refresh):
+    return refresh.access_token
+
+
+@pytest.fixture()
+def api_client(access) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    return client
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        items = [str(uuid.uuid4()) for _ in range(1000)]
+        bloom = BloomFilter(len(items))
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter.from_items(
+            (str(uuid.uuid4()) for _ in range(1000)),
+            min_capacity=1000,
+        )
+
+        samples = 10000
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(samples))
+
+        # 2x capacity, well under the 1% rate at full capacity
+        assert false_positives < samples * 0.01
+
+
+class TestRevocationList:
+    def test_logout_revokes_the_access_token(self, api_client, refresh):
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        response = api_client.post(reverse("rest_logout"), {"refresh": str(refresh)})
+        assert response.status_code == HTTPStatus.OK
+
+        response = api_client.get(URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json()["code"] == "token_revoked"
+
+    def test_logout_revokes_the_refresh_token(self, api_client, refresh):
+        url = reverse("token_refresh")
+        assert (
+            APIClient().post(url, {"refresh": str(refresh)}).status_code
+            == HTTPStatus.OK
+        )
+
+        api_client.post(reverse("rest_logout"), {"refresh": str(refresh)})
+
+        response = APIClient().post(url, {"refresh": str(refresh)})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json()["code"] == "token_revoked"
+
+    def test_logout_without_redis(self, api_client, refresh, monkeypatch):
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        def unreachable():
+            raise RedisError
+
+        monkeypatch.setattr(revocation, "get_redis", unreachable)
+
+        response = api_client.post(reverse("rest_logout"), {"refresh": str(refresh)})
+        assert response.status_code == HTTPStatus.OK
+        # still revoked in this process, filter hits count as revoked without Redis
+        assert api_client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_not_revoked_stays_in_process(self, api_client, monkeypatch):
+        revocation_list.revoke("another", time.time() + 60)
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        def unreachable():
+            msg = "Redis queried for a token that is not revoked"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(revocation, "get_redis", unreachable)
+
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+    def test_revoked_by_another_process(self, api_client, access, settings):
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        get_redis().zadd(REVOKED_KEY, {access["jti"]: access["exp"]})
+        # not seen until the next rebuild
+        assert api_client.get(URL).status_code == HTTPStatus.OK
+
+        settings.TOKEN_REVOCATION_REFRESH_INTERVAL = 0
+        assert api_client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_false_positive_is_not_revoked(self, monkeypatch):
+        revocation_list.get_filter()
+        monkeypatch.setattr(BloomFilter, "__contains__", lambda bloom, item: True)
+
+        assert not revocation_list.is_revoked("never revoked")
+
+    def test_entries_expire_with_the_token(self):
+        revocation_list.revoke("expired", time.time() - 1)
+        revocation_list.revoke("expiring", time.time() + 60)
+        get_redis().zadd(REVOKED_KEY, {"lapsed": time.time() - 1})
+
+        revocation_list.revoke("valid", time.time() + 60)
+
+        assert get_redis().zrange(REVOKED_KEY, 0, -1) == [b"expiring", b"valid"]
+        assert 0 < get_redis().ttl(REVOKED_KEY) <= 24 * 60 * 60
+
+    def test_revoke_tokens_command(self, api_client, access):
+        call_command("revoke_tokens", str(access))
+
+        assert api_client.get(URL).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_revoke_tokens_command_invalid(self):
+        with pytest.raises(CommandError):
+            call_command("revoke_tokens", "not-a-token")
@@ -1,6 +1,16 @@
+from io import BytesIO
+
 import pytest
 from celery.result import EagerResult
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
 
+from harmony.users.api.serializers import UserSerializer
+from harmony.users.authentication import user_cache
+from harmony.users.avatars import thumbnails_are_stale
+from harmony.users.models import User
+from harmony.users.tasks import generate_avatar_thumbnails
 from harmony.users.tasks import get_users_count
 from harmony.users.tests.factories import UserFactory
 
@@ -15,3 +25,112 @@ def test_user_count(settings):
     task_result = get_users_count.delay()
     assert isinstance(task_result, EagerResult)
     assert task_result.result == batch_size
+
+
+class TestGenerateAvatarThumbnails:
+    @pytest.fixture()
+    def user(self, settings):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.AVATAR_THUMBNAIL_SIZES = [32, 64]
+        return UserFactory()
+
+    def _upload(
+        self,
+        user,
+        django_capture_on_commit_callbacks,
+        mode="RGBA",
+        size=(300, 200),
+    ):
+        buffer = BytesIO()
+        Image.new(mode, size, "red").save(buffer, "PNG")
+        with django_capture_on_commit_callbacks(execute=True):
+            user.avatar = SimpleUploadedFile(
+                "avatar.png",
+                buffer.getvalue(),
+                content_type="image/png",
+            )
+            user.save()
+        user.refresh_from_db()
+
+    def test_rendered_after_upload(self, user, django_capture_on_commit_callbacks):
+        self._upload(user, django_capture_on_commit_callbacks)
+
+        assert user.avatar_thumbnails["source"] == user.avatar.name
+        sizes = user.avatar_thumbnails["sizes"]
+        assert set(sizes) == {"32", "64"}
+        with default_storage.open(sizes["64"]["webp"]) as file:
+            image = Image.open(file)
+            assert (image.format, image.size) == ("WEBP", (64, 64))
+        with default_storage.open(sizes["32"]["jpg"]) as file:
+            image = Image.open(file)
+            assert (image.format, image.mode, image.size) == ("JPEG", "RGB", (32, 32))
+
+    def test_content_hashed_names(self, user, django_capture_on_commit_callbacks):
+        self._upload(user, django_capture_on_commit_callbacks)
+        other = UserFactory()
+        self._upload(other, django_capture_on_commit_callbacks)
+
+        # same pixels, same thumbnails, stored once
+        assert other.avatar.name != user.avatar.name
+        assert other.avatar_thumbnails["sizes"] == user.avatar_thumbnails["sizes"]
+
+    def test_not_rendered_again_without_new_avatar(
+        self,
+        user,
+        django_capture_on_commit_callbacks,
+    ):
+        self._upload(user, django_capture_on_commit_callbacks)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            user.save()
+        # only the cached user is invalidated
+        assert all(
+            callback.__module__ == "harmony.utils.cache" for callback in callbacks
+        )
+
+    def test_cleared_with_the_avatar(self, user, django_capture_on_commit_callbacks):
+        self._upload(user, django_capture_on_commit_callbacks)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.avatar = None
+            user.save()
+        user.refresh_from_db()
+
+        assert user.avatar_thumbnails == {"source": "", "sizes": {}}
+
+    def test_cached_user_invalidated(self, user, django_capture_on_commit_callbacks):
+        self._upload(user, django_capture_on_commit_callbacks)
+        User.objects.filter(pk=user.pk).update(avatar_thumbnails={})
+        assert user_cache.get(user.pk).avatar_thumbnails == {}
+
+        generate_avatar_thumbnails(user.pk)
+
+        assert user_cache.get(user.pk).avatar_thumbnails == user.avatar_thumbnails
+
+    def test_undecodable_avatar(self, user, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            user.avatar = SimpleUploadedFile(
+                "avatar.png",
+                b"not an image",
+                content_type="image/png",
+            )
+            user.save()
+        user.refresh_from_db()
+
+        # recorded without sizes, so it is not rendered again on every save
+        assert user.avatar_thumbnails == {"source": user.avatar.name, "sizes": {}}
+        assert not thumbnails_are_stale(user)
+
+    def test_variant_urls_in_user_serializer(
+        self,
+        user,
+        django_capture_on_commit_callbacks,
+    ):
+        self._upload(user, django_capture_on_commit_callbacks, mode="P")
+
+        data = UserSerializer(user).data
+
+        assert data["avatar_thumbnails"]["32"] == {
+            "webp": f"http://media.testserver/{user.avatar_thumbnails['sizes']['32']['webp']}",
+            "jpg": f"http://media.testserver/{user.avatar_thumbnails['sizes']['32']['jpg']}",
+        }
@@ -1,6 +1,10 @@
 from django.urls import path
 
 from harmony.users.api.views import UserListView, MemberUpdateAPIView
+from harmony.users.api.views import CommunityListAPIView, CommunityDetailAPIView
+from harmony.users.api.views import CommunityMembersAPIView
+from harmony.users.api.views import PasswordHashingMetricsAPIView
+from harmony.users.api.async_views import AsyncUserListView
 from harmony.users.views import user_detail_view
 from harmony.users.views import user_redirect_view, user_update_view
 
@@ -11,5 +15,22 @@ urlpatterns = [
     # path("<str:username>/", view=user_detail_view, name="detail"),
     #list view
     path("", UserListView.as_view(), name="member-list"),
+    path("async/", AsyncUserListView.as_view(), name="member-list-async"),
     path("member/update/", MemberUpdateAPIView.as_view(), name="member-update"),
+    path("communities/", CommunityListAPIView.as_view(), name="community-list"),
+    path(
+        "communities/<int:id>/",
+        CommunityDetailAPIView.as_view(),
+        name="community-detail",
+    ),
+    path(
+        "communities/<int:id>/members/",
+        CommunityMembersAPIView.as_view(),
+        name="community-members",
+    ),
+    path(
+        "metrics/password-hashing/",
+        PasswordHashingMetricsAPIView.as_view(),
+        name="password-hashing-metrics",
+    ),
 ]
@@ -0,0 +1,155 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _generation_key(namespace):
+    return f"{namespace}:generation"
+
+
+def get_generation(namespace):
+    """
+    Current generation of a namespace, part of the key of everything cached under it
+    Seeded from the clock so that an evicted counter never comes back at a value
+    that was already used.
+    """
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_generation(namespace):
+    """
+    get_generation for async views
+    """
+    key = _generation_key(namespace)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_generation(namespace):
+    """
+    Orphan everything cached under a namespace, without scanning for keys
+    Bumped right away for the writing request and again on commit, so that
+    a page read by another request before the commit is not kept either.
+    """
+    key = _generation_key(namespace)
+    _incr(key)
+    transaction.on_commit(lambda: _incr(key))
+
+
+class ResponseCache:
+    """
+    Caches response payloads keyed by URL and normalized query string
+    Entries live under the generation of `namespace`, so bump_generation(namespace)
+    invalidates all of them. Hits and misses are counted in the cache itself
+    so that the numbers cover every process.
+    Responses that depend on the current time, every one or only those with one
+    of `time_params` in the query string, are also keyed by the current window
+    of `time_bucket` seconds. No event change bumps the generation when time
+    moves on, so they are recomputed once per window.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        namespace,
+        prefix,
+        timeout,
+        time_bucket=None,
+        time_params=(),
+    ):
+        self.namespace = namespace
+        self.prefix = prefix
+        self.timeout = timeout
+        self.time_bucket = time_bucket
+        self.time_params = time_params
+
+    def get_key(self, request):
+        return self._make_key(request, get_generation(self.namespace))
+
+    async def aget_key(self, request):
+        return self._make_key(request, await aget_generation(self.namespace))
+
+    def _make_key(self, request, generation):
+        # request.GET is the query_params of DRF requests and also works for plain
+        # Django views
+        params = sorted(
+            (name, value) for name, values in request.GET.lists() for value in values
+        )
+        url = request.build_absolute_uri(request.path)
+        digest = hashlib.md5(
+            f"{url}?{urlencode(params)}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        key = f"{self.prefix}:{generation}:{digest}"
+        window = self.get_time_window(request)
+        return key if window is None else f"{key}:{window}"
+
+    def get_time_window(self, request):
+        """
+        Index of the current `time_bucket` window, None for responses that do
+        not depend on the current time
+        """
+        if self.time_bucket is None:
+            return None
+        params = request.GET
+        if self.time_params and not any(name in params for name in self.time_params):
+            return None
+        return int(time.time() // self.time_bucket)
+
+    def get(self, key):
+        data = cache.get(key)
+        self._count("hits" if data is not None else "misses")
+        return data
+
+    async def aget(self, key):
+        data = await cache.aget(key)
+        await self._acount("hits" if data is not None else "misses")
+        return data
+
+    def set(self, key, data):
+        # `key` is taken before the response is computed, so a generation bump
+        # in between leaves the entry orphaned instead of stale
+        cache.set(key, data, timeout=self.timeout)
+
+    async def aset(self, key, data):
+        await cache.aset(key, data, timeout=self.timeout)
+
+    def stats(self):
+        counters = cache.get_many([f"{self.prefix}:hits", f"{self.prefix}:misses"])
+        return {
+            "hits": counters.get(f"{self.prefix}:hits", 0),
+            "misses": counters.get(f"{self.prefix}:misses", 0),
+        }
+
+    def _count(self, counter):
+        key = f"{self.prefix}:{counter}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+
+    async def _acount(self, counter):
+        key = f"{self.prefix}:{counter}"
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 0, timeout=None)
+            await cache.aincr(key)
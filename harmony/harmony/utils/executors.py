@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturatedError(Exception):
+    """
+    Raised instead of queueing a call when the executor already holds max_pending
+    calls
+    """
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls for async views in a fixed pool of threads
+    At most `max_pending` calls are admitted at once (running or queued), the
+    next ones fail fast with ExecutorSaturatedError so that a burst cannot grow the
+    queue, and the latency, without bound. Counters are per process.
+    A positive `niceness` lowers the scheduling priority of the threads (on
+    Linux, where it is per thread and inherited by the threads they start),
+    so CPU bound calls only get the CPU time left over by request handling.
+    """
+
+    def __init__(self, name, max_workers, max_pending, niceness=0):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.niceness = niceness
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.name,
+                    initializer=self._init_thread,
+                )
+            return self._executor
+
+    def _init_thread(self):
+        if self.niceness and hasattr(os, "setpriority"):
+            # 0 would be the whole process, the native id is this thread only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.niceness)
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturatedError(self.name)
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+    def _call(self, queued_at, func, args):
+        started_at = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started_at - queued_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._run_seconds += time.monotonic() - started_at
+
+    async def run(self, func, *args):
+        """
+        Await func(*args) run in the pool, raises ExecutorSaturatedError when full
+        """
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(),
+                self._call,
+                time.monotonic(),
+                func,
+                args,
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "peak_pending": self._peak_pending,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2)
+                if completed
+                else 0.0,
+                "avg_run_ms": round(self._run_seconds / completed * 1000, 2)
+                if completed
+                else 0.0,
+            }
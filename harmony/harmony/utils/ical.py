@@ -0,0 +1,63 @@
+from datetime import UTC
+
+# RFC 5545 limits content lines to 75 octets, longer ones are folded
+MAX_LINE_OCTETS = 75
+
+# continuation bytes of a UTF-8 character are 0b10xxxxxx
+UTF8_CONTINUATION_MASK = 0xC0
+UTF8_CONTINUATION = 0x80
+
+
+def escape_text(value):
+    """
+    Escape a TEXT property value (RFC 5545, 3.3.11)
+    """
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def format_datetime(value):
+    """
+    A DATE-TIME in UTC, e.g. 20300110T123000Z
+    """
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold_line(line):
+    """
+    Split a content line in chunks of at most 75 octets,
+    continuation lines start with a space and never split a UTF-8 character
+    """
+    encoded = line.encode()
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line
+    lines, start, limit = [], 0, MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # back off to the start of a UTF-8 character
+        while (
+            end < len(encoded)
+            and encoded[end] & UTF8_CONTINUATION_MASK == UTF8_CONTINUATION
+        ):
+            end -= 1
+        lines.append(encoded[start:end].decode())
+        start, limit = end, MAX_LINE_OCTETS - 1
+    return "\r\n ".join(lines)
+
+
+def render_component(name, properties):
+    """
+    BEGIN:name ... END:name with (property, value) lines, values already formatted
+    Properties whose value is None are left out
+    """
+    lines = [f"BEGIN:{name}"]
+    lines += [
+        fold_line(f"{prop}:{value}") for prop, value in properties if value is not None
+    ]
+    lines.append(f"END:{name}")
+    return "\r\n".join(lines) + "\r\n"
@@ -0,0 +1,12 @@
+def chunked(rows, size):
+    """
+    Group rows in lists of `size`, numbered from 1
+    """
+    chunk = []
+    for number, row in enumerate(rows, start=1):
+        chunk.append((number, row))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
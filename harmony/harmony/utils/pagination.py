@@ -0,0 +1,239 @@
+import json
+from base64 import b64decode
+from base64 import b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder rounds datetimes to milliseconds, which would make
+    a cursor skip rows that share the millisecond of the last row of a page
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination
+    Requests with ?pagination=cursor or a ?cursor= token are paged with
+    WHERE (a, b) < (x, y) on a fixed ordering, which is backed by a composite
+    index and needs neither COUNT(*) nor OFFSET. Every other request falls
+    back to the default page number pagination, unless `fallback_class` is None.
+    Subclasses set `ordering`, the last field of which must be unique.
+    Pages can be model instances or values() dicts.
+    Keyset pages are always in `ordering`, so combining them with ?ordering= or
+    with the relevance order of a ranked search is a 400.
+    """
+
+    ordering: tuple[str, ...] = ("-id",)
+    page_size: int = api_settings.PAGE_SIZE or 10
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    mode = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    ordering_query_param = api_settings.ORDERING_PARAM
+    fixed_ordering_message = (
+        "Cursor pages have a fixed order and cannot be sorted by ?ordering= "
+        "or by search relevance."
+    )
+    fallback_class: type[PageNumberPagination] | None = PageNumberPagination
+
+    def __init__(self):
+        self.fallback = self.fallback_class() if self.fallback_class else None
+        self.use_keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_keyset = self.wants_keyset(request)
+        if self.fallback is not None and not self.use_keyset:
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        # fetch one extra row to know whether there is a next page
+        page = list(self.get_keyset_queryset(queryset, request)[: self.page_size + 1])
+        return self.set_page(page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset for async views, rows and counts are fetched with the async
+        ORM
+        """
+        self.use_keyset = self.wants_keyset(request)
+        if self.fallback is not None and not self.use_keyset:
+            return await self.apaginate_fallback(self.fallback, queryset, request, view)
+
+        queryset = self.get_keyset_queryset(queryset, request)[: self.page_size + 1]
+        return self.set_page([row async for row in queryset.aiterator()])
+
+    async def apaginate_fallback(self, fallback, queryset, request, view=None):
+        """
+        PageNumberPagination.paginate_queryset with the COUNT(*) and the page fetched
+        asynchronously
+        """
+        page_size = fallback.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = fallback.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property, counted here instead of in a sync query
+        paginator.count = await queryset.acount()
+        page_number = fallback.get_page_number(request, paginator)
+        try:
+            fallback.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = fallback.invalid_page_message.format(
+                page_number=page_number,
+                message=str(exc),
+            )
+            raise NotFound(msg) from exc
+
+        if paginator.num_pages > 1 and fallback.template is not None:
+            fallback.display_page_controls = True
+        fallback.request = request
+        fallback.page.object_list = [
+            row async for row in fallback.page.object_list.aiterator()
+        ]
+        return list(fallback.page)
+
+    def wants_keyset(self, request):
+        return (
+            self.fallback is None
+            or self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == self.mode
+        )
+
+    def get_keyset_queryset(self, queryset, request):
+        """
+        The queryset in keyset order, starting after the ?cursor= position
+        """
+        if (
+            self.ordering_query_param in request.query_params
+            or "search_rank" in queryset.query.annotations
+        ):
+            raise serializers.ValidationError(
+                {self.mode_query_param: self.fixed_ordering_message},
+            )
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position = self.decode_cursor(encoded, queryset.query.get_meta())
+            queryset = queryset.filter(self.get_keyset_filter(position))
+        return queryset
+
+    def set_page(self, page):
+        self.has_next = len(page) > self.page_size
+        self.page = page[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None and not self.use_keyset:
+            return self.fallback.get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "results": data,
+            },
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        names = [name.lstrip("-") for name in self.ordering]
+        if isinstance(last, dict):
+            position = [last[name] for name in names]
+        else:
+            position = [getattr(last, name) for name in names]
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(position),
+        )
+
+    def get_keyset_filter(self, position):
+        """
+        Expand the row comparison (a, b, c) > (x, y, z) into
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+        honouring the direction of every ordering field.
+        The OR chain is ANDed with a >= x, which the planner can use as an
+        index condition to seek to the cursor instead of filtering every
+        row before it.
+        """
+        names = [name.lstrip("-") for name in self.ordering]
+        clauses = []
+        for index, name in enumerate(self.ordering):
+            equal = dict(zip(names[:index], position[:index], strict=True))
+            lookup = "lt" if name.startswith("-") else "gt"
+            bound = {f"{names[index]}__{lookup}": position[index]}
+            clauses.append(Q(**equal, **bound))
+        keyset = reduce(or_, clauses)
+        if len(self.ordering) == 1:
+            return keyset
+        lookup = "lte" if self.ordering[0].startswith("-") else "gte"
+        return Q(**{f"{names[0]}__{lookup}": position[0]}) & keyset
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, cls=CursorJSONEncoder)
+        return b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, encoded, opts):
+        try:
+            position = json.loads(b64decode(encoded.encode(), validate=True))
+        except (BinasciiError, ValueError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                opts.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, position, strict=True)
+            ]
+        except (TypeError, ValueError, ValidationError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def get_schema_operation_parameters(self, view):
+        if self.fallback is None:
+            return [self.get_cursor_schema_parameter()]
+        return [
+            *self.fallback.get_schema_operation_parameters(view),
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    f"Set to '{self.mode}' to use keyset pagination "
+                    "instead of page numbers."
+                ),
+                "schema": {"type": "string", "enum": [self.mode]},
+            },
+            self.get_cursor_schema_parameter(),
+        ]
+
+    def get_cursor_schema_parameter(self):
+        return {
+            "name": self.cursor_query_param,
+            "required": False,
+            "in": "query",
+            "description": "The pagination cursor value.",
+            "schema": {"type": "string"},
+        }
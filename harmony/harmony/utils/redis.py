@@ -0,0 +1,11 @@
+from functools import cache
+
+import redis
+
+
+@cache
+def connect(url):
+    """
+    Client of the Redis at `url`, one connection pool per URL and process
+    """
+    return redis.Redis.from_url(url)
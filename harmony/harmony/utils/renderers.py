@@ -0,0 +1,31 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Decimal, timedelta, lazy strings, querysets... the types orjson does not know
+# are converted by DRF's encoder, so that they render as they did with JSONRenderer
+encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson, a drop-in for the envelopes of response_payload
+    Datetimes render in ISO 8601 with a "Z" for UTC, like DRF's encoder, and
+    non-string keys are turned into strings. The output is always UTF-8, an
+    indent (e.g. from the browsable API) is rendered as 2 spaces.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=encoder.default, option=options)
+        # like JSONRenderer, escape the line separators that are invalid in
+        # javascript
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+        return ret.replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,131 @@
+import datetime
+from functools import wraps
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework.generics import GenericAPIView
+
+from harmony.utils.pagination import KeysetPagination
+
+
+class AsyncAPIView(View):
+    """
+    Base class of the async JSON views served by the ASGI application
+    Like DRF's APIView they are CSRF exempt (they authenticate with tokens,
+    not session cookies). Django refuses async views under ATOMIC_REQUESTS,
+    so they opt out of it and open their own transactions around writes.
+    Subclasses define `async def get/post/...` handlers.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # set on the view itself: Django 4.2's csrf_exempt wrapper would hide that it
+        # is a coroutine
+        view.csrf_exempt = True  # type: ignore[attr-defined]
+        return transaction.non_atomic_requests(view)
+
+
+class AsyncGenericAPIView(AsyncAPIView):
+    """
+    Async read-only counterpart of a DRF generic view
+    An instance of `view_class` provides the queryset, filter backends,
+    pagination, serializer, authentication, permissions and exception
+    handling, the handlers of subclasses fetch the rows with the async ORM.
+    Building and filtering querysets does not touch the database; DRF's
+    checks (authentication loads the user) run in a thread, and so does the
+    rendering, like for any deferred response.
+    Handlers get the DRF request and use `self.view`.
+    """
+
+    view_class: type[GenericAPIView]
+    http_method_names = ["get", "head", "options"]
+
+    async def dispatch(self, request, *args, **kwargs):
+        view = self.view = self.view_class()
+        view.args = args
+        view.kwargs = kwargs
+        request = view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        try:
+            # content negotiation, authentication, permissions and throttles
+            await sync_to_async(view.initial)(request, *args, **kwargs)
+            # View.dispatch returns the coroutine of the async handler
+            response = await super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+        except Exception as exc:  # noqa: BLE001, handled like in APIView.dispatch
+            response = view.handle_exception(exc)
+        return view.finalize_response(request, response, *args, **kwargs)
+
+    async def apaginate_queryset(self, queryset):
+        """
+        A page of the queryset with the async ORM, None if `view_class` is not
+        paginated, which it is by a KeysetPagination otherwise
+        """
+        view = self.view
+        if view.paginator is None:
+            return None
+        assert isinstance(view.paginator, KeysetPagination)
+        return await view.paginator.apaginate_queryset(
+            queryset,
+            view.request,
+            view=view,
+        )
+
+
+def _timestamp(last_modified):
+    if not timezone.is_aware(last_modified):
+        last_modified = timezone.make_aware(last_modified, datetime.UTC)
+    return int(last_modified.timestamp())
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    django.views.decorators.http.condition for async handlers, which Django 4.2
+    cannot wrap
+    The ETag and last modified callables may be coroutine functions.
+    """
+
+    async def call(func, request, *args, **kwargs):
+        if func is None:
+            return None
+        value = func(request, *args, **kwargs)
+        return await value if isawaitable(value) else value
+
+    def decorator(func):
+        @wraps(func)
+        async def inner(self, request, *args, **kwargs):
+            res_etag = await call(etag_func, request, *args, **kwargs)
+            res_etag = quote_etag(res_etag) if res_etag is not None else None
+            res_last_modified = await call(
+                last_modified_func,
+                request,
+                *args,
+                **kwargs,
+            )
+            if res_last_modified:
+                res_last_modified = _timestamp(res_last_modified)
+
+            response = get_conditional_response(
+                request,
+                etag=res_etag,
+                last_modified=res_last_modified,
+            )
+            if response is None:
+                response = await func(self, request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if res_last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(res_last_modified)
+                if res_etag:
+                    response.headers.setdefault("ETag", res_etag)
+            return response
+
+        return inner
+
+    return decorator